@@ -326,6 +326,26 @@ class TestAccount(unittest.TestCase):
 		balance = get_balance_on(account="Test Percent Account %5 - _TC", date=nowdate())
 		self.assertEqual(balance, 0)
 
+	def test_batched_account_balances(self):
+		from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+		from erpnext.accounts.utils import get_balances_on
+
+		accounts = ["_Test Bank - _TC", "_Test Cash - _TC", "Bank Accounts - _TC", "Current Assets - _TC"]
+		before = get_balances_on(accounts, date=nowdate(), company="_Test Company")
+
+		make_journal_entry("_Test Bank - _TC", "_Test Cash - _TC", 100, submit=True)
+		after = get_balances_on(accounts, date=nowdate(), company="_Test Company")
+
+		self.assertEqual(
+			{account: after[account] - before[account] for account in accounts},
+			{
+				"_Test Bank - _TC": 100,
+				"_Test Cash - _TC": -100,
+				"Bank Accounts - _TC": 100,
+				"Current Assets - _TC": 0,
+			},
+		)
+
 
 def _make_test_records(verbose=None):
 	from frappe.test_runner import make_test_objects
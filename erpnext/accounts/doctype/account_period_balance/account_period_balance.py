@@ -0,0 +1,357 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe import _
+from frappe.model.document import Document
+from frappe.query_builder.functions import Max, Min, Sum
+from frappe.utils import add_months, cint, cstr, flt, get_first_day, get_last_day, getdate, now
+
+from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
+	get_accounting_dimensions,
+)
+
+BALANCE_FIELDS = ("debit", "credit", "debit_in_account_currency", "credit_in_account_currency")
+REBUILD_CACHE_KEY = "account_period_balance_rebuild"
+
+
+class AccountPeriodBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		account: DF.Link | None
+		account_currency: DF.Link | None
+		company: DF.Link | None
+		cost_center: DF.Link | None
+		credit: DF.Currency
+		credit_in_account_currency: DF.Currency
+		debit: DF.Currency
+		debit_in_account_currency: DF.Currency
+		finance_book: DF.Link | None
+		fiscal_year: DF.Link | None
+		is_opening: DF.Literal["No", "Yes"]
+		is_period_closing_voucher_entry: DF.Check
+		posting_date: DF.Date | None
+		project: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def get_key_fields():
+	return [
+		"company",
+		"account",
+		"account_currency",
+		"fiscal_year",
+		"is_opening",
+		"is_period_closing_voucher_entry",
+		"finance_book",
+		"cost_center",
+		"project",
+		*get_accounting_dimensions(),
+	]
+
+
+def is_account_period_balance_enabled():
+	return cint(frappe.db.get_single_value("Accounts Settings", "use_account_period_balance"))
+
+
+def is_rebuild_in_progress(company):
+	return bool(frappe.cache.hget(REBUILD_CACHE_KEY, company))
+
+
+def get_ledger_doctype_for_period(company, start_dates=None, end_dates=None):
+	"""
+	Returns the doctype financial reports should read balances from.
+
+	Account Period Balance holds one row per calendar month, so it can only replace GL Entry
+	when every date the report buckets entries by falls on a month boundary.
+	"""
+	if not is_account_period_balance_enabled() or is_rebuild_in_progress(company):
+		return "GL Entry"
+
+	for date in start_dates or []:
+		if date and getdate(date) != get_first_day(date):
+			return "GL Entry"
+
+	for date in end_dates or []:
+		if date and getdate(date) != get_last_day(date):
+			return "GL Entry"
+
+	return "Account Period Balance"
+
+
+def update_account_period_balances(gl_entries, cancel=False):
+	"""Add `gl_entries` to (or on cancellation subtract them from) their monthly balances"""
+	if not gl_entries or not is_account_period_balance_enabled():
+		return
+
+	balances = get_period_balances(gl_entries, key_fields=get_key_fields(), sign=-1 if cancel else 1)
+	for company in sorted({balance.company for balance in balances.values()}):
+		lock_company_balances(company)
+
+	apb = frappe.qb.DocType("Account Period Balance")
+	existing = set(frappe.qb.from_(apb).select(apb.name).where(apb.name.isin(list(balances))).run(pluck=True))
+
+	# rows inserted concurrently by another transaction are ignored and updated below
+	new_balances = {name: balance for name, balance in balances.items() if name not in existing}
+	if new_balances:
+		insert_period_balances(new_balances, zero_amounts=True, ignore_duplicates=True)
+
+	for name, balance in balances.items():
+		query = frappe.qb.update(apb).where(apb.name == name)
+		for field in BALANCE_FIELDS:
+			query = query.set(apb[field], apb[field] + balance[field])
+
+		query.run()
+
+
+def remove_voucher_from_account_period_balances(voucher_type, voucher_no):
+	"""Subtract the active GL Entries of a voucher before they are deleted"""
+	if not is_account_period_balance_enabled():
+		return
+
+	gle = frappe.qb.DocType("GL Entry")
+	gl_entries = (
+		frappe.qb.from_(gle)
+		.select("*")
+		.where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no) & (gle.is_cancelled == 0))
+	).run(as_dict=True)
+
+	update_account_period_balances(gl_entries, cancel=True)
+
+
+def get_period_balances(entries, key_fields, sign=1):
+	"""Group GL Entry like rows by month and `key_fields`, keyed by the Account Period Balance name"""
+	balances = {}
+	for entry in entries:
+		row = frappe._dict({field: entry.get(field) for field in key_fields})
+		row.is_opening = row.is_opening or "No"
+		row.is_period_closing_voucher_entry = cint(
+			row.is_period_closing_voucher_entry or entry.get("voucher_type") == "Period Closing Voucher"
+		)
+		row.posting_date = get_first_day(entry.get("posting_date"))
+
+		name = get_period_balance_name(row, key_fields)
+		if name not in balances:
+			balances[name] = row.update({field: 0.0 for field in BALANCE_FIELDS})
+
+		for field in BALANCE_FIELDS:
+			balances[name][field] += sign * flt(entry.get(field))
+
+	return balances
+
+
+def get_period_balance_name(row, key_fields):
+	key = [cstr(row.posting_date), *(cstr(row.get(field)) for field in key_fields)]
+	return hashlib.sha1("\n".join(key).encode()).hexdigest()
+
+
+def insert_period_balances(balances, zero_amounts=False, ignore_duplicates=False):
+	fields = ["name", "creation", "modified", "owner", "modified_by", "posting_date", *get_key_fields()]
+	fields += BALANCE_FIELDS
+
+	timestamp = now()
+	values = []
+	for name, balance in balances.items():
+		row = frappe._dict(balance, name=name, creation=timestamp, modified=timestamp)
+		row.owner = row.modified_by = frappe.session.user
+		if zero_amounts:
+			row.update({field: 0.0 for field in BALANCE_FIELDS})
+
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert("Account Period Balance", fields, values, ignore_duplicates=ignore_duplicates)
+
+
+def get_period_balances_from_gl(company, period_start_date, key_fields):
+	"""Aggregate the active GL Entries of a company for the month starting on `period_start_date`"""
+	gle = frappe.qb.DocType("GL Entry")
+
+	entries = []
+	for is_pcv_entry in (0, 1):
+		query = (
+			frappe.qb.from_(gle)
+			.where(
+				(gle.company == company)
+				& (gle.is_cancelled == 0)
+				& (gle.posting_date >= period_start_date)
+				& (gle.posting_date <= get_last_day(period_start_date))
+			)
+			.groupby(*[gle[field] for field in key_fields if field != "is_period_closing_voucher_entry"])
+		)
+
+		if is_pcv_entry:
+			query = query.where(gle.voucher_type == "Period Closing Voucher")
+		else:
+			query = query.where(gle.voucher_type != "Period Closing Voucher")
+
+		for field in key_fields:
+			if field != "is_period_closing_voucher_entry":
+				query = query.select(gle[field])
+
+		for field in BALANCE_FIELDS:
+			query = query.select(Sum(gle[field]).as_(field))
+
+		for entry in query.run(as_dict=True):
+			entry.posting_date = period_start_date
+			entry.is_period_closing_voucher_entry = is_pcv_entry
+			entries.append(entry)
+
+	return get_period_balances(entries, key_fields)
+
+
+def get_periods(company, doctype="GL Entry"):
+	"""Returns the first day of every month between the first and last entry of the company"""
+	table = frappe.qb.DocType(doctype)
+	query = (
+		frappe.qb.from_(table)
+		.select(Min(table.posting_date), Max(table.posting_date))
+		.where(table.company == company)
+	)
+	if doctype == "GL Entry":
+		query = query.where(table.is_cancelled == 0)
+
+	first_date, last_date = query.run()[0]
+	if not first_date:
+		return []
+
+	period_start_date = get_first_day(first_date)
+	periods = []
+	while period_start_date <= getdate(last_date):
+		periods.append(period_start_date)
+		period_start_date = add_months(period_start_date, 1)
+
+	return periods
+
+
+def lock_company_balances(company, exclusive=False):
+	"""
+	Lock the Account Period Balance Lock row of the company until the end of the transaction.
+
+	Postings take a shared lock and the rebuild an exclusive one, so a period is never recomputed
+	while a transaction that adds GL Entries to it is still open. A dedicated row is locked so the
+	Company master itself stays free to be read and saved.
+	"""
+	if not frappe.db.exists("Account Period Balance Lock", company):
+		timestamp = now()
+		frappe.db.bulk_insert(
+			"Account Period Balance Lock",
+			["name", "company", "creation", "modified", "owner", "modified_by"],
+			[(company, company, timestamp, timestamp, "Administrator", "Administrator")],
+			ignore_duplicates=True,
+		)
+
+	if exclusive:
+		lock = frappe.qb.DocType("Account Period Balance Lock")
+		frappe.qb.from_(lock).select(lock.name).where(lock.name == company).for_update().run()
+	else:
+		lock_clause = "for share" if frappe.db.db_type == "postgres" else "lock in share mode"
+		frappe.db.sql(
+			f"select name from `tabAccount Period Balance Lock` where name = %s {lock_clause}", company
+		)
+
+
+def rebuild_account_period_balances(company=None):
+	"""Recompute Account Period Balance from GL Entry, one month per transaction"""
+	companies = [company] if company else frappe.get_all("Company", pluck="name")
+	key_fields = get_key_fields()
+
+	for company in companies:
+		frappe.cache.hset(REBUILD_CACHE_KEY, company, now())
+		try:
+			periods = set(get_periods(company)) | set(get_periods(company, "Account Period Balance"))
+			if not frappe.flags.in_test:
+				# reads of a period must not share the snapshot taken before its lock
+				frappe.db.commit()  # nosemgrep
+
+			for period_start_date in sorted(periods):
+				rebuild_period_balances(company, period_start_date, key_fields)
+		finally:
+			frappe.cache.hdel(REBUILD_CACHE_KEY, company)
+
+
+def rebuild_period_balances(company, period_start_date, key_fields):
+	# the lock is taken before anything is read, so entries posted after it are added by the posting
+	lock_company_balances(company, exclusive=True)
+
+	frappe.db.delete("Account Period Balance", {"company": company, "posting_date": period_start_date})
+	balances = get_period_balances_from_gl(company, period_start_date, key_fields)
+	if balances:
+		insert_period_balances(balances)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()  # nosemgrep
+
+
+def check_account_period_balances(company):
+	"""Returns the period balances which do not match the aggregated GL Entries"""
+	key_fields = get_key_fields()
+	precision = frappe.get_precision("GL Entry", "debit")
+
+	apb = frappe.qb.DocType("Account Period Balance")
+	mismatches = []
+	periods = set(get_periods(company)) | set(get_periods(company, "Account Period Balance"))
+	for period_start_date in sorted(periods):
+		expected = get_period_balances_from_gl(company, period_start_date, key_fields)
+		actual = {
+			d.name: d
+			for d in (
+				frappe.qb.from_(apb)
+				.select(apb.name, apb.account, *[apb[field] for field in BALANCE_FIELDS])
+				.where((apb.company == company) & (apb.posting_date == period_start_date))
+			).run(as_dict=True)
+		}
+
+		for name in set(expected) | set(actual):
+			row = expected.get(name) or actual.get(name)
+			for field in BALANCE_FIELDS:
+				expected_value = flt(expected.get(name, {}).get(field), precision)
+				actual_value = flt(actual.get(name, {}).get(field), precision)
+				if expected_value != actual_value:
+					mismatches.append(
+						frappe._dict(
+							account=row.account,
+							posting_date=period_start_date,
+							field=field,
+							expected=expected_value,
+							actual=actual_value,
+						)
+					)
+
+	return mismatches
+
+
+@frappe.whitelist()
+def rebuild(company=None):
+	frappe.only_for(["Accounts Manager", "System Manager"])
+
+	enqueue_rebuild_account_period_balances(company)
+	frappe.msgprint(_("Account Period Balances will be rebuilt in the background."), alert=True)
+
+
+def enqueue_rebuild_account_period_balances(company=None):
+	# reports fall back to GL Entry until the job has rebuilt the balances
+	for name in [company] if company else frappe.get_all("Company", pluck="name"):
+		frappe.cache.hset(REBUILD_CACHE_KEY, name, now())
+
+	frappe.enqueue(
+		rebuild_account_period_balances,
+		queue="long",
+		job_id=f"rebuild_account_period_balances::{company or 'all'}",
+		timeout=6 * 60 * 60,
+		enqueue_after_commit=True,
+		company=company,
+	)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Account Period Balance", ["company", "posting_date"])
@@ -0,0 +1,72 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.query_builder.functions import Sum
+from frappe.tests.utils import FrappeTestCase, change_settings
+from frappe.utils import flt, get_first_day, nowdate
+
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	REBUILD_CACHE_KEY,
+	check_account_period_balances,
+	get_ledger_doctype_for_period,
+	rebuild_account_period_balances,
+)
+from erpnext.accounts.doctype.journal_entry.test_journal_entry import make_journal_entry
+
+
+class TestAccountPeriodBalance(FrappeTestCase):
+	def tearDown(self):
+		frappe.cache.delete_value(REBUILD_CACHE_KEY)
+
+	def get_period_balance(self, account):
+		apb = frappe.qb.DocType("Account Period Balance")
+		debit, credit = (
+			frappe.qb.from_(apb)
+			.select(Sum(apb.debit), Sum(apb.credit))
+			.where(
+				(apb.company == "_Test Company")
+				& (apb.account == account)
+				& (apb.posting_date == get_first_day(nowdate()))
+			)
+		).run()[0]
+
+		return flt(debit), flt(credit)
+
+	@change_settings("Accounts Settings", {"use_account_period_balance": 1})
+	def test_balances_follow_gl_entries(self):
+		rebuild_account_period_balances("_Test Company")
+		account = "_Test Account Cost for Goods Sold - _TC"
+		debit, credit = self.get_period_balance(account)
+
+		je = make_journal_entry(account, "_Test Bank - _TC", 100, "_Test Cost Center - _TC", submit=True)
+		self.assertEqual(self.get_period_balance(account), (debit + 100, credit))
+		# postings lock a dedicated row rather than the Company master
+		self.assertTrue(frappe.db.exists("Account Period Balance Lock", "_Test Company"))
+		self.assertFalse(check_account_period_balances("_Test Company"))
+
+		je.cancel()
+		self.assertEqual(self.get_period_balance(account), (debit, credit))
+		self.assertFalse(check_account_period_balances("_Test Company"))
+
+	@change_settings("Accounts Settings", {"use_account_period_balance": 1})
+	def test_rebuild_fixes_drift(self):
+		rebuild_account_period_balances("_Test Company")
+		name = frappe.db.get_value("Account Period Balance", {"company": "_Test Company"})
+		frappe.db.set_value("Account Period Balance", name, "debit", 1234567, update_modified=False)
+		self.assertTrue(check_account_period_balances("_Test Company"))
+
+		rebuild_account_period_balances("_Test Company")
+		self.assertFalse(check_account_period_balances("_Test Company"))
+
+	@change_settings("Accounts Settings", {"use_account_period_balance": 1})
+	def test_ledger_doctype_for_period(self):
+		rebuild_account_period_balances("_Test Company")
+		self.assertEqual(
+			get_ledger_doctype_for_period("_Test Company", ["2024-04-01"], ["2025-03-31"]),
+			"Account Period Balance",
+		)
+		self.assertEqual(
+			get_ledger_doctype_for_period("_Test Company", ["2024-04-15"], ["2025-03-31"]), "GL Entry"
+		)
+		self.assertEqual(get_ledger_doctype_for_period("_Test Company", [None], ["2025-03-30"]), "GL Entry")
@@ -2,7 +2,15 @@
 // For license information, please see license.txt
 
 frappe.ui.form.on("Accounts Settings", {
-	refresh: function (frm) {},
+	refresh: function (frm) {
+		if (frm.doc.use_account_period_balance) {
+			frm.add_custom_button(__("Rebuild Account Period Balances"), () => {
+				frappe.call({
+					method: "erpnext.accounts.doctype.account_period_balance.account_period_balance.rebuild",
+				});
+			});
+		}
+	},
 	enable_immutable_ledger: function (frm) {
 		if (!frm.doc.enable_immutable_ledger) {
 			return;
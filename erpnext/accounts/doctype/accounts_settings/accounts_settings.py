@@ -10,6 +10,9 @@ from frappe.custom.doctype.property_setter.property_setter import make_property_
 from frappe.model.document import Document
 from frappe.utils import cint
 
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	enqueue_rebuild_account_period_balances,
+)
 from erpnext.stock.utils import check_pending_reposting
 
 
@@ -34,18 +37,21 @@ class AccountsSettings(Document):
 		book_deferred_entries_via_journal_entry: DF.Check
 		book_tax_discount_loss: DF.Check
 		check_supplier_invoice_uniqueness: DF.Check
+		consolidate_depreciation_entries: DF.Check
 		credit_controller: DF.Link | None
 		delete_linked_ledger_entries: DF.Check
 		determine_address_tax_category_from: DF.Literal["Billing Address", "Shipping Address"]
 		enable_common_party_accounting: DF.Check
 		enable_fuzzy_matching: DF.Check
 		enable_immutable_ledger: DF.Check
+		enable_parallel_depreciation_posting: DF.Check
 		enable_party_matching: DF.Check
 		frozen_accounts_modifier: DF.Link | None
 		general_ledger_remarks_length: DF.Int
 		ignore_account_closing_balance: DF.Check
 		make_payment_via_journal_entry: DF.Check
 		merge_similar_account_heads: DF.Check
+		no_of_parallel_depreciation_jobs: DF.Int
 		over_billing_allowance: DF.Currency
 		post_change_gl_entries: DF.Check
 		receivable_payable_remarks_length: DF.Int
@@ -59,6 +65,7 @@ class AccountsSettings(Document):
 		submit_journal_entries: DF.Check
 		unlink_advance_payment_on_cancelation_of_order: DF.Check
 		unlink_payment_on_cancellation_of_invoice: DF.Check
+		use_account_period_balance: DF.Check
 	# end: auto-generated types
 
 	def validate(self):
@@ -85,6 +92,10 @@ class AccountsSettings(Document):
 		if old_doc.acc_frozen_upto != self.acc_frozen_upto:
 			self.validate_pending_reposts()
 
+		if self.use_account_period_balance and not old_doc.use_account_period_balance:
+			# balances are not maintained while disabled, so they have to be rebuilt from GL Entry
+			enqueue_rebuild_account_period_balances()
+
 		if clear_cache:
 			frappe.clear_cache()
 
@@ -92,32 +92,31 @@ class GLEntry(Document):
 			validate_balance_type(self.account, adv_adj)
 			validate_frozen_account(self.account, adv_adj)
 
-			if (
-				self.voucher_type == "Journal Entry"
-				and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
-				== "Exchange Gain Or Loss"
-			):
-				return
-
-			if frappe.get_cached_value("Account", self.account, "account_type") not in [
-				"Receivable",
-				"Payable",
-			]:
-				# Update outstanding amt on against voucher
-				if (
-					self.against_voucher_type
-					in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-					and self.against_voucher
-					and self.flags.update_outstanding == "Yes"
-					and not frappe.flags.is_reverse_depr_entry
-				):
-					update_outstanding_amt(
-						self.account,
-						self.party_type,
-						self.party,
-						self.against_voucher_type,
-						self.against_voucher,
-					)
+			if self.should_update_outstanding():
+				update_outstanding_amt(
+					self.account,
+					self.party_type,
+					self.party,
+					self.against_voucher_type,
+					self.against_voucher,
+				)
+
+	def should_update_outstanding(self):
+		"""Outstanding amount on the against voucher is updated from ledger entries of non party accounts"""
+		if (
+			self.voucher_type == "Journal Entry"
+			and frappe.get_cached_value("Journal Entry", self.voucher_no, "voucher_type")
+			== "Exchange Gain Or Loss"
+		):
+			return False
+
+		return bool(
+			frappe.get_cached_value("Account", self.account, "account_type") not in ["Receivable", "Payable"]
+			and self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and self.against_voucher
+			and self.flags.update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		)
 
 	def check_mandatory(self):
 		mandatory = ["account", "voucher_type", "voucher_no", "company"]
@@ -219,32 +218,7 @@ class GLEntry(Document):
 
 	def validate_account_details(self, adv_adj):
 		"""Account must be ledger, active and not freezed"""
-
-		ret = frappe.db.sql(
-			"""select is_group, docstatus, company
-			from tabAccount where name=%s""",
-			self.account,
-			as_dict=1,
-		)[0]
-
-		if ret.is_group == 1:
-			frappe.throw(
-				_(
-					"""{0} {1}: Account {2} is a Group Account and group accounts cannot be used in transactions"""
-				).format(self.voucher_type, self.voucher_no, self.account)
-			)
-
-		if ret.docstatus == 2:
-			frappe.throw(
-				_("{0} {1}: Account {2} is inactive").format(self.voucher_type, self.voucher_no, self.account)
-			)
-
-		if ret.company != self.company:
-			frappe.throw(
-				_("{0} {1}: Account {2} does not belong to Company {3}").format(
-					self.voucher_type, self.voucher_no, self.account, self.company
-				)
-			)
+		validate_account_details_for_entries([self])
 
 	def validate_cost_center(self):
 		if not self.cost_center:
@@ -297,6 +271,48 @@ class GLEntry(Document):
 		frappe.throw(msg)
 
 
+def validate_account_details_for_entries(entries):
+	"""Validate the accounts of all `entries` with a single query on Account"""
+	accounts = {
+		d.name: d
+		for d in frappe.get_all(
+			"Account",
+			filters={"name": ("in", list({entry.account for entry in entries}))},
+			fields=["name", "is_group", "docstatus", "company"],
+		)
+	}
+
+	for entry in entries:
+		account = accounts.get(entry.account)
+		if not account:
+			frappe.throw(
+				_("{0} {1}: Account {2} does not exist").format(
+					entry.voucher_type, entry.voucher_no, entry.account
+				)
+			)
+
+		if account.is_group == 1:
+			frappe.throw(
+				_(
+					"""{0} {1}: Account {2} is a Group Account and group accounts cannot be used in transactions"""
+				).format(entry.voucher_type, entry.voucher_no, entry.account)
+			)
+
+		if account.docstatus == 2:
+			frappe.throw(
+				_("{0} {1}: Account {2} is inactive").format(
+					entry.voucher_type, entry.voucher_no, entry.account
+				)
+			)
+
+		if account.company != entry.company:
+			frappe.throw(
+				_("{0} {1}: Account {2} does not belong to Company {3}").format(
+					entry.voucher_type, entry.voucher_no, entry.account, entry.company
+				)
+			)
+
+
 def validate_balance_type(account, adv_adj=False):
 	if not adv_adj and account:
 		balance_must_be = frappe.get_cached_value("Account", account, "balance_must_be")
@@ -3,6 +3,7 @@
 
 
 import unittest
+from unittest.mock import patch
 
 import frappe
 from frappe.model.naming import parse_naming_series
@@ -79,3 +80,44 @@ class TestGLEntry(unittest.TestCase):
 			"SELECT current from tabSeries where name = %s", naming_series
 		)[0][0]
 		self.assertEqual(old_naming_series_current_value + 2, new_naming_series_current_value)
+
+	def test_bulk_insertion_of_gl_entries(self):
+		with patch("erpnext.accounts.utils.BULK_LEDGER_ENTRY_THRESHOLD", 2):
+			je = make_journal_entry(
+				"_Test Account Cost for Goods Sold - _TC",
+				"_Test Bank - _TC",
+				100,
+				"_Test Cost Center - _TC",
+				submit=True,
+			)
+
+		gl_entries = frappe.get_all(
+			"GL Entry",
+			fields=["account", "debit", "credit", "docstatus", "to_rename", "is_cancelled"],
+			filters={"voucher_type": "Journal Entry", "voucher_no": je.name},
+			order_by="account",
+		)
+
+		self.assertEqual(len(gl_entries), 2)
+		self.assertEqual(
+			[(d.account, d.debit, d.credit) for d in gl_entries],
+			[("_Test Account Cost for Goods Sold - _TC", 100, 0), ("_Test Bank - _TC", 0, 100)],
+		)
+		self.assertTrue(all(d.docstatus == 1 and d.to_rename == 1 and not d.is_cancelled for d in gl_entries))
+
+		je.cancel()
+		self.assertFalse(
+			frappe.db.exists(
+				"GL Entry", {"voucher_type": "Journal Entry", "voucher_no": je.name, "is_cancelled": 0}
+			)
+		)
+
+	def test_bulk_insertion_skipped_for_generic_hooks(self):
+		from erpnext.accounts.utils import can_insert_ledger_entries_in_bulk
+
+		entries = [frappe._dict()] * 50
+		self.assertTrue(can_insert_ledger_entries_in_bulk("GL Entry", entries))
+
+		# handlers registered by other apps for every doctype must run for each ledger entry
+		with patch("frappe.get_hooks", return_value={"*": {"on_submit": ["other_app.events.on_submit"]}}):
+			self.assertFalse(can_insert_ledger_entries_in_bulk("GL Entry", entries))
@@ -17,6 +17,9 @@ from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger
 	validate_docs_for_deferred_accounting,
 	validate_docs_for_voucher_types,
 )
+from erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance import (
+	update_tax_withholding_balances,
+)
 from erpnext.accounts.doctype.tax_withholding_category.tax_withholding_category import (
 	get_party_tax_withholding_details,
 )
@@ -190,6 +193,7 @@ class JournalEntry(AccountsController):
 		self.validate_cheque_info()
 		self.check_credit_limit()
 		self.make_gl_entries()
+		update_tax_withholding_balances(self)
 		self.update_advance_paid()
 		self.update_asset_value()
 		self.update_inter_company_jv()
@@ -219,6 +223,7 @@ class JournalEntry(AccountsController):
 			"Unreconcile Payment",
 			"Unreconcile Payment Entries",
 		)
+		update_tax_withholding_balances(self, cancel=True)
 		self.make_gl_entries(1)
 		self.update_advance_paid()
 		self.unlink_advance_entry_reference()
@@ -169,15 +169,18 @@ class PaymentLedgerEntry(Document):
 				validate_balance_type(self.account, adv_adj)
 
 		# update outstanding amount
-		if (
-			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
-			and self.flags.update_outstanding == "Yes"
-			and not frappe.flags.is_reverse_depr_entry
-		):
+		if self.should_update_outstanding():
 			update_voucher_outstanding(
 				self.against_voucher_type, self.against_voucher_no, self.account, self.party_type, self.party
 			)
 
+	def should_update_outstanding(self):
+		return bool(
+			self.against_voucher_type in ["Journal Entry", "Sales Invoice", "Purchase Invoice", "Fees"]
+			and self.flags.update_outstanding == "Yes"
+			and not frappe.flags.is_reverse_depr_entry
+		)
+
 
 def on_doctype_update():
 	frappe.db.add_index("Payment Ledger Entry", ["against_voucher_no", "against_voucher_type"])
@@ -424,9 +424,17 @@ class PaymentReconciliation(Document):
 		)
 
 		entries = []
+		invoices = args.get("invoices")
+		# invoices are allocated in order, so the ones fully allocated to earlier payments are
+		# skipped once instead of being walked through again for every payment
+		start = 0
 		for pay in args.get("payments"):
 			pay.update({"unreconciled_amount": pay.get("amount")})
-			for inv in args.get("invoices"):
+			while start < len(invoices) and invoices[start].get("outstanding_amount") == 0:
+				start += 1
+
+			for idx in range(start, len(invoices)):
+				inv = invoices[idx]
 				if pay.get("amount") >= inv.get("outstanding_amount"):
 					res = self.get_allocated_entry(pay, inv, inv["outstanding_amount"])
 					pay["amount"] = flt(pay.get("amount")) - flt(inv.get("outstanding_amount"))
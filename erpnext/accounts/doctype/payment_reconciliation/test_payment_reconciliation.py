@@ -623,6 +623,57 @@ class TestPaymentReconciliation(FrappeTestCase):
 		self.assertEqual(len(pr.get("invoices")), 0)
 		self.assertEqual(len(pr.get("payments")), 0)
 
+	def test_allocation_across_multiple_payments_and_invoices(self):
+		invoices = [self.create_sales_invoice(qty=1, rate=rate) for rate in (100, 200, 300)]
+
+		# credit debtors account to record a payment
+		je = self.create_journal_entry(self.bank, self.debit_to, 250)
+		je.accounts[1].party_type = "Customer"
+		je.accounts[1].party = self.customer
+		je.save()
+		je.submit()
+		pe = self.create_payment_entry(amount=350).save().submit()
+
+		pr = self.create_payment_reconciliation()
+		pr.get_unreconciled_entries()
+		pr.allocate_entries(
+			frappe._dict(
+				{
+					"invoices": sorted(
+						[x.as_dict() for x in pr.get("invoices")], key=lambda x: x.outstanding_amount
+					),
+					"payments": sorted([x.as_dict() for x in pr.get("payments")], key=lambda x: x.amount),
+				}
+			)
+		)
+
+		self.assertEqual(
+			[(row.reference_name, row.invoice_number, row.allocated_amount) for row in pr.allocation],
+			[
+				(je.name, invoices[0].name, 100),
+				(je.name, invoices[1].name, 150),
+				(pe.name, invoices[1].name, 50),
+				(pe.name, invoices[2].name, 300),
+			],
+		)
+
+		pr.reconcile()
+
+		for si in invoices:
+			si.reload()
+			self.assertEqual(si.status, "Paid")
+			self.assertEqual(si.outstanding_amount, 0)
+
+		# both references of the journal are added by a single update
+		je.reload()
+		self.assertEqual(
+			sorted((d.reference_name, d.credit_in_account_currency) for d in je.accounts if d.reference_name),
+			sorted([(invoices[0].name, 100), (invoices[1].name, 150)]),
+		)
+
+		self.assertEqual(len(pr.get("invoices")), 0)
+		self.assertEqual(len(pr.get("payments")), 0)
+
 	def test_journal_against_journal(self):
 		transaction_date = nowdate()
 		sales = "Sales - _PR"
@@ -1237,6 +1237,46 @@ class TestPricingRule(unittest.TestCase):
 		frappe.delete_doc_if_exists("Pricing Rule", "_Test Pricing Rule 1")
 		frappe.delete_doc_if_exists("Pricing Rule", "_Test Pricing Rule 2")
 
+	def test_pricing_rule_index_is_rebuilt(self):
+		pricing_rule = make_pricing_rule(selling=1, discount_percentage=10)
+
+		args = frappe._dict(
+			{
+				"item_code": "_Test Item",
+				"company": "_Test Company",
+				"price_list": "_Test Price List",
+				"currency": "_Test Currency",
+				"doctype": "Sales Order",
+				"conversion_rate": 1,
+				"price_list_currency": "_Test Currency",
+				"plc_conversion_rate": 1,
+				"order_type": "Sales",
+				"customer": "_Test Customer",
+				"name": None,
+			}
+		)
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 10)
+
+		# changes made without document hooks must be picked up as well
+		frappe.db.set_value("Pricing Rule", pricing_rule.name, "discount_percentage", 20)
+		self.assertEqual(get_item_details(args.copy()).get("discount_percentage"), 20)
+
+		frappe.db.set_value("Pricing Rule", pricing_rule.name, "disable", 1)
+		self.assertFalse(get_item_details(args.copy()).get("pricing_rules"))
+
+	def test_pricing_rule_company_without_transaction_company(self):
+		from erpnext.accounts.doctype.pricing_rule.utils import is_pricing_rule_applicable
+
+		pricing_rule = frappe._dict(selling=1, company="_Test Company")
+		args = frappe._dict(transaction_type="selling", doctype="Sales Order")
+
+		# the company is only matched when the transaction has one
+		self.assertTrue(is_pricing_rule_applicable(pricing_rule, args))
+		self.assertTrue(is_pricing_rule_applicable(pricing_rule, frappe._dict(args, company="_Test Company")))
+		self.assertFalse(
+			is_pricing_rule_applicable(pricing_rule, frappe._dict(args, company="_Test Company 1"))
+		)
+
 
 test_dependencies = ["Campaign"]
 
@@ -10,11 +10,13 @@ import math
 
 import frappe
 from frappe import _, bold
-from frappe.utils import cint, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.query_builder.functions import Count, Max
+from frappe.utils import cint, cstr, flt, fmt_money, get_link_to_form, getdate, today
+from frappe.utils.caching import site_cache
 
 from erpnext.setup.doctype.item_group.item_group import get_child_item_groups
 from erpnext.stock.doctype.warehouse.warehouse import get_child_warehouses
-from erpnext.stock.get_item_details import get_conversion_factor
+from erpnext.stock.get_item_details import get_cached_details, get_conversion_factor
 
 
 class MultiplePricingRuleConflict(frappe.ValidationError):
@@ -23,16 +25,18 @@ class MultiplePricingRuleConflict(frappe.ValidationError):
 
 apply_on_table = {"Item Code": "items", "Item Group": "item_groups", "Brand": "brands"}
 
+PRICING_RULE_INDEX_VERSION_KEY = "pricing_rule_index_version"
+
 
 def get_pricing_rules(args, doc=None):
 	pricing_rules = []
-	values = {}
+	index = get_pricing_rule_index()
 
-	if not frappe.db.exists("Pricing Rule", {"disable": 0, args.transaction_type: 1}):
+	if args.transaction_type not in index.transaction_types:
 		return
 
 	for apply_on in ["Item Code", "Item Group", "Brand"]:
-		pricing_rules.extend(_get_pricing_rules(apply_on, args, values))
+		pricing_rules.extend(_get_pricing_rules(apply_on, args, index))
 		if pricing_rules and pricing_rules[0].has_priority:
 			continue
 
@@ -99,78 +103,175 @@ def filter_pricing_rule_based_on_condition(pricing_rules, doc=None):
 	return filtered_pricing_rules
 
 
-def _get_pricing_rules(apply_on, args, values):
+def _get_pricing_rules(apply_on, args, index):
+	"""Returns the Pricing Rules applicable on `args` for `apply_on`, looked up in the rule index"""
 	apply_on_field = frappe.scrub(apply_on)
 
 	if not args.get(apply_on_field):
 		return []
 
-	child_doc = f"`tabPricing Rule {apply_on}`"
+	child_rows = index.child_rows[apply_on]
+	uom = args.get("uom")
+	matches = {}
 
-	conditions = item_variant_condition = item_conditions = ""
-	values[apply_on_field] = args.get(apply_on_field)
-	if apply_on_field in ["item_code", "brand"]:
-		item_conditions = f"{child_doc}.{apply_on_field}= %({apply_on_field})s"
+	def add_matches(value, check_uom=False):
+		for name, position in index.rules_by_value[apply_on].get(value, []):
+			row = child_rows[name][position]
+			if not check_uom or not uom or cstr(row.uom) in (uom, ""):
+				matches[(name, position)] = row
 
-		if apply_on_field == "item_code":
-			if args.get("uom", None):
-				item_conditions += (
-					" and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-						child_doc=child_doc, item_uom=args.get("uom")
-					)
-				)
-			if "variant_of" not in args:
-				args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+	if apply_on_field == "item_code":
+		add_matches(args.item_code, check_uom=True)
+
+		if "variant_of" not in args:
+			args.variant_of = frappe.get_cached_value("Item", args.item_code, "variant_of")
+
+		if args.variant_of:
+			add_matches(args.variant_of)
 
-			if args.variant_of:
-				item_variant_condition = f" or {child_doc}.item_code=%(variant_of)s "
-				values["variant_of"] = args.variant_of
 	elif apply_on_field == "item_group":
-		item_conditions = _get_tree_conditions(args, "Item Group", child_doc, False)
-		if args.get("uom", None):
-			item_conditions += " and ({child_doc}.uom='{item_uom}' or IFNULL({child_doc}.uom, '')='')".format(
-				child_doc=child_doc, item_uom=args.get("uom")
-			)
+		for item_group in _get_parent_groups(args, "Item Group"):
+			add_matches(item_group, check_uom=True)
+
+	else:
+		add_matches(args.get(apply_on_field))
 
-	conditions += get_other_conditions(conditions, values, args)
-	warehouse_conditions = _get_tree_conditions(args, "Warehouse", "`tabPricing Rule`")
-	if warehouse_conditions:
-		warehouse_conditions = f" and {warehouse_conditions}"
+	# rules applied on other items match through every row of their apply on table
+	for name in index.rules_by_other_value[apply_on].get(args.get(apply_on_field), []):
+		for position, row in enumerate(child_rows.get(name, [])):
+			matches[(name, position)] = row
 
 	if not args.price_list:
 		args.price_list = None
 
-	conditions += " and ifnull(`tabPricing Rule`.for_price_list, '') in (%(price_list)s, '')"
-	values["price_list"] = args.get("price_list")
-
-	pricing_rules = (
-		frappe.db.sql(
-			"""select `tabPricing Rule`.*,
-			{child_doc}.{apply_on_field}, {child_doc}.uom
-		from `tabPricing Rule`, {child_doc}
-		where ({item_conditions} or (`tabPricing Rule`.apply_rule_on_other is not null
-			and `tabPricing Rule`.{apply_on_other_field}=%({apply_on_field})s) {item_variant_condition})
-			and {child_doc}.parent = `tabPricing Rule`.name
-			and `tabPricing Rule`.disable = 0 and
-			`tabPricing Rule`.{transaction_type} = 1 {warehouse_cond} {conditions}
-		order by `tabPricing Rule`.priority desc,
-			`tabPricing Rule`.name desc""".format(
-				child_doc=child_doc,
-				apply_on_field=apply_on_field,
-				item_conditions=item_conditions,
-				item_variant_condition=item_variant_condition,
-				transaction_type=args.transaction_type,
-				warehouse_cond=warehouse_conditions,
-				apply_on_other_field=f"other_{apply_on_field}",
-				conditions=conditions,
-			),
-			values,
-			as_dict=1,
-		)
-		or []
+	pricing_rules = []
+	for (name, _position), row in matches.items():
+		pricing_rule = index.rules[name]
+		if is_pricing_rule_applicable(pricing_rule, args):
+			pricing_rules.append(
+				frappe._dict(pricing_rule, **{apply_on_field: row.get(apply_on_field), "uom": row.uom})
+			)
+
+	return sorted(pricing_rules, key=lambda d: (cstr(d.priority), d.name), reverse=True)
+
+
+def is_pricing_rule_applicable(pricing_rule, args):
+	"""Checks the party, company, warehouse, price list and validity conditions of a Pricing Rule"""
+	if not cint(pricing_rule.get(args.transaction_type)):
+		return False
+
+	if args.get("doctype") in [
+		"Quotation",
+		"Quotation Item",
+		"Sales Order",
+		"Sales Order Item",
+		"Delivery Note",
+		"Delivery Note Item",
+		"Sales Invoice",
+		"Sales Invoice Item",
+		"POS Invoice",
+		"POS Invoice Item",
+	]:
+		if not cint(pricing_rule.selling):
+			return False
+	elif not cint(pricing_rule.buying):
+		return False
+
+	# like the other conditions, the company is only matched when the transaction has one
+	if args.get("company") and cstr(pricing_rule.company) not in (args.company, ""):
+		return False
+
+	for field in ["customer", "supplier", "campaign", "sales_partner"]:
+		if cstr(pricing_rule.get(field)) not in (cstr(args.get(field)), ""):
+			return False
+
+	for parenttype in ["Customer Group", "Territory", "Supplier Group", "Warehouse"]:
+		field = frappe.scrub(parenttype)
+		if args.get(field) and cstr(pricing_rule.get(field)) not in [
+			*_get_parent_groups(args, parenttype),
+			"",
+		]:
+			return False
+
+	if args.get("transaction_date") and not (
+		getdate(pricing_rule.valid_from or "2000-01-01")
+		<= getdate(args.transaction_date)
+		<= getdate(pricing_rule.valid_upto or "2500-12-31")
+	):
+		return False
+
+	return cstr(pricing_rule.for_price_list) in (cstr(args.price_list), "")
+
+
+def get_pricing_rule_index():
+	# Pricing Rules do not change while a document is validated, check the version once per batch of items
+	return build_pricing_rule_index(get_cached_details(get_pricing_rule_index_version))
+
+
+def get_pricing_rule_index_version():
+	"""
+	Returns the version of the enabled Pricing Rules. Besides the token replaced when a Pricing Rule
+	is saved or deleted, it includes their count and last modified timestamp to catch direct updates.
+	"""
+	pr = frappe.qb.DocType("Pricing Rule")
+	count, last_modified = (
+		frappe.qb.from_(pr).select(Count(pr.name), Max(pr.modified)).where(pr.disable == 0)
+	).run()[0]
+
+	return (frappe.cache.get_value(PRICING_RULE_INDEX_VERSION_KEY), count, cstr(last_modified))
+
+
+def clear_pricing_rule_index():
+	"""Makes `get_pricing_rules` rebuild the rule index on its next call, in every worker"""
+	frappe.cache.set_value(PRICING_RULE_INDEX_VERSION_KEY, frappe.generate_hash())
+
+
+@site_cache(maxsize=2)
+def build_pricing_rule_index(version):
+	"""
+	Compiles the enabled Pricing Rules into dictionaries keyed by item code, item group and brand, and
+	by the other item, group or brand they are applied on.
+	"""
+	index = frappe._dict(
+		rules={
+			d.name: d for d in frappe.db.sql("select * from `tabPricing Rule` where disable = 0", as_dict=1)
+		},
+		child_rows={},
+		rules_by_value={},
+		rules_by_other_value={},
 	)
+	index.transaction_types = {
+		transaction_type
+		for transaction_type in ("selling", "buying")
+		if any(cint(d.get(transaction_type)) for d in index.rules.values())
+	}
+
+	for apply_on in apply_on_table:
+		apply_on_field = frappe.scrub(apply_on)
+		child = frappe.qb.DocType(f"Pricing Rule {apply_on}")
+
+		child_rows = index.child_rows[apply_on] = {}
+		rules_by_value = index.rules_by_value[apply_on] = {}
+		for row in (
+			frappe.qb.from_(child)
+			.select(child.parent, child[apply_on_field], child.uom)
+			.orderby(child.parent)
+			.orderby(child.idx)
+		).run(as_dict=True):
+			if row.parent not in index.rules:
+				continue
+
+			rows = child_rows.setdefault(row.parent, [])
+			rules_by_value.setdefault(cstr(row.get(apply_on_field)), []).append((row.parent, len(rows)))
+			rows.append(row)
 
-	return pricing_rules
+		rules_by_other_value = index.rules_by_other_value[apply_on] = {}
+		for pricing_rule in index.rules.values():
+			other_value = pricing_rule.get(f"other_{apply_on_field}")
+			if pricing_rule.apply_rule_on_other is not None and other_value:
+				rules_by_other_value.setdefault(other_value, []).append(pricing_rule.name)
+
+	return index
 
 
 def apply_multiple_pricing_rules(pricing_rules):
@@ -194,29 +295,7 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 		if key in frappe.flags.tree_conditions:
 			return frappe.flags.tree_conditions[key]
 
-		try:
-			lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
-		except TypeError:
-			frappe.throw(_("Invalid {0}").format(args.get(field)))
-
-		parent_groups = frappe.db.sql_list(
-			"""select name from `tab{}`
-			where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
-			(lft, rgt),
-		)
-
-		if parenttype in ["Customer Group", "Item Group", "Territory"]:
-			parent_field = f"parent_{frappe.scrub(parenttype)}"
-			root_name = frappe.db.get_list(
-				parenttype,
-				{"is_group": 1, parent_field: ("is", "not set")},
-				"name",
-				as_list=1,
-				ignore_permissions=True,
-			)
-
-			if root_name and root_name[0][0]:
-				parent_groups.append(root_name[0][0])
+		parent_groups = list(_get_parent_groups(args, parenttype))
 
 		if parent_groups:
 			if allow_blank:
@@ -229,6 +308,46 @@ def _get_tree_conditions(args, parenttype, table, allow_blank=True):
 	return condition
 
 
+def _get_parent_groups(args, parenttype):
+	"""Returns the value of `parenttype` in `args` with its ancestors, and the root for groups and territories"""
+	field = frappe.scrub(parenttype)
+	if not args.get(field):
+		return []
+
+	if not frappe.flags.parent_groups:
+		frappe.flags.parent_groups = {}
+	key = (parenttype, args.get(field))
+	if key in frappe.flags.parent_groups:
+		return frappe.flags.parent_groups[key]
+
+	try:
+		lft, rgt = frappe.db.get_value(parenttype, args.get(field), ["lft", "rgt"])
+	except TypeError:
+		frappe.throw(_("Invalid {0}").format(args.get(field)))
+
+	parent_groups = frappe.db.sql_list(
+		"""select name from `tab{}`
+		where lft<={} and rgt>={}""".format(parenttype, "%s", "%s"),
+		(lft, rgt),
+	)
+
+	if parenttype in ["Customer Group", "Item Group", "Territory"]:
+		parent_field = f"parent_{frappe.scrub(parenttype)}"
+		root_name = frappe.db.get_list(
+			parenttype,
+			{"is_group": 1, parent_field: ("is", "not set")},
+			"name",
+			as_list=1,
+			ignore_permissions=True,
+		)
+
+		if root_name and root_name[0][0]:
+			parent_groups.append(root_name[0][0])
+
+	frappe.flags.parent_groups[key] = parent_groups
+	return parent_groups
+
+
 def get_other_conditions(conditions, values, args):
 	for field in ["company", "customer", "supplier", "campaign", "sales_partner"]:
 		if args.get(field):
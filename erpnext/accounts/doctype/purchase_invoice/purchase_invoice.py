@@ -10,6 +10,9 @@ from frappe.utils import cint, cstr, flt, formatdate, get_link_to_form, getdate,
 
 import erpnext
 from erpnext.accounts.deferred_revenue import validate_service_stop_date
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	update_account_period_balances,
+)
 from erpnext.accounts.doctype.gl_entry.gl_entry import update_outstanding_amt
 from erpnext.accounts.doctype.repost_accounting_ledger.repost_accounting_ledger import (
 	validate_docs_for_deferred_accounting,
@@ -23,6 +26,9 @@ from erpnext.accounts.doctype.sales_invoice.sales_invoice import (
 	update_linked_doc,
 	validate_inter_company_party,
 )
+from erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance import (
+	update_tax_withholding_balances,
+)
 from erpnext.accounts.doctype.tax_withholding_category.tax_withholding_category import (
 	get_party_tax_withholding_details,
 )
@@ -731,6 +737,7 @@ class PurchaseInvoice(BuyingController):
 
 		# this sequence because outstanding may get -negative
 		self.make_gl_entries()
+		update_tax_withholding_balances(self)
 
 		if self.update_stock == 1:
 			self.repost_future_sle_and_gle()
@@ -788,16 +795,17 @@ class PurchaseInvoice(BuyingController):
 		if rows:
 			# cancel gl entries
 			gle = qb.DocType("GL Entry")
-			gle_update_query = (
-				qb.update(gle)
-				.set(gle.is_cancelled, 1)
-				.where(
-					(gle.voucher_type == "Purchase Receipt")
-					& (gle.voucher_no.isin(purchase_receipts))
-					& (gle.voucher_detail_no.isin(rows))
-				)
+			conditions = (
+				(gle.voucher_type == "Purchase Receipt")
+				& (gle.voucher_no.isin(purchase_receipts))
+				& (gle.voucher_detail_no.isin(rows))
+				& (gle.is_cancelled == 0)
 			)
-			gle_update_query.run()
+
+			gl_entries = qb.from_(gle).select("*").where(conditions).run(as_dict=True)
+			update_account_period_balances(gl_entries, cancel=True)
+
+			qb.update(gle).set(gle.is_cancelled, 1).where(conditions).run()
 
 	def update_supplier_outstanding(self, update_outstanding):
 		if update_outstanding == "No":
@@ -1517,6 +1525,7 @@ class PurchaseInvoice(BuyingController):
 			if self.is_old_subcontracting_flow:
 				self.set_consumed_qty_in_subcontract_order()
 
+		update_tax_withholding_balances(self, cancel=True)
 		self.make_gl_entries_on_cancel()
 
 		if self.update_stock == 1:
@@ -1566,6 +1566,32 @@ class TestPurchaseInvoice(FrappeTestCase, StockTestMixin):
 
 		toggle_provisional_accounting_setting()
 
+	@change_settings("Accounts Settings", {"use_account_period_balance": 1})
+	def test_account_period_balances_on_provisional_entry_cancellation(self):
+		from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+			check_account_period_balances,
+			rebuild_account_period_balances,
+		)
+
+		setup_provisional_accounting()
+		rebuild_account_period_balances("_Test Company")
+
+		pr = make_purchase_receipt(item_code="_Test Non Stock Item", posting_date=add_days(nowdate(), -2))
+
+		pi = create_purchase_invoice_from_receipt(pr.name)
+		pi.set_posting_time = 1
+		pi.posting_date = add_days(pr.posting_date, -1)
+		pi.items[0].expense_account = "Cost of Goods Sold - _TC"
+		pi.save()
+		pi.submit()
+		self.assertFalse(check_account_period_balances("_Test Company"))
+
+		# reverse provisional entries of the Purchase Receipt are cancelled with the invoice
+		pi.cancel()
+		self.assertFalse(check_account_period_balances("_Test Company"))
+
+		toggle_provisional_accounting_setting()
+
 	def test_provisional_accounting_entry_for_over_billing(self):
 		setup_provisional_accounting()
 
@@ -24,7 +24,10 @@ from erpnext.assets.doctype.asset_depreciation_schedule.asset_depreciation_sched
 	get_depr_schedule,
 )
 from erpnext.controllers.accounts_controller import InvalidQtyError, update_invoice_status
-from erpnext.controllers.taxes_and_totals import get_itemised_tax_breakup_data
+from erpnext.controllers.taxes_and_totals import (
+	calculate_taxes_and_totals,
+	get_itemised_tax_breakup_data,
+)
 from erpnext.exceptions import InvalidAccountCurrency, InvalidCurrency
 from erpnext.selling.doctype.customer.test_customer import get_customer_dict
 from erpnext.stock.doctype.delivery_note.delivery_note import make_sales_invoice
@@ -592,6 +595,53 @@ class TestSalesInvoice(FrappeTestCase):
 		self.assertEqual(si.rounding_adjustment, 0.43)
 		self.assertEqual(si.rounded_total, 5676.0)
 
+	def test_item_tax_rates_are_shared_between_items(self):
+		si = create_sales_invoice(qty=10, rate=100, do_not_save=True)
+		item_row = si.get("items")[0]
+		for item_tax_template in (
+			"_Test Account Excise Duty @ 12 - _TC",
+			"_Test Account Excise Duty @ 12 - _TC",
+			"_Test Account Excise Duty @ 15 - _TC",
+		):
+			item_row_copy = copy.deepcopy(item_row)
+			item_row_copy.item_tax_template = item_tax_template
+			si.append("items", item_row_copy)
+
+		for account_head, charge_type, rate, row_id in (
+			("_Test Account Excise Duty - _TC", "On Net Total", 11, None),
+			("_Test Account Education Cess - _TC", "On Previous Row Amount", 3, 1),
+			("_Test Account S&H Education Cess - _TC", "On Previous Row Total", 2, 2),
+		):
+			si.append(
+				"taxes",
+				{
+					"account_head": account_head,
+					"charge_type": charge_type,
+					"cost_center": "_Test Cost Center - _TC",
+					"description": charge_type,
+					"doctype": "Sales Taxes and Charges",
+					"rate": rate,
+					"row_id": row_id,
+				},
+			)
+		si.insert()
+
+		calculator = calculate_taxes_and_totals(si)
+		item_tax_rates = calculator.get_item_tax_rates()
+		self.assertIs(item_tax_rates[1], item_tax_rates[2])
+		self.assertEqual(
+			[tax_rates for _item_tax_map, tax_rates in item_tax_rates],
+			[[11, 3, 2], [12, 3, 2], [12, 3, 2], [15, 3, 2]],
+		)
+
+		for item_tax_map, tax_rates in item_tax_rates:
+			self.assertEqual(tax_rates, [calculator._get_tax_rate(tax, item_tax_map) for tax in si.taxes])
+
+		self.assertEqual(si.taxes[0].tax_amount, 500)
+		self.assertEqual(si.taxes[1].tax_amount, 15)
+		self.assertEqual(si.taxes[2].tax_amount, 90.3)
+		self.assertEqual(si.grand_total, 4605.3)
+
 	def test_tax_calculation_with_multiple_items_and_discount(self):
 		si = create_sales_invoice(qty=1, rate=75, do_not_save=True)
 		item_row = si.get("items")[0]
@@ -0,0 +1,355 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import cstr, flt, getdate, now
+
+BALANCE_FIELDS = ("tax_withholding_net_total", "grand_total", "journal_amount", "tax_deducted")
+
+
+class TaxWithholdingBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		company: DF.Link | None
+		from_date: DF.Date | None
+		grand_total: DF.Currency
+		journal_amount: DF.Currency
+		party: DF.DynamicLink | None
+		party_type: DF.Link | None
+		tax_deducted: DF.Currency
+		tax_withholding_category: DF.Link | None
+		tax_withholding_net_total: DF.Currency
+		to_date: DF.Date | None
+	# end: auto-generated types
+
+	pass
+
+
+def update_tax_withholding_balances(doc, cancel=False):
+	"""
+	Add the amounts of a Purchase Invoice or Journal Entry on which tax is withheld to
+	(or on cancellation subtract them from) the running balances of its parties.
+
+	Must be called while the GL Entries of the voucher are active, i.e. after they are
+	made on submit and before they are reversed on cancel.
+	"""
+	if not doc.get("apply_tds") or not doc.get("tax_withholding_category") or doc.is_opening == "Yes":
+		return
+
+	period = get_tax_withholding_period(doc.tax_withholding_category, doc.posting_date, doc.company)
+	if not period:
+		return
+
+	amounts = {}
+	if doc.doctype == "Purchase Invoice":
+		amounts[("Supplier", doc.supplier)] = frappe._dict(
+			tax_withholding_net_total=doc.tax_withholding_net_total, grand_total=doc.grand_total
+		)
+	else:
+		for d in doc.get("accounts"):
+			if not d.party:
+				continue
+
+			row = amounts.setdefault((d.party_type, d.party), frappe._dict(journal_amount=0.0))
+			if d.reference_type != "Purchase Invoice":
+				row.journal_amount += flt(d.credit_in_account_currency) - flt(d.debit_in_account_currency)
+
+	if amounts:
+		tax_deducted = get_tax_deducted_on_vouchers([doc.name], period).get(doc.name, 0.0)
+		split_tax_deducted(tax_deducted, list(amounts.values()))
+
+	sign = -1 if cancel else 1
+	balances = {}
+	for (party_type, party), row in amounts.items():
+		add_to_balance(
+			balances, doc.company, doc.tax_withholding_category, period, party_type, party, row, sign
+		)
+
+	add_to_tax_withholding_balances(balances)
+
+
+def get_tax_withholding_balance(parties, company, tax_details):
+	"""Returns the amounts accumulated for `parties` over the withholding period of `tax_details`"""
+	twb = frappe.qb.DocType("Tax Withholding Balance")
+	balance = (
+		frappe.qb.from_(twb)
+		.select(*(Sum(twb[field]).as_(field) for field in BALANCE_FIELDS))
+		.where(
+			(twb.company == company)
+			& (twb.tax_withholding_category == tax_details.tax_withholding_category)
+			& (twb.from_date == tax_details.from_date)
+			& (twb.party.isin(parties))
+		)
+	).run(as_dict=True)[0]
+
+	return frappe._dict({field: flt(balance.get(field)) for field in BALANCE_FIELDS})
+
+
+def get_tax_withholding_period(tax_withholding_category, posting_date, company):
+	"""Returns the withholding period of `posting_date` and the account tax is withheld in for `company`"""
+	category = frappe.get_cached_doc("Tax Withholding Category", tax_withholding_category)
+	account_head = next((d.account for d in category.accounts if d.company == company), None)
+
+	for rate in category.rates:
+		if account_head and getdate(rate.from_date) <= getdate(posting_date) <= getdate(rate.to_date):
+			return frappe._dict(account_head=account_head, from_date=rate.from_date, to_date=rate.to_date)
+
+
+def get_tax_deducted_on_vouchers(vouchers, period):
+	"""Returns the amount credited to the withholding account by each of `vouchers`"""
+	gle = frappe.qb.DocType("GL Entry")
+	entries = (
+		frappe.qb.from_(gle)
+		.select(gle.voucher_no, Sum(gle.credit).as_("credit"))
+		.where(
+			(gle.voucher_no.isin(vouchers))
+			& (gle.account == period.account_head)
+			& (gle.credit > 0)
+			& (gle.is_cancelled == 0)
+			& (gle.posting_date[period.from_date : period.to_date])
+		)
+		.groupby(gle.voucher_no)
+	).run()
+
+	return {voucher_no: flt(credit) for voucher_no, credit in entries}
+
+
+def split_tax_deducted(tax_deducted, rows):
+	"""
+	Share the tax withheld on a voucher between its party `rows`, in proportion to their journal
+	amounts, so that balances summed over several parties count it once.
+	"""
+	weights = [abs(flt(row.get("journal_amount"))) for row in rows]
+	total_weight = sum(weights)
+	if not total_weight:
+		weights, total_weight = [1] * len(rows), len(rows)
+
+	precision = frappe.get_precision("Tax Withholding Balance", "tax_deducted")
+	remaining = flt(tax_deducted)
+	for row, weight in zip(rows[:-1], weights, strict=False):
+		row.tax_deducted = flt(flt(tax_deducted) * weight / total_weight, precision)
+		remaining -= row.tax_deducted
+
+	# the last row takes the rounding difference
+	rows[-1].tax_deducted = flt(remaining, precision)
+
+
+def add_to_balance(balances, company, tax_withholding_category, period, party_type, party, amounts, sign=1):
+	name = get_tax_withholding_balance_name(
+		company, party_type, party, tax_withholding_category, period.from_date
+	)
+	balance = balances.setdefault(
+		name,
+		frappe._dict(
+			company=company,
+			tax_withholding_category=tax_withholding_category,
+			party_type=party_type,
+			party=party,
+			from_date=period.from_date,
+			to_date=period.to_date,
+			**{field: 0.0 for field in BALANCE_FIELDS},
+		),
+	)
+
+	for field in BALANCE_FIELDS:
+		balance[field] += sign * flt(amounts.get(field))
+
+
+def add_to_tax_withholding_balances(balances):
+	"""Add the amounts of `balances`, keyed by the Tax Withholding Balance name, to the running balances"""
+	if not balances:
+		return
+
+	twb = frappe.qb.DocType("Tax Withholding Balance")
+	existing = set(frappe.qb.from_(twb).select(twb.name).where(twb.name.isin(list(balances))).run(pluck=True))
+
+	# rows inserted concurrently by another transaction are ignored and updated below
+	new_balances = {name: balance for name, balance in balances.items() if name not in existing}
+	if new_balances:
+		insert_tax_withholding_balances(new_balances, zero_amounts=True, ignore_duplicates=True)
+
+	for name, balance in balances.items():
+		query = frappe.qb.update(twb).where(twb.name == name)
+		for field in BALANCE_FIELDS:
+			query = query.set(twb[field], twb[field] + balance[field])
+
+		query.run()
+
+
+def get_tax_withholding_balance_name(company, party_type, party, tax_withholding_category, from_date):
+	key = "\n".join(cstr(d) for d in (company, party_type, party, tax_withholding_category, from_date))
+	return hashlib.sha1(key.encode()).hexdigest()
+
+
+def insert_tax_withholding_balances(balances, zero_amounts=False, ignore_duplicates=False):
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"company",
+		"tax_withholding_category",
+		"party_type",
+		"party",
+		"from_date",
+		"to_date",
+		*BALANCE_FIELDS,
+	]
+
+	timestamp = now()
+	values = [
+		(
+			name,
+			timestamp,
+			timestamp,
+			frappe.session.user,
+			frappe.session.user,
+			balance.company,
+			balance.tax_withholding_category,
+			balance.party_type,
+			balance.party,
+			balance.from_date,
+			balance.to_date,
+			*(0.0 if zero_amounts else balance[field] for field in BALANCE_FIELDS),
+		)
+		for name, balance in balances.items()
+	]
+
+	frappe.db.bulk_insert("Tax Withholding Balance", fields, values, ignore_duplicates=ignore_duplicates)
+
+
+def get_tax_withholding_balances_from_ledger(tax_withholding_category):
+	"""Aggregate the submitted Purchase Invoices and Journal Entries of `tax_withholding_category`"""
+	category = frappe.get_doc("Tax Withholding Category", tax_withholding_category)
+
+	balances = {}
+	for account in category.accounts:
+		for rate in category.rates:
+			period = frappe._dict(
+				account_head=account.account, from_date=rate.from_date, to_date=rate.to_date
+			)
+			for row in get_purchase_invoice_amounts(tax_withholding_category, account.company, period):
+				add_to_balance(
+					balances, account.company, tax_withholding_category, period, "Supplier", row.supplier, row
+				)
+
+			for row in get_journal_entry_amounts(tax_withholding_category, account.company, period):
+				add_to_balance(
+					balances,
+					account.company,
+					tax_withholding_category,
+					period,
+					row.party_type,
+					row.party,
+					row,
+				)
+
+	return balances
+
+
+def get_purchase_invoice_amounts(tax_withholding_category, company, period):
+	pi = frappe.qb.DocType("Purchase Invoice")
+	invoices = (
+		frappe.qb.from_(pi)
+		.select(
+			pi.name,
+			pi.supplier,
+			pi.tax_withholding_net_total,
+			pi.grand_total,
+		)
+		.where(
+			(pi.company == company)
+			& (pi.tax_withholding_category == tax_withholding_category)
+			& (pi.apply_tds == 1)
+			& (pi.docstatus == 1)
+			& (pi.is_opening == "No")
+			& (pi.posting_date[period.from_date : period.to_date])
+		)
+	).run(as_dict=True)
+
+	tax_deducted = get_tax_deducted_on_vouchers([d.name for d in invoices], period) if invoices else {}
+	for d in invoices:
+		d.tax_deducted = tax_deducted.get(d.name)
+
+	return invoices
+
+
+def get_journal_entry_amounts(tax_withholding_category, company, period):
+	je = frappe.qb.DocType("Journal Entry")
+	jea = frappe.qb.DocType("Journal Entry Account")
+	accounts = (
+		frappe.qb.from_(je)
+		.inner_join(jea)
+		.on(je.name == jea.parent)
+		.select(
+			je.name,
+			jea.party_type,
+			jea.party,
+			jea.reference_type,
+			jea.credit_in_account_currency,
+			jea.debit_in_account_currency,
+		)
+		.where(
+			(je.company == company)
+			& (je.tax_withholding_category == tax_withholding_category)
+			& (je.apply_tds == 1)
+			& (je.docstatus == 1)
+			& (je.is_opening == "No")
+			& (je.posting_date[period.from_date : period.to_date])
+			& (jea.party.isnotnull())
+			& (jea.party != "")
+		)
+		# rows are split in the order `update_tax_withholding_balances` reads them on submit
+		.orderby(je.name)
+		.orderby(jea.idx)
+	).run(as_dict=True)
+
+	tax_deducted = get_tax_deducted_on_vouchers(list({d.name for d in accounts}), period) if accounts else {}
+
+	amounts = {}
+	for d in accounts:
+		row = amounts.setdefault(
+			(d.name, d.party_type, d.party),
+			frappe._dict(party_type=d.party_type, party=d.party, journal_amount=0.0),
+		)
+
+		if d.reference_type != "Purchase Invoice":
+			row.journal_amount += flt(d.credit_in_account_currency) - flt(d.debit_in_account_currency)
+
+	rows_by_voucher = {}
+	for (voucher_no, _party_type, _party), row in amounts.items():
+		rows_by_voucher.setdefault(voucher_no, []).append(row)
+
+	for voucher_no, rows in rows_by_voucher.items():
+		split_tax_deducted(tax_deducted.get(voucher_no), rows)
+
+	return list(amounts.values())
+
+
+def rebuild_tax_withholding_balances(tax_withholding_category=None):
+	"""Recompute the running balances of `tax_withholding_category`, or of all categories, from the ledger"""
+	categories = (
+		[tax_withholding_category]
+		if tax_withholding_category
+		else frappe.get_all("Tax Withholding Category", pluck="name")
+	)
+
+	for category in categories:
+		frappe.db.delete("Tax Withholding Balance", {"tax_withholding_category": category})
+		if balances := get_tax_withholding_balances_from_ledger(category):
+			insert_tax_withholding_balances(balances)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Tax Withholding Balance", ["company", "tax_withholding_category", "from_date"])
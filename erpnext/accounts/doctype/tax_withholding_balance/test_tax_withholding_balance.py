@@ -0,0 +1,80 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import today
+
+from erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance import (
+	get_tax_withholding_balance,
+	rebuild_tax_withholding_balances,
+	split_tax_deducted,
+)
+from erpnext.accounts.doctype.tax_withholding_category.tax_withholding_category import (
+	get_tax_withholding_details,
+)
+from erpnext.accounts.doctype.tax_withholding_category.test_tax_withholding_category import (
+	create_purchase_invoice,
+	create_records,
+	create_tax_withholding_category_records,
+)
+
+test_dependencies = ["Supplier Group", "Customer Group"]
+
+
+class TestTaxWithholdingBalance(FrappeTestCase):
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		create_records()
+		create_tax_withholding_category_records()
+
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def get_balance(self):
+		tax_details = get_tax_withholding_details("Cumulative Threshold TDS", today(), "_Test Company")
+		balance = get_tax_withholding_balance(["Test TDS Supplier"], "_Test Company", tax_details)
+		return balance.tax_withholding_net_total, balance.grand_total, balance.tax_deducted
+
+	def test_tax_withholding_balance(self):
+		frappe.db.set_value(
+			"Supplier", "Test TDS Supplier", "tax_withholding_category", "Cumulative Threshold TDS"
+		)
+		invoices = []
+		for _ in range(3):
+			pi = create_purchase_invoice(supplier="Test TDS Supplier")
+			pi.submit()
+			invoices.append(pi)
+
+		# tax is deducted on the invoice that crosses the cumulative threshold
+		self.assertEqual(self.get_balance(), (30000, 27000, 3000))
+
+		# and on every invoice after it, which is evaluated from the running balance
+		pi = create_purchase_invoice(supplier="Test TDS Supplier", rate=5000)
+		pi.submit()
+		invoices.append(pi)
+		self.assertEqual(pi.taxes_and_charges_deducted, 500)
+		self.assertEqual(self.get_balance(), (35000, 31500, 3500))
+
+		invoices.pop().cancel()
+		invoices.pop().cancel()
+		self.assertEqual(self.get_balance(), (20000, 20000, 0))
+
+		frappe.db.set_value(
+			"Tax Withholding Balance",
+			{"party": "Test TDS Supplier", "tax_withholding_category": "Cumulative Threshold TDS"},
+			"tax_withholding_net_total",
+			0,
+		)
+		rebuild_tax_withholding_balances("Cumulative Threshold TDS")
+		self.assertEqual(self.get_balance(), (20000, 20000, 0))
+
+	def test_tax_deducted_split_between_parties(self):
+		rows = [frappe._dict(journal_amount=20000), frappe._dict(journal_amount=-10000)]
+		split_tax_deducted(1000, rows)
+		self.assertEqual([row.tax_deducted for row in rows], [666.67, 333.33])
+
+		rows = [frappe._dict(journal_amount=0), frappe._dict(journal_amount=0)]
+		split_tax_deducted(1000, rows)
+		self.assertEqual([row.tax_deducted for row in rows], [500, 500])
@@ -9,6 +9,9 @@ from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Abs, Sum
 from frappe.utils import cint, flt, getdate
 
+from erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance import (
+	get_tax_withholding_balance,
+)
 from erpnext.controllers.accounts_controller import validate_account_head
 
 
@@ -67,6 +70,29 @@ class TaxWithholdingCategory(Document):
 					).format(d.idx)
 				)
 
+	def on_update(self):
+		self.rebuild_tax_withholding_balances()
+
+	def rebuild_tax_withholding_balances(self):
+		# balances are accumulated per company account and withholding period
+		doc_before_save = self.get_doc_before_save()
+		if not doc_before_save or get_withholding_periods(doc_before_save) == get_withholding_periods(self):
+			return
+
+		frappe.enqueue(
+			"erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance.rebuild_tax_withholding_balances",
+			queue="long",
+			enqueue_after_commit=True,
+			tax_withholding_category=self.name,
+		)
+
+
+def get_withholding_periods(doc):
+	accounts = {(d.company, d.account) for d in doc.get("accounts")}
+	rates = {(getdate(d.from_date), getdate(d.to_date)) for d in doc.get("rates")}
+
+	return accounts, rates
+
 
 def get_party_details(inv):
 	party_type, party = "", ""
@@ -265,9 +291,19 @@ def get_lower_deduction_certificate(company, tax_details, pan_no):
 
 
 def get_tax_amount(party_type, parties, inv, tax_details, posting_date, pan_no=None):
-	vouchers, voucher_wise_amount = get_invoice_vouchers(
-		parties, tax_details, inv.company, party_type=party_type
-	)
+	balance = None
+	vouchers, voucher_wise_amount = [], {}
+
+	if party_type == "Supplier":
+		balance = get_tax_withholding_balance(parties, inv.company, tax_details)
+
+	# once tds is deducted in the period, the running balance is all that is needed and
+	# the invoices of the period need not be listed
+	if not balance or not balance.tax_deducted:
+		vouchers, voucher_wise_amount = get_invoice_vouchers(
+			parties, tax_details, inv.company, party_type=party_type
+		)
+
 	advance_vouchers = get_advance_vouchers(
 		parties,
 		company=inv.company,
@@ -281,9 +317,9 @@ def get_tax_amount(party_type, parties, inv, tax_details, posting_date, pan_no=N
 	if inv.doctype == "Purchase Invoice":
 		tax_deducted_on_advances = get_taxes_deducted_on_advances_allocated(inv, tax_details)
 
-	tax_deducted = 0
+	tax_deducted = balance.tax_deducted if balance else 0
 	if taxable_vouchers:
-		tax_deducted = get_deducted_tax(taxable_vouchers, tax_details)
+		tax_deducted += get_deducted_tax(taxable_vouchers, tax_details)
 
 	# If advance is outside the current tax withholding period (usually a fiscal year), `get_deducted_tax` won't fetch it.
 	# updating `tax_deducted` with correct advance tax value (from current and previous previous withholding periods), will allow the
@@ -313,7 +349,7 @@ def get_tax_amount(party_type, parties, inv, tax_details, posting_date, pan_no=N
 			# once tds is deducted, not need to add vouchers in the invoice
 			voucher_wise_amount = {}
 		else:
-			tax_amount = get_tds_amount(ldc, parties, inv, tax_details, vouchers)
+			tax_amount = get_tds_amount(ldc, parties, inv, tax_details, balance)
 
 	elif party_type == "Customer":
 		if tax_deducted:
@@ -464,9 +500,8 @@ def get_advance_tax_across_fiscal_year(tax_deducted_on_advances, tax_details):
 	return advance_tax_from_across_fiscal_year
 
 
-def get_tds_amount(ldc, parties, inv, tax_details, vouchers):
+def get_tds_amount(ldc, parties, inv, tax_details, balance):
 	tds_amount = 0
-	invoice_filters = {"name": ("in", vouchers), "docstatus": 1, "apply_tds": 1}
 
 	## for TDS to be deducted on advances
 	payment_entry_filters = {
@@ -479,31 +514,14 @@ def get_tds_amount(ldc, parties, inv, tax_details, vouchers):
 		"tax_withholding_category": tax_details.get("tax_withholding_category"),
 	}
 
-	field = "sum(tax_withholding_net_total)"
+	supp_credit_amt = balance.tax_withholding_net_total
 
 	if cint(tax_details.consider_party_ledger_amount):
-		invoice_filters.pop("apply_tds", None)
-		field = "sum(grand_total)"
+		supp_credit_amt = balance.grand_total
 
 		payment_entry_filters.pop("apply_tax_withholding_amount", None)
 		payment_entry_filters.pop("tax_withholding_category", None)
 
-	supp_credit_amt = frappe.db.get_value("Purchase Invoice", invoice_filters, field) or 0.0
-
-	supp_jv_credit_amt = (
-		frappe.db.get_value(
-			"Journal Entry Account",
-			{
-				"parent": ("in", vouchers),
-				"docstatus": 1,
-				"party": ("in", parties),
-				"reference_type": ("!=", "Purchase Invoice"),
-			},
-			"sum(credit_in_account_currency - debit_in_account_currency)",
-		)
-		or 0.0
-	)
-
 	# Get Amount via payment entry
 	payment_entry_amounts = frappe.db.get_all(
 		"Payment Entry",
@@ -512,7 +530,7 @@ def get_tds_amount(ldc, parties, inv, tax_details, vouchers):
 		group_by="payment_type",
 	)
 
-	supp_credit_amt += supp_jv_credit_amt
+	supp_credit_amt += balance.journal_amount
 	supp_credit_amt += inv.tax_withholding_net_total
 
 	for type in payment_entry_amounts:
@@ -537,11 +555,7 @@ def get_tds_amount(ldc, parties, inv, tax_details, vouchers):
 		):
 			# Get net total again as TDS is calculated on net total
 			# Grand is used to just check for threshold breach
-			net_total = (
-				frappe.db.get_value("Purchase Invoice", invoice_filters, "sum(tax_withholding_net_total)")
-				or 0.0
-			)
-			net_total += inv.tax_withholding_net_total
+			net_total = balance.tax_withholding_net_total + inv.tax_withholding_net_total
 			supp_credit_amt = net_total - cumulative_threshold
 
 		if ldc and is_valid_certificate(ldc, inv.get("posting_date") or inv.get("transaction_date"), 0):
@@ -15,12 +15,14 @@ class TransactionDeletionRecordDetails(Document):
 		from frappe.types import DF
 
 		docfield_name: DF.Data | None
+		docs_per_second: DF.Float
 		doctype_name: DF.Link
 		done: DF.Check
 		no_of_docs: DF.Int
 		parent: DF.Data
 		parentfield: DF.Data
 		parenttype: DF.Data
+		time_taken: DF.Duration | None
 	# end: auto-generated types
 
 	pass
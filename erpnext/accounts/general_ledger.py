@@ -11,6 +11,9 @@ from frappe.utils import cint, flt, formatdate, getdate, now
 from frappe.utils.dashboard import cache_source
 
 import erpnext
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	update_account_period_balances,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 )
@@ -19,7 +22,17 @@ from erpnext.accounts.doctype.accounting_dimension_filter.accounting_dimension_f
 )
 from erpnext.accounts.doctype.accounting_period.accounting_period import ClosedAccountingPeriod
 from erpnext.accounts.doctype.budget.budget import validate_expense_against_budget
-from erpnext.accounts.utils import create_payment_ledger_entry
+from erpnext.accounts.doctype.gl_entry.gl_entry import (
+	update_outstanding_amt,
+	validate_account_details_for_entries,
+	validate_balance_type,
+	validate_frozen_account,
+)
+from erpnext.accounts.utils import (
+	bulk_insert_ledger_entries,
+	can_insert_ledger_entries_in_bulk,
+	create_payment_ledger_entry,
+)
 from erpnext.exceptions import InvalidAccountDimensionError, MandatoryAccountDimensionError
 
 
@@ -370,9 +383,82 @@ def save_entries(gl_map, adv_adj, update_outstanding, from_repost=False):
 		if gl_map[0]["voucher_type"] != "Period Closing Voucher":
 			validate_against_pcv(is_opening, gl_map[0]["posting_date"], gl_map[0]["company"])
 
+	if can_insert_ledger_entries_in_bulk("GL Entry", gl_map):
+		gl_entries = save_entries_in_bulk(
+			gl_map, dimension_filter_map, adv_adj, update_outstanding, from_repost
+		)
+	else:
+		gl_entries = []
+		for entry in gl_map:
+			validate_allowed_dimensions(entry, dimension_filter_map)
+			gl_entries.append(make_entry(entry, adv_adj, update_outstanding, from_repost))
+
+	update_account_period_balances(gl_entries)
+
+
+def save_entries_in_bulk(gl_map, dimension_filter_map, adv_adj, update_outstanding, from_repost=False):
+	"""Validate the whole `gl_map` at once and insert it with multi-row INSERTs.
+
+	Runs the same checks as `make_entry`, but the checks reading back the ledger (balance type,
+	outstanding and budget) run once per account, against voucher and budget dimensions
+	after all rows are inserted, instead of once per row.
+	"""
+	# like `GLEntry.on_update` and `make_entry`, reposts and Period Closing Vouchers skip the ledger
+	# and budget checks: the closing entries move balances into retained earnings, not new expense
+	validate_ledger = not from_repost and gl_map[0]["voucher_type"] != "Period Closing Voucher"
+
+	gl_entries = []
 	for entry in gl_map:
 		validate_allowed_dimensions(entry, dimension_filter_map)
-		make_entry(entry, adv_adj, update_outstanding, from_repost)
+
+		gle = frappe.new_doc("GL Entry")
+		gle.update(entry)
+		gle.flags.from_repost = from_repost
+		gle.flags.adv_adj = adv_adj
+		gle.flags.update_outstanding = update_outstanding or "Yes"
+		gle.validate()
+		if validate_ledger:
+			gle.validate_dimensions_for_pl_and_bs()
+
+		gl_entries.append(gle)
+
+	accounts = {gle.account for gle in gl_entries}
+	if validate_ledger:
+		validate_account_details_for_entries(gl_entries)
+		for account in accounts:
+			validate_frozen_account(account, adv_adj)
+
+	bulk_insert_ledger_entries("GL Entry", gl_entries)
+
+	if not validate_ledger:
+		return gl_entries
+
+	for account in accounts:
+		validate_balance_type(account, adv_adj)
+
+	against_vouchers = {
+		(gle.account, gle.party_type, gle.party, gle.against_voucher_type, gle.against_voucher)
+		for gle in gl_entries
+		if gle.should_update_outstanding()
+	}
+	for against_voucher in against_vouchers:
+		update_outstanding_amt(*against_voucher)
+
+	validate_expense_against_budget_in_bulk(gl_map)
+
+	return gl_entries
+
+
+def validate_expense_against_budget_in_bulk(gl_map):
+	"""Budget is checked against the booked expense, so once per account and budget dimensions is enough"""
+	budget_fields = ["account", "cost_center", "project", *get_accounting_dimensions()]
+
+	budget_keys = set()
+	for entry in gl_map:
+		key = tuple(entry.get(field) for field in budget_fields)
+		if key not in budget_keys:
+			budget_keys.add(key)
+			validate_expense_against_budget(entry)
 
 
 def make_entry(args, adv_adj, update_outstanding, from_repost=False):
@@ -388,6 +474,8 @@ def make_entry(args, adv_adj, update_outstanding, from_repost=False):
 	if not from_repost and gle.voucher_type != "Period Closing Voucher":
 		validate_expense_against_budget(args)
 
+	return gle
+
 
 def validate_cwip_accounts(gl_map):
 	"""Validate that CWIP account are not used in Journal Entry"""
@@ -637,6 +725,10 @@ def make_reverse_gl_entries(
 			if not immutable_ledger_enabled:
 				set_as_cancel(gl_entries[0]["voucher_type"], gl_entries[0]["voucher_no"])
 
+		if not immutable_ledger_enabled:
+			update_account_period_balances(gl_entries, cancel=True)
+
+		reverse_entries = []
 		for entry in gl_entries:
 			new_gle = copy.deepcopy(entry)
 			new_gle["name"] = None
@@ -659,7 +751,10 @@ def make_reverse_gl_entries(
 				new_gle["posting_date"] = frappe.form_dict.get("posting_date") or getdate()
 
 			if new_gle["debit"] or new_gle["credit"]:
-				make_entry(new_gle, adv_adj, "Yes")
+				reverse_entries.append(make_entry(new_gle, adv_adj, "Yes"))
+
+		if immutable_ledger_enabled:
+			update_account_period_balances(reverse_entries)
 
 
 def check_freezing_date(posting_date, adv_adj=False):
@@ -5,7 +5,7 @@
 import frappe
 from frappe import _
 
-from erpnext.accounts.utils import get_balance_on
+from erpnext.accounts.utils import get_balances_on
 
 
 def execute(filters=None):
@@ -66,9 +66,9 @@ def get_data(filters):
 		"Account", fields=["name", "account_currency"], filters=conditions, order_by="name"
 	)
 
+	balances = get_balances_on([d.name for d in accounts], date=filters.report_date)
 	for d in accounts:
-		balance = get_balance_on(d.name, date=filters.report_date)
-		row = {"account": d.name, "balance": balance, "currency": d.account_currency}
+		row = {"account": d.name, "balance": balances[d.name], "currency": d.account_currency}
 
 		data.append(row)
 
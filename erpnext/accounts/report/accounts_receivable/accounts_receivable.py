@@ -7,7 +7,7 @@ from collections import OrderedDict
 import frappe
 from frappe import _, qb, query_builder, scrub
 from frappe.query_builder import Criterion
-from frappe.query_builder.functions import Date, Substring, Sum
+from frappe.query_builder.functions import Count, Date, Substring, Sum
 from frappe.utils import cint, cstr, flt, getdate, nowdate
 
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
@@ -30,6 +30,10 @@ from erpnext.accounts.utils import get_currency_precision, get_party_types_from_
 #  8. Invoice details like Sales Persons, Delivery Notes are also fetched comma separated
 #  9. Report amounts are in party currency if in_party_currency is selected, otherwise company currency
 # 10. This report is based on Payment Ledger Entries
+# 11. Large ledgers are processed party by party in chunks of about PLE_CHUNK_SIZE Payment Ledger Entries
+
+# number of Payment Ledger Entries loaded at a time, parties are never split across chunks
+PLE_CHUNK_SIZE = 20000
 
 
 def execute(filters=None):
@@ -51,14 +55,23 @@ class ReceivablePayableReport:
 		)
 
 	def run(self, args):
-		self.filters.update(args)
-		self.set_defaults()
-		self.party_naming_by = frappe.db.get_single_value(args.get("naming_by")[0], args.get("naming_by")[1])
+		self.setup(args)
 		self.get_columns()
 		self.get_data()
 		self.get_chart_data()
 		return self.columns, self.data, None, self.chart, None, self.skip_total_row
 
+	def stream(self, args):
+		"""Yields the report rows and subtotals party by party, without building the whole report"""
+		self.setup(args)
+		self.prepare_ple_conditions()
+		yield from self.stream_data(self.get_party_ranges())
+
+	def setup(self, args):
+		self.filters.update(args)
+		self.set_defaults()
+		self.party_naming_by = frappe.db.get_single_value(args.get("naming_by")[0], args.get("naming_by")[1])
+
 	def set_defaults(self):
 		if not self.filters.get("company"):
 			self.filters.company = frappe.db.get_single_value("Global Defaults", "default_company")
@@ -85,6 +98,12 @@ class ReceivablePayableReport:
 				self.skip_total_row = 1
 
 	def get_data(self):
+		self.prepare_ple_conditions()
+		party_ranges = self.get_party_ranges()
+		if len(party_ranges) > 1:
+			self.data = list(self.stream_data(party_ranges))
+			return
+
 		self.get_ple_entries()
 		self.get_sales_invoices_or_customers_based_on_sales_person()
 		self.voucher_balance = OrderedDict()
@@ -111,6 +130,74 @@ class ReceivablePayableReport:
 			self.update_voucher_balance(ple)
 
 		self.build_data()
+		self.append_total_rows()
+
+	def stream_data(self, party_ranges):
+		"""
+		Yields rows for one range of parties at a time. Only the Payment Ledger Entries, invoice details,
+		future payments and returns of the current range are kept in memory.
+		"""
+		self.get_sales_invoices_or_customers_based_on_sales_person()
+		self.get_exchange_rate_revaluations()
+		ple_query = self.get_ple_query()
+
+		for party_range in party_ranges:
+			self.data = []
+			self.invoices = set()
+			self.voucher_balance = OrderedDict()
+			self.ple_entries = ple_query.where(self.ple.party.between(*party_range)).run(as_dict=True)
+			self.init_voucher_balance()
+
+			self.build_delivery_note_map()
+			self.get_invoice_details(voucher_nos={row.voucher_no for row in self.voucher_balance.values()})
+			self.get_future_payments(party_range)
+			self.get_return_entries(party_range)
+
+			for ple in self.ple_entries:
+				self.update_voucher_balance(ple)
+
+			self.build_data()
+			yield from self.data
+
+		self.data = []
+		self.append_total_rows()
+		yield from self.data
+
+	def get_party_ranges(self):
+		"""
+		Returns (first party, last party) ranges covering about `PLE_CHUNK_SIZE` Payment Ledger Entries
+		each. Party wise counts are read through an unbuffered cursor.
+		"""
+		ple = self.ple
+		query = (
+			qb.from_(ple)
+			.select(ple.party, Count(ple.name))
+			.where(ple.delinked == 0)
+			.where(Criterion.all(self.qb_selection_filter))
+			.where(Criterion.any(self.or_filters))
+			.groupby(ple.party)
+			.orderby(ple.party)
+		)
+
+		party_ranges = []
+		first_party = last_party = None
+		chunk_size = 0
+		with frappe.db.unbuffered_cursor():
+			for party, count in query.run(as_iterator=True):
+				if first_party is not None and chunk_size + count > PLE_CHUNK_SIZE:
+					party_ranges.append((first_party, last_party))
+					first_party, chunk_size = None, 0
+
+				if first_party is None:
+					first_party = party
+
+				last_party = party
+				chunk_size += count
+
+		if first_party is not None:
+			party_ranges.append((first_party, last_party))
+
+		return party_ranges
 
 	def init_voucher_balance(self):
 		# build all keys, since we want to exclude vouchers beyond the report date
@@ -265,7 +352,7 @@ class ReceivablePayableReport:
 			total_row["currency"] = row.get("currency", "")
 
 	def append_subtotal_row(self, party):
-		sub_total_row = self.total_row_map.get(party)
+		sub_total_row = self.total_row_map.pop(party, None)
 
 		if sub_total_row:
 			self.data.append(sub_total_row)
@@ -320,6 +407,7 @@ class ReceivablePayableReport:
 				else:
 					self.append_row(row)
 
+	def append_total_rows(self):
 		if self.filters.get("group_by_party"):
 			self.append_subtotal_row(self.previous_party)
 			if self.data:
@@ -392,16 +480,28 @@ class ReceivablePayableReport:
 			for d in dn_against_si:
 				self.delivery_notes.setdefault(d.against_sales_invoice, set()).add(d.parent)
 
-	def get_invoice_details(self):
+	def get_invoice_details(self, voucher_nos=None):
 		self.invoice_details = frappe._dict()
+
+		# restrict to the given vouchers when processing a chunk of parties
+		conditions = sales_team_conditions = ""
+		values = {"report_date": self.filters.report_date}
+		if voucher_nos is not None:
+			if not voucher_nos:
+				return
+
+			conditions = "and name in %(voucher_nos)s"
+			sales_team_conditions = "and parent in %(voucher_nos)s"
+			values["voucher_nos"] = tuple(voucher_nos)
+
 		if self.account_type == "Receivable":
 			si_list = frappe.db.sql(
-				"""
+				f"""
 				select name, due_date, po_no
 				from `tabSales Invoice`
-				where posting_date <= %s
+				where posting_date <= %(report_date)s {conditions}
 			""",
-				self.filters.report_date,
+				values,
 				as_dict=1,
 			)
 			for d in si_list:
@@ -410,11 +510,12 @@ class ReceivablePayableReport:
 			# Get Sales Team
 			if self.filters.show_sales_person:
 				sales_team = frappe.db.sql(
-					"""
+					f"""
 					select parent, sales_person
 					from `tabSales Team`
-					where parenttype = 'Sales Invoice'
+					where parenttype = 'Sales Invoice' {sales_team_conditions}
 				""",
+					values,
 					as_dict=1,
 				)
 				for d in sales_team:
@@ -424,24 +525,24 @@ class ReceivablePayableReport:
 
 		if self.account_type == "Payable":
 			for pi in frappe.db.sql(
-				"""
+				f"""
 				select name, due_date, bill_no, bill_date
 				from `tabPurchase Invoice`
-				where posting_date <= %s
+				where posting_date <= %(report_date)s {conditions}
 			""",
-				self.filters.report_date,
+				values,
 				as_dict=1,
 			):
 				self.invoice_details.setdefault(pi.name, pi)
 
 		# Invoices booked via Journal Entries
 		journal_entries = frappe.db.sql(
-			"""
+			f"""
 			select name, due_date, bill_no, bill_date
 			from `tabJournal Entry`
-			where posting_date <= %s
+			where posting_date <= %(report_date)s {conditions}
 		""",
-			self.filters.report_date,
+			values,
 			as_dict=1,
 		)
 
@@ -561,22 +662,22 @@ class ReceivablePayableReport:
 			)
 			self.append_row(additional_row)
 
-	def get_future_payments(self):
+	def get_future_payments(self, party_range=None):
 		if self.filters.show_future_payments:
 			self.future_payments = frappe._dict()
-			future_payments = list(self.get_future_payments_from_payment_entry())
-			future_payments += list(self.get_future_payments_from_journal_entry())
+			future_payments = list(self.get_future_payments_from_payment_entry(party_range))
+			future_payments += list(self.get_future_payments_from_journal_entry(party_range))
 			if future_payments:
 				for d in future_payments:
 					if d.future_amount and d.invoice_no:
 						self.future_payments.setdefault((d.invoice_no, d.party), []).append(d)
 
-	def get_future_payments_from_payment_entry(self):
+	def get_future_payments_from_payment_entry(self, party_range=None):
 		pe = frappe.qb.DocType("Payment Entry")
 		pe_ref = frappe.qb.DocType("Payment Entry Reference")
 		ifelse = query_builder.CustomFunction("IF", ["condition", "then", "else"])
 
-		return (
+		query = (
 			frappe.qb.from_(pe)
 			.inner_join(pe_ref)
 			.on(pe_ref.parent == pe.name)
@@ -598,9 +699,14 @@ class ReceivablePayableReport:
 				& (pe.posting_date > self.filters.report_date)
 				& (pe.party_type.isin(self.party_type))
 			)
-		).run(as_dict=True)
+		)
+
+		if party_range:
+			query = query.where(pe.party.between(*party_range))
 
-	def get_future_payments_from_journal_entry(self):
+		return query.run(as_dict=True)
+
+	def get_future_payments_from_journal_entry(self, party_range=None):
 		je = frappe.qb.DocType("Journal Entry")
 		jea = frappe.qb.DocType("Journal Entry Account")
 		query = (
@@ -623,6 +729,9 @@ class ReceivablePayableReport:
 			)
 		)
 
+		if party_range:
+			query = query.where(jea.party.between(*party_range))
+
 		if self.filters.get("party"):
 			if self.account_type == "Payable":
 				query = query.select(
@@ -683,14 +792,19 @@ class ReceivablePayableReport:
 		if row.future_ref:
 			row.future_ref = ", ".join(row.future_ref)
 
-	def get_return_entries(self):
+	def get_return_entries(self, party_range=None):
 		doctype = "Sales Invoice" if self.account_type == "Receivable" else "Purchase Invoice"
-		filters = {
-			"is_return": 1,
-			"docstatus": 1,
-			"company": self.filters.company,
-			"update_outstanding_for_self": 0,
-		}
+		filters = [
+			[doctype, "is_return", "=", 1],
+			[doctype, "docstatus", "=", 1],
+			[doctype, "company", "=", self.filters.company],
+			[doctype, "update_outstanding_for_self", "=", 0],
+		]
+		if party_range:
+			party_field = "customer" if self.account_type == "Receivable" else "supplier"
+			filters.append([doctype, party_field, ">=", party_range[0]])
+			filters.append([doctype, party_field, "<=", party_range[1]])
+
 		or_filters = {}
 		for party_type in self.party_type:
 			party_field = scrub(party_type)
@@ -751,7 +865,9 @@ class ReceivablePayableReport:
 
 	def get_ple_entries(self):
 		# get all the GL entries filtered by the given filters
+		self.ple_entries = self.get_ple_query().run(as_dict=True)
 
+	def prepare_ple_conditions(self):
 		self.prepare_conditions()
 
 		if self.filters.show_future_payments:
@@ -765,6 +881,7 @@ class ReceivablePayableReport:
 		else:
 			self.qb_selection_filter.append(self.ple.posting_date.lte(self.filters.report_date))
 
+	def get_ple_query(self):
 		ple = qb.DocType("Payment Ledger Entry")
 		query = (
 			qb.from_(ple)
@@ -802,7 +919,7 @@ class ReceivablePayableReport:
 		else:
 			query = query.orderby(self.ple.posting_date, self.ple.party)
 
-		self.ple_entries = query.run(as_dict=True)
+		return query
 
 	def get_sales_invoices_or_customers_based_on_sales_person(self):
 		if self.filters.get("sales_person"):
@@ -462,6 +462,37 @@ class TestAccountsReceivable(AccountsTestMixin, FrappeTestCase):
 			],
 		)
 
+	def test_party_wise_streaming(self):
+		from unittest.mock import patch
+
+		first_customer = self.customer
+		self.create_sales_invoice(no_payment_schedule=True)
+		self.create_customer("_Test Customer 2")
+		self.create_sales_invoice(no_payment_schedule=True)
+		self.customer = first_customer
+
+		filters = {
+			"company": self.company,
+			"report_date": today(),
+			"range1": 30,
+			"range2": 60,
+			"range3": 90,
+			"range4": 120,
+			"group_by_party": True,
+		}
+
+		def get_report_rows():
+			return [
+				[row.get("party"), row.get("invoiced"), row.get("outstanding")] for row in execute(filters)[1]
+			]
+
+		expected = get_report_rows()
+		self.assertEqual(len(expected), 7)
+
+		# every party is loaded in a chunk of its own
+		with patch("erpnext.accounts.report.accounts_receivable.accounts_receivable.PLE_CHUNK_SIZE", 1):
+			self.assertEqual(get_report_rows(), expected)
+
 	def test_future_payments(self):
 		sr = self.create_sales_invoice(do_not_submit=True)
 		sr.is_return = 1
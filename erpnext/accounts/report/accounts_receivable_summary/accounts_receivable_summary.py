@@ -31,7 +31,7 @@ class AccountsReceivableSummary(ReceivablePayableReport):
 
 	def get_data(self, args):
 		self.data = []
-		self.receivables = ReceivablePayableReport(self.filters).run(args)[1]
+		self.receivables = ReceivablePayableReport(self.filters).stream(args)
 		self.currency_precision = get_currency_precision() or 2
 
 		self.get_party_total(args)
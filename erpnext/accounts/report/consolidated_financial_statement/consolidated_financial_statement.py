@@ -10,6 +10,9 @@ from frappe.query_builder import Criterion
 from frappe.utils import flt, getdate
 
 import erpnext
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	get_ledger_doctype_for_period,
+)
 from erpnext.accounts.report.balance_sheet.balance_sheet import (
 	get_chart_data,
 	get_provisional_profit_loss,
@@ -334,6 +337,9 @@ def get_data(companies, root_type, balance_must_be, fiscal_year, filters=None, i
 		end_date = filters.period_end_date
 
 	filters.end_date = end_date
+	opening_date = (
+		fiscal_year.year_start_date if filters.filter_based_on == "Fiscal Year" else filters.period_start_date
+	)
 
 	gl_entries_by_account = {}
 	for root in frappe.db.sql(
@@ -353,6 +359,7 @@ def get_data(companies, root_type, balance_must_be, fiscal_year, filters=None, i
 			accounts,
 			ignore_closing_entries=False,
 			root_type=root_type,
+			opening_date=opening_date,
 		)
 
 	calculate_values(accounts_by_name, gl_entries_by_account, companies, filters, fiscal_year)
@@ -592,6 +599,7 @@ def set_gl_entries_by_account(
 	accounts,
 	ignore_closing_entries=False,
 	root_type=None,
+	opening_date=None,
 ):
 	"""Returns a dict like { "account": [gl entries], ... }"""
 
@@ -612,7 +620,8 @@ def set_gl_entries_by_account(
 	)
 
 	for d in companies:
-		gle = frappe.qb.DocType("GL Entry")
+		doctype = get_ledger_doctype_for_period(d.name, [from_date, opening_date], [to_date])
+		gle = frappe.qb.DocType(doctype)
 		account = frappe.qb.DocType("Account")
 		query = (
 			frappe.qb.from_(gle)
@@ -634,7 +643,6 @@ def set_gl_entries_by_account(
 			)
 			.where(
 				(gle.company == d.name)
-				& (gle.is_cancelled == 0)
 				& (gle.posting_date <= to_date)
 				& (account.lft >= root_lft)
 				& (account.rgt <= root_rgt)
@@ -642,9 +650,13 @@ def set_gl_entries_by_account(
 			.orderby(gle.account, gle.posting_date)
 		)
 
+		if doctype == "GL Entry":
+			query = query.where(gle.is_cancelled == 0)
 		if root_type:
 			query = query.where(account.root_type == root_type)
-		additional_conditions = get_additional_conditions(from_date, ignore_closing_entries, filters, d)
+		additional_conditions = get_additional_conditions(
+			from_date, ignore_closing_entries, filters, d, doctype=doctype
+		)
 		if additional_conditions:
 			query = query.where(Criterion.all(additional_conditions))
 		gl_entries = query.run(as_dict=True)
@@ -718,12 +730,15 @@ def validate_entries(key, entry, accounts_by_name, accounts):
 		accounts.insert(idx + 1, args)
 
 
-def get_additional_conditions(from_date, ignore_closing_entries, filters, d):
-	gle = frappe.qb.DocType("GL Entry")
+def get_additional_conditions(from_date, ignore_closing_entries, filters, d, doctype="GL Entry"):
+	gle = frappe.qb.DocType(doctype)
 	additional_conditions = []
 
 	if ignore_closing_entries:
-		additional_conditions.append(gle.voucher_type != "Period Closing Voucher")
+		if doctype == "GL Entry":
+			additional_conditions.append(gle.voucher_type != "Period Closing Voucher")
+		else:
+			additional_conditions.append(gle.is_period_closing_voucher_entry == 0)
 
 	if from_date:
 		additional_conditions.append(gle.posting_date >= from_date)
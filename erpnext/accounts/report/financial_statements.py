@@ -8,8 +8,13 @@ import re
 
 import frappe
 from frappe import _
+from frappe.query_builder import Case
+from frappe.query_builder.functions import Max, Sum
 from frappe.utils import add_days, add_months, cint, cstr, flt, formatdate, get_first_day, getdate
 
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	get_ledger_doctype_for_period,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import (
 	get_accounting_dimensions,
 	get_dimension_with_children,
@@ -187,6 +192,8 @@ def get_data(
 			gl_entries_by_account,
 			ignore_closing_entries=ignore_closing_entries,
 			root_type=root_type,
+			period_list=period_list,
+			group_by_period=True,
 		)
 
 	calculate_values(
@@ -426,8 +433,14 @@ def set_gl_entries_by_account(
 	ignore_closing_entries=False,
 	ignore_opening_entries=False,
 	root_type=None,
+	period_list=None,
+	group_by_period=False,
 ):
-	"""Returns a dict like { "account": [gl entries], ... }"""
+	"""Returns a dict like { "account": [gl entries], ... }
+
+	With `group_by_period`, the entries are summed in SQL and each account gets one row per
+	period of `period_list` (and per fiscal year / opening flag) instead of one row per GL Entry.
+	"""
 	gl_entries = []
 
 	account_filters = {
@@ -476,18 +489,27 @@ def set_gl_entries_by_account(
 					filters,
 					ignore_closing_entries,
 					last_period_closing_voucher[0].name,
+					group_by_period=group_by_period,
 				)
 				from_date = add_days(last_period_closing_voucher[0].posting_date, 1)
 				ignore_opening_entries = True
 
+		# monthly balances can replace GL Entries if the report buckets fall on month boundaries
+		start_dates, end_dates = [from_date], [to_date]
+		for period in period_list or []:
+			start_dates += [period.from_date, period.year_start_date]
+			end_dates.append(period.to_date)
+
 		gl_entries += get_accounting_entries(
-			"GL Entry",
+			get_ledger_doctype_for_period(company, start_dates, end_dates),
 			from_date,
 			to_date,
 			accounts_list,
 			filters,
 			ignore_closing_entries,
 			ignore_opening_entries=ignore_opening_entries,
+			group_by_period=group_by_period,
+			period_list=period_list,
 		)
 
 		if filters and filters.get("presentation_currency"):
@@ -508,31 +530,46 @@ def get_accounting_entries(
 	ignore_closing_entries,
 	period_closing_voucher=None,
 	ignore_opening_entries=False,
+	group_by_period=False,
+	period_list=None,
 ):
 	gl_entry = frappe.qb.DocType(doctype)
+	amount_fields = ["debit", "credit", "debit_in_account_currency", "credit_in_account_currency"]
 	query = (
 		frappe.qb.from_(gl_entry)
-		.select(
-			gl_entry.account,
-			gl_entry.debit,
-			gl_entry.credit,
-			gl_entry.debit_in_account_currency,
-			gl_entry.credit_in_account_currency,
-			gl_entry.account_currency,
-		)
+		.select(gl_entry.account, gl_entry.account_currency)
 		.where(gl_entry.company == filters.company)
 	)
 
-	if doctype == "GL Entry":
-		query = query.select(gl_entry.posting_date, gl_entry.is_opening, gl_entry.fiscal_year)
-		query = query.where(gl_entry.is_cancelled == 0)
+	if group_by_period:
+		query = query.select(*[Sum(gl_entry[field]).as_(field) for field in amount_fields])
+		query = query.groupby(gl_entry.account, gl_entry.account_currency)
+	else:
+		query = query.select(*[gl_entry[field] for field in amount_fields])
+
+	if doctype in ("GL Entry", "Account Period Balance"):
+		query = query.select(gl_entry.is_opening, gl_entry.fiscal_year)
 		query = query.where(gl_entry.posting_date <= to_date)
 
+		if group_by_period:
+			# any posting date of a bucket compares the same against the period boundaries
+			query = query.select(Max(gl_entry.posting_date).as_("posting_date"))
+			query = query.groupby(gl_entry.is_opening, gl_entry.fiscal_year)
+			if period_bucket := get_period_bucket(gl_entry.posting_date, period_list):
+				query = query.groupby(period_bucket)
+		else:
+			query = query.select(gl_entry.posting_date)
+
+		if doctype == "GL Entry":
+			query = query.where(gl_entry.is_cancelled == 0)
+
 		if ignore_opening_entries:
 			query = query.where(gl_entry.is_opening == "No")
 	else:
 		query = query.select(gl_entry.closing_date.as_("posting_date"))
 		query = query.where(gl_entry.period_closing_voucher == period_closing_voucher)
+		if group_by_period:
+			query = query.groupby(gl_entry.closing_date)
 
 	query = apply_additional_conditions(doctype, query, from_date, ignore_closing_entries, filters)
 	query = query.where(gl_entry.account.isin(accounts))
@@ -542,6 +579,27 @@ def get_accounting_entries(
 	return entries
 
 
+def get_period_bucket(posting_date, period_list):
+	"""
+	Returns a CASE expression numbering the date ranges between the boundaries `calculate_values`
+	compares posting dates against: year start, and the start and end of every period.
+	"""
+	boundaries = set()
+	for period in period_list or []:
+		boundaries.update(
+			(getdate(period.year_start_date), getdate(period.from_date), add_days(period.to_date, 1))
+		)
+
+	if not boundaries:
+		return None
+
+	bucket = Case()
+	for idx, boundary in enumerate(sorted(boundaries)):
+		bucket = bucket.when(posting_date < boundary, idx)
+
+	return bucket.else_(len(boundaries))
+
+
 def apply_additional_conditions(doctype, query, from_date, ignore_closing_entries, filters):
 	gl_entry = frappe.qb.DocType(doctype)
 	accounting_dimensions = get_accounting_dimensions(as_list=False)
@@ -552,7 +610,7 @@ def apply_additional_conditions(doctype, query, from_date, ignore_closing_entrie
 		else:
 			query = query.where(gl_entry.is_period_closing_voucher_entry == 0)
 
-	if from_date and doctype == "GL Entry":
+	if from_date and doctype != "Account Closing Balance":
 		query = query.where(gl_entry.posting_date >= from_date)
 
 	if filters:
@@ -6,7 +6,13 @@ from frappe.tests.utils import FrappeTestCase
 from frappe.utils import getdate, today
 
 from erpnext.accounts.doctype.sales_invoice.test_sales_invoice import create_sales_invoice
-from erpnext.accounts.report.financial_statements import get_period_list
+from erpnext.accounts.report.financial_statements import (
+	calculate_values,
+	filter_accounts,
+	get_accounts,
+	get_period_list,
+	set_gl_entries_by_account,
+)
 from erpnext.accounts.report.profit_and_loss_statement.profit_and_loss_statement import execute
 from erpnext.accounts.test.accounts_mixin import AccountsTestMixin
 
@@ -90,3 +96,46 @@ class TestProfitAndLossStatement(AccountsTestMixin, FrappeTestCase):
 				with self.subTest(current_period_key=current_period_key):
 					self.assertEqual(acc[current_period_key], 150)
 					self.assertEqual(acc["total"], 150)
+
+	def test_period_wise_aggregation_of_gl_entries(self):
+		self.create_sales_invoice(qty=1, rate=150)
+		self.create_sales_invoice(qty=2, rate=100)
+
+		filters = self.get_report_filters()
+		period_list = get_period_list(
+			filters.from_fiscal_year,
+			filters.to_fiscal_year,
+			filters.period_start_date,
+			filters.period_end_date,
+			filters.filter_based_on,
+			filters.periodicity,
+			company=filters.company,
+		)
+
+		values, row_counts = [], []
+		for group_by_period in (False, True):
+			accounts, accounts_by_name, _parent_children_map = filter_accounts(
+				get_accounts(self.company, "Income")
+			)
+			gl_entries_by_account = {}
+			set_gl_entries_by_account(
+				self.company,
+				period_list[0].year_start_date,
+				period_list[-1].to_date,
+				min(d.lft for d in accounts),
+				max(d.rgt for d in accounts),
+				filters,
+				gl_entries_by_account,
+				root_type="Income",
+				period_list=period_list,
+				group_by_period=group_by_period,
+			)
+			calculate_values(accounts_by_name, gl_entries_by_account, period_list, True, False)
+
+			values.append(
+				{name: [d.get(period.key) for period in period_list] for name, d in accounts_by_name.items()}
+			)
+			row_counts.append(sum(len(entries) for entries in gl_entries_by_account.values()))
+
+		self.assertEqual(values[0], values[1])
+		self.assertEqual(row_counts, [2, 1])
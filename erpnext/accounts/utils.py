@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+from collections import defaultdict
 from json import loads
 from typing import TYPE_CHECKING, Optional
 
@@ -9,6 +10,7 @@ import frappe
 import frappe.defaults
 from frappe import _, qb, throw
 from frappe.model.meta import get_field_precision
+from frappe.model.naming import set_new_name
 from frappe.query_builder import AliasedQuery, Criterion, Table
 from frappe.query_builder.functions import Round, Sum
 from frappe.query_builder.utils import DocType
@@ -32,6 +34,9 @@ import erpnext
 
 # imported to enable erpnext.accounts.utils.get_account_currency
 from erpnext.accounts.doctype.account.account import get_account_currency
+from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+	remove_voucher_from_account_period_balances,
+)
 from erpnext.accounts.doctype.accounting_dimension.accounting_dimension import get_dimensions
 from erpnext.stock import get_warehouse_account_map
 from erpnext.stock.utils import get_stock_value_on
@@ -50,6 +55,24 @@ class PaymentEntryUnlinkError(frappe.ValidationError):
 
 GL_REPOSTING_CHUNK = 100
 
+# ledger maps with at least these many rows are validated as a whole and inserted with multi-row INSERTs
+BULK_LEDGER_ENTRY_THRESHOLD = 50
+# "*" doc events of this app that `bulk_insert_ledger_entries` runs itself or that do not apply to ledgers
+BULK_INSERT_HANDLED_HOOKS = {
+	"erpnext.setup.doctype.transaction_deletion_record.transaction_deletion_record.check_for_running_deletion_job",
+	"erpnext.support.doctype.service_level_agreement.service_level_agreement.apply",
+}
+# documents which make the framework act on the events of the doctype they are set up for
+DOCUMENT_EVENT_CONFIGURATIONS = (
+	("Workflow", "document_type"),
+	("Assignment Rule", "document_type"),
+	("Energy Point Rule", "reference_doctype"),
+	("Milestone Tracker", "document_type"),
+	("Notification", "document_type"),
+	("Webhook", "webhook_doctype"),
+	("Server Script", "reference_doctype"),
+)
+
 
 @frappe.whitelist()
 def get_fiscal_year(
@@ -194,109 +217,217 @@ def get_balance_on(
 	if not cost_center and frappe.form_dict.get("cost_center"):
 		cost_center = frappe.form_dict.get("cost_center")
 
-	cond = ["is_cancelled=0"]
-	if start_date:
-		cond.append("posting_date >= %s" % frappe.db.escape(cstr(start_date)))
-	if date:
-		cond.append("posting_date <= %s" % frappe.db.escape(cstr(date)))
-	else:
-		# get balance of all entries that exist
-		date = nowdate()
-
 	if account:
-		acc = frappe.get_doc("Account", account)
+		return get_balances_on(
+			[account],
+			date,
+			party_type=party_type,
+			parties=[party] if party_type and party else None,
+			company=company,
+			in_account_currency=in_account_currency,
+			cost_center=cost_center,
+			ignore_account_permission=ignore_account_permission,
+			account_type=account_type,
+			start_date=start_date,
+		)[account]
+
+	if party_type and party:
+		return get_balances_on(
+			None,
+			date,
+			party_type=party_type,
+			parties=[party],
+			company=company,
+			in_account_currency=in_account_currency,
+			account_type=account_type,
+			start_date=start_date,
+		)[party]
+
+	if account_type:
+		accounts = frappe.db.get_all(
+			"Account",
+			filters={"company": company, "account_type": account_type, "is_group": 0},
+			pluck="name",
+		)
+		balances = get_balances_on(
+			accounts,
+			date,
+			company=company,
+			in_account_currency=in_account_currency,
+			ignore_account_permission=True,
+			start_date=start_date,
+		)
+		return flt(sum(balances.values()), get_currency_precision())
+
+
+def get_balances_on(
+	accounts=None,
+	date=None,
+	party_type=None,
+	parties=None,
+	company=None,
+	in_account_currency=True,
+	cost_center=None,
+	ignore_account_permission=False,
+	account_type=None,
+	start_date=None,
+):
+	"""
+	Returns the balances of many accounts or parties as on `date` from a single grouped query.
+
+	Balances are keyed by account if `accounts` are given (restricted to `parties`, if any),
+	else by party. Group accounts include the balances of all their descendants.
+	"""
+	accounts = list(accounts or [])
+	parties = list(parties or []) if party_type else []
+	keys = accounts or parties
+	if not keys:
+		return {}
 
 	try:
-		get_fiscal_year(date, company=company, verbose=0)[1]
+		get_fiscal_year(date or nowdate(), company=company, verbose=0)
 	except FiscalYearError:
 		if getdate(date) > getdate(nowdate()):
 			# if fiscal year not found and the date is greater than today
 			# get fiscal year for today's date and its corresponding year start date
-			get_fiscal_year(nowdate(), verbose=1)[1]
+			get_fiscal_year(nowdate(), verbose=1)
 		else:
 			# this indicates that it is a date older than any existing fiscal year.
 			# hence, assuming balance as 0.0
-			return 0.0
-
-	if account:
-		report_type = acc.report_type
-	else:
-		report_type = ""
-
-	if cost_center and report_type == "Profit and Loss":
-		cc = frappe.get_doc("Cost Center", cost_center)
-		if cc.is_group:
-			cond.append(
-				f""" exists (
-				select 1 from `tabCost Center` cc where cc.name = gle.cost_center
-				and cc.lft >= {cc.lft} and cc.rgt <= {cc.rgt}
-			)"""
+			return dict.fromkeys(keys, 0.0)
+
+	account_details = get_account_details_for_balance(accounts, ignore_account_permission)
+	# GL Entry account -> requested accounts its balance adds up to
+	contributing_accounts = get_contributing_accounts(account_details)
+	cost_centers = None
+	if cost_center and any(d.report_type == "Profit and Loss" for d in account_details.values()):
+		cc = frappe.get_cached_value("Cost Center", cost_center, ["lft", "rgt"], as_dict=True)
+		cost_centers = set(
+			frappe.get_all(
+				"Cost Center", filters={"lft": (">=", cc.lft), "rgt": ("<=", cc.rgt)}, pluck="name"
 			)
+		)
 
-		else:
-			cond.append(f"""gle.cost_center = {frappe.db.escape(cost_center)} """)
+	precision = get_currency_precision()
+	gle = frappe.qb.DocType("GL Entry")
+	query = (
+		frappe.qb.from_(gle)
+		.select(
+			(Sum(Round(gle.debit, precision)) - Sum(Round(gle.credit, precision))).as_("balance"),
+			(
+				Sum(Round(gle.debit_in_account_currency, precision))
+				- Sum(Round(gle.credit_in_account_currency, precision))
+			).as_("balance_in_account_currency"),
+		)
+		.where(gle.is_cancelled == 0)
+	)
 
-	if account:
-		if not (frappe.flags.ignore_account_permission or ignore_account_permission):
-			acc.check_permission("read")
+	if start_date:
+		query = query.where(gle.posting_date >= start_date)
+	if date:
+		query = query.where(gle.posting_date <= date)
+	if company:
+		query = query.where(gle.company == company)
 
-		# different filter for group and ledger - improved performance
-		if acc.is_group:
-			cond.append(
-				f"""exists (
-				select name from `tabAccount` ac where ac.name = gle.account
-				and ac.lft >= {acc.lft} and ac.rgt <= {acc.rgt}
-			)"""
+	if account_type:
+		account = frappe.qb.DocType("Account")
+		query = query.where(
+			gle.account.isin(
+				frappe.qb.from_(account)
+				.select(account.name)
+				.where((account.account_type == account_type) & (account.is_group == 0))
+			)
+		)
+
+	if accounts:
+		query = query.select(gle.account).where(gle.account.isin(list(contributing_accounts)))
+		query = query.groupby(gle.account)
+		if cost_centers is not None:
+			query = query.select(gle.cost_center).groupby(gle.cost_center)
+
+	if parties:
+		query = query.where((gle.party_type == party_type) & (gle.party.isin(parties)))
+		if not accounts:
+			query = query.select(gle.party).groupby(gle.party)
+
+	balances = dict.fromkeys(keys, 0.0)
+	for row in query.run(as_dict=True):
+		if not accounts:
+			balances[row.party] += flt(
+				row.balance_in_account_currency if in_account_currency else row.balance
 			)
+			continue
+
+		for name in contributing_accounts[row.account]:
+			acc = account_details[name]
+			if (
+				cost_centers is not None
+				and acc.report_type == "Profit and Loss"
+				and row.cost_center not in cost_centers
+			):
+				continue
 
+			use_account_currency = in_account_currency
 			# If group and currency same as company,
 			# always return balance based on debit and credit in company currency
-			if acc.account_currency == frappe.get_cached_value("Company", acc.company, "default_currency"):
-				in_account_currency = False
-		else:
-			cond.append(f"""gle.account = {frappe.db.escape(account)} """)
+			if acc.is_group and acc.account_currency == frappe.get_cached_value(
+				"Company", acc.company, "default_currency"
+			):
+				use_account_currency = False
 
-	if account_type:
-		accounts = frappe.db.get_all(
+			balances[name] += flt(row.balance_in_account_currency if use_account_currency else row.balance)
+
+	return {key: flt(balance, precision) for key, balance in balances.items()}
+
+
+def get_account_details_for_balance(accounts, ignore_account_permission=False):
+	if not accounts:
+		return {}
+
+	account_details = {
+		d.name: d
+		for d in frappe.get_all(
 			"Account",
-			filters={"company": company, "account_type": account_type, "is_group": 0},
-			pluck="name",
-			order_by="lft",
+			filters={"name": ("in", accounts)},
+			fields=["name", "lft", "rgt", "is_group", "report_type", "account_currency", "company"],
 		)
+	}
 
-		cond.append(
-			"""
-			gle.account in (%s)
-		"""
-			% (", ".join([frappe.db.escape(account) for account in accounts]))
-		)
+	for account in accounts:
+		if account not in account_details:
+			frappe.throw(_("Account {0} does not exist").format(account), frappe.DoesNotExistError)
 
-	if party_type and party:
-		cond.append(
-			f"""gle.party_type = {frappe.db.escape(party_type)} and gle.party = {frappe.db.escape(party)} """
-		)
+	if not (frappe.flags.ignore_account_permission or ignore_account_permission):
+		permitted_accounts = set(frappe.get_list("Account", filters={"name": ("in", accounts)}, pluck="name"))
+		for account in accounts:
+			if account not in permitted_accounts:
+				frappe.throw(_("No permission to read Account {0}").format(account), frappe.PermissionError)
 
-	if company:
-		cond.append("""gle.company = %s """ % (frappe.db.escape(company)))
+	return account_details
 
-	if account or (party_type and party) or account_type:
-		precision = get_currency_precision()
-		if in_account_currency:
-			select_field = (
-				"sum(round(debit_in_account_currency, %s)) - sum(round(credit_in_account_currency, %s))"
-			)
-		else:
-			select_field = "sum(round(debit, %s)) - sum(round(credit, %s))"
 
-		bal = frappe.db.sql(
-			"""
-			SELECT {}
-			FROM `tabGL Entry` gle
-			WHERE {}""".format(select_field, " and ".join(cond)),
-			(precision, precision),
-		)[0][0]
-		# if bal is None, return 0
-		return flt(bal)
+def get_contributing_accounts(account_details):
+	"""Map every account posting to the requested accounts, resolving group accounts by lft/rgt"""
+	contributing_accounts = defaultdict(list)
+	groups = [d for d in account_details.values() if d.is_group]
+	if groups:
+		account = frappe.qb.DocType("Account")
+		children = (
+			frappe.qb.from_(account)
+			.select(account.name, account.lft, account.rgt)
+			.where(Criterion.any([(account.lft >= d.lft) & (account.rgt <= d.rgt) for d in groups]))
+		).run(as_dict=True)
+
+		for child in children:
+			for group in groups:
+				if child.lft >= group.lft and child.rgt <= group.rgt:
+					contributing_accounts[child.name].append(group.name)
+
+	for d in account_details.values():
+		if not d.is_group:
+			contributing_accounts[d.name].append(d.name)
+
+	return contributing_accounts
 
 
 def get_count_on(account, fieldname, date):
@@ -481,6 +612,7 @@ def reconcile_against_document(
 		else:
 			_delete_pl_entries(voucher_type, voucher_no)
 
+		journal_references = []
 		for entry in entries:
 			check_if_advance_entry_modified(entry)
 			validate_allocated_amount(entry)
@@ -489,14 +621,12 @@ def reconcile_against_document(
 
 			# update ref in advance entry
 			if voucher_type == "Journal Entry":
-				referenced_row, update_advance_paid = update_reference_in_journal_entry(
-					entry, doc, do_not_save=False
+				# the journal is saved once, after all its references are updated,
+				# which names the newly appended reference rows
+				_referenced_row, update_advance_paid = update_reference_in_journal_entry(
+					entry, doc, do_not_save=True
 				)
-				# advance section in sales/purchase invoice and reconciliation tool,both pass on exchange gain/loss
-				# amount and account in args
-				# referenced_row is used to deduplicate gain/loss journal
-				entry.update({"referenced_row": referenced_row})
-				doc.make_exchange_gain_loss_journal([entry], dimensions_dict)
+				journal_references.append((entry, doc.get("accounts")[-1], dimensions_dict))
 			else:
 				referenced_row, update_advance_paid = update_reference_in_payment_entry(
 					entry,
@@ -507,6 +637,14 @@ def reconcile_against_document(
 				)
 
 		doc.save(ignore_permissions=True)
+
+		for entry, referenced_row, dimensions_dict in journal_references:
+			# advance section in sales/purchase invoice and reconciliation tool,both pass on exchange gain/loss
+			# amount and account in args
+			# referenced_row is used to deduplicate gain/loss journal
+			entry.update({"referenced_row": referenced_row.name})
+			doc.make_exchange_gain_loss_journal([entry], dimensions_dict)
+
 		# re-submit advance entry
 		doc = frappe.get_doc(entry.voucher_type, entry.voucher_no)
 
@@ -523,14 +661,10 @@ def reconcile_against_document(
 			create_payment_ledger_entry(gl_map, update_outstanding="No", cancel=0, adv_adj=1)
 
 		# Only update outstanding for newly linked vouchers
-		for entry in entries:
-			update_voucher_outstanding(
-				entry.against_voucher_type,
-				entry.against_voucher,
-				entry.account,
-				entry.party_type,
-				entry.party,
-			)
+		update_voucher_outstandings(
+			(entry.against_voucher_type, entry.against_voucher, entry.account, entry.party_type, entry.party)
+			for entry in entries
+		)
 		# update advance paid in Advance Receivable/Payable doctypes
 		if update_advance_paid:
 			for t, n in update_advance_paid:
@@ -1146,11 +1280,22 @@ def get_account_balances(accounts, company):
 
 	company_currency = frappe.get_cached_value("Company", company, "default_currency")
 
+	account_names = [account["value"] for account in accounts]
+	balances = get_balances_on(account_names, in_account_currency=False, company=company)
+	balances_in_account_currency = get_balances_on(
+		[
+			account["value"]
+			for account in accounts
+			if account["account_currency"] and account["account_currency"] != company_currency
+		],
+		company=company,
+	)
+
 	for account in accounts:
 		account["company_currency"] = company_currency
-		account["balance"] = flt(get_balance_on(account["value"], in_account_currency=False, company=company))
-		if account["account_currency"] and account["account_currency"] != company_currency:
-			account["balance_in_account_currency"] = flt(get_balance_on(account["value"], company=company))
+		account["balance"] = flt(balances.get(account["value"]))
+		if account["value"] in balances_in_account_currency:
+			account["balance_in_account_currency"] = flt(balances_in_account_currency[account["value"]])
 
 	return accounts
 
@@ -1358,6 +1503,8 @@ def _delete_pl_entries(voucher_type, voucher_no):
 
 
 def _delete_gl_entries(voucher_type, voucher_no):
+	remove_voucher_from_account_period_balances(voucher_type, voucher_no)
+
 	gle = qb.DocType("GL Entry")
 	qb.from_(gle).delete().where((gle.voucher_type == voucher_type) & (gle.voucher_no == voucher_no)).run()
 
@@ -1678,6 +1825,10 @@ def create_payment_ledger_entry(
 	if gl_entries:
 		ple_map = get_payment_ledger_entries(gl_entries, cancel=cancel)
 
+		if not cancel and can_insert_ledger_entries_in_bulk("Payment Ledger Entry", ple_map):
+			create_payment_ledger_entries_in_bulk(ple_map, adv_adj, update_outstanding, from_repost)
+			return
+
 		for entry in ple_map:
 			ple = frappe.get_doc(entry)
 
@@ -1691,6 +1842,123 @@ def create_payment_ledger_entry(
 			ple.submit()
 
 
+def create_payment_ledger_entries_in_bulk(ple_map, adv_adj=0, update_outstanding="Yes", from_repost=0):
+	"""Validate and insert all Payment Ledger Entries of `ple_map` at once.
+
+	Mirrors `PaymentLedgerEntry.validate` and `on_update`, but accounts are fetched with a single
+	query and balance type / outstanding are recomputed once per account and against voucher."""
+	from erpnext.accounts.doctype.gl_entry.gl_entry import (
+		validate_account_details_for_entries,
+		validate_balance_type,
+		validate_frozen_account,
+	)
+
+	ples = []
+	for entry in ple_map:
+		ple = frappe.get_doc(entry)
+		ple.flags.adv_adj = adv_adj
+		ple.flags.from_repost = from_repost
+		ple.flags.update_outstanding = update_outstanding
+		ples.append(ple)
+
+	validate_account_type_for_entries(ples)
+
+	accounts = {ple.account for ple in ples}
+	if not from_repost:
+		for account in accounts:
+			validate_frozen_account(account, adv_adj)
+
+		validate_account_details_for_entries(ples)
+		for ple in ples:
+			ple.validate_dimensions_for_pl_and_bs()
+			ple.validate_allowed_dimensions()
+
+	bulk_insert_ledger_entries("Payment Ledger Entry", ples)
+
+	if not from_repost:
+		for account in accounts:
+			validate_balance_type(account, adv_adj)
+
+	update_voucher_outstandings(
+		(ple.against_voucher_type, ple.against_voucher_no, ple.account, ple.party_type, ple.party)
+		for ple in ples
+		if ple.should_update_outstanding()
+	)
+
+
+def validate_account_type_for_entries(entries):
+	"""Bulk counterpart of `PaymentLedgerEntry.validate_account`"""
+	accounts = {
+		d.name: d
+		for d in frappe.get_all(
+			"Account",
+			filters={"name": ("in", list({entry.account for entry in entries}))},
+			fields=["name", "account_type", "company"],
+		)
+	}
+
+	for entry in entries:
+		account = accounts.get(entry.account)
+		if not account or account.account_type != entry.account_type or account.company != entry.company:
+			frappe.throw(_("{0} account is not of type {1}").format(entry.account, entry.account_type))
+
+
+def can_insert_ledger_entries_in_bulk(doctype, entries):
+	"""
+	Bulk insertion bypasses document events, versions, notifications and webhooks, so it is only used
+	when nothing hooks into `doctype` or into every doctype and `doctype` does not track changes.
+	"""
+	if len(entries) < BULK_LEDGER_ENTRY_THRESHOLD or frappe.get_meta(doctype).track_changes:
+		return False
+
+	for app in frappe.get_installed_apps():
+		for key, events in (frappe.get_hooks("doc_events", app_name=app) or {}).items():
+			if key == doctype or (isinstance(key, tuple | list) and doctype in key):
+				return False
+
+			# the generic handlers of the framework only act on the configurations checked below
+			if key != "*" or app == "frappe":
+				continue
+
+			for handlers in events.values():
+				handlers = handlers if isinstance(handlers, list | tuple) else [handlers]
+				if set(handlers) - BULK_INSERT_HANDLED_HOOKS:
+					return False
+
+	return not any(
+		frappe.db.exists(config_doctype, {fieldname: doctype})
+		for config_doctype, fieldname in DOCUMENT_EVENT_CONFIGURATIONS
+	)
+
+
+def bulk_insert_ledger_entries(doctype, docs):
+	"""Insert already validated ledger entries as submitted documents with multi-row INSERTs"""
+	if not docs:
+		return
+
+	# runs once per ledger map instead of as a `validate` hook per row
+	from erpnext.setup.doctype.transaction_deletion_record.transaction_deletion_record import (
+		check_for_running_deletion_job,
+	)
+
+	check_for_running_deletion_job(docs[0])
+
+	timestamp = now()
+	for doc in docs:
+		set_new_name(doc)
+		doc.docstatus = 1
+		doc.owner = doc.modified_by = frappe.session.user
+		doc.creation = doc.modified = timestamp
+
+	fields = list(docs[0].get_valid_dict(convert_dates_to_str=True))
+	values = []
+	for doc in docs:
+		row = doc.get_valid_dict(convert_dates_to_str=True)
+		values.append(tuple(row.get(field) for field in fields))
+
+	frappe.db.bulk_insert(doctype, fields, values)
+
+
 def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, party):
 	ple = frappe.qb.DocType("Payment Ledger Entry")
 	vouchers = [frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})]
@@ -1714,20 +1982,52 @@ def update_voucher_outstanding(voucher_type, voucher_no, account, party_type, pa
 		and party
 		and voucher_outstanding
 	):
-		outstanding = voucher_outstanding[0]
-		ref_doc = frappe.get_doc(voucher_type, voucher_no)
-
-		# Didn't use db_set for optimisation purpose
-		ref_doc.outstanding_amount = outstanding["outstanding_in_account_currency"] or 0.0
-		frappe.db.set_value(
-			voucher_type,
-			voucher_no,
-			"outstanding_amount",
-			outstanding["outstanding_in_account_currency"] or 0.0,
+		set_voucher_outstanding(voucher_type, voucher_no, voucher_outstanding[0])
+
+
+def update_voucher_outstandings(against_vouchers):
+	"""
+	Update the outstanding of many (voucher_type, voucher_no, account, party_type, party) at once.
+
+	Same as calling `update_voucher_outstanding` for each of them, but the outstanding of all the
+	vouchers of an account and party is fetched from the Payment Ledger with a single query.
+	"""
+	vouchers_by_party = {}
+	for voucher_type, voucher_no, account, party_type, party in against_vouchers:
+		if voucher_type in ["Sales Invoice", "Purchase Invoice", "Fees"] and party_type and party:
+			vouchers_by_party.setdefault((account, party_type, party), {})[
+				(voucher_type, voucher_no)
+			] = frappe._dict({"voucher_type": voucher_type, "voucher_no": voucher_no})
+
+	ple = frappe.qb.DocType("Payment Ledger Entry")
+	for (account, party_type, party), vouchers in vouchers_by_party.items():
+		common_filter = [ple.party_type == party_type, ple.party == party]
+		if account:
+			common_filter.append(ple.account == account)
+
+		voucher_outstandings = QueryPaymentLedger().get_voucher_outstandings(
+			list(vouchers.values()), common_filter=common_filter
 		)
+		for outstanding in voucher_outstandings:
+			# vouchers are filtered by type and name separately, so skip the other combinations
+			if (outstanding.voucher_type, outstanding.voucher_no) in vouchers:
+				set_voucher_outstanding(outstanding.voucher_type, outstanding.voucher_no, outstanding)
+
+
+def set_voucher_outstanding(voucher_type, voucher_no, outstanding):
+	ref_doc = frappe.get_doc(voucher_type, voucher_no)
+
+	# Didn't use db_set for optimisation purpose
+	ref_doc.outstanding_amount = outstanding["outstanding_in_account_currency"] or 0.0
+	frappe.db.set_value(
+		voucher_type,
+		voucher_no,
+		"outstanding_amount",
+		outstanding["outstanding_in_account_currency"] or 0.0,
+	)
 
-		ref_doc.set_status(update=True)
-		ref_doc.notify_update()
+	ref_doc.set_status(update=True)
+	ref_doc.notify_update()
 
 
 def delink_original_entry(pl_entry, partial_cancel=False):
@@ -17,6 +17,7 @@ from frappe.utils import (
 	nowdate,
 	today,
 )
+from frappe.utils.background_jobs import is_job_enqueued
 from frappe.utils.user import get_users_with_role
 
 import erpnext
@@ -32,6 +33,13 @@ from erpnext.assets.doctype.asset_depreciation_schedule.asset_depreciation_sched
 	make_new_active_asset_depr_schedules_and_cancel_current_ones,
 )
 
+DEPRECIATION_POSTING_JOB_ID = "post_depreciation_entries"
+DEFAULT_PARALLEL_DEPRECIATION_JOBS = 4
+DEPRECIATION_POSTING_TIMEOUT = 6 * 60 * 60
+
+# assets per consolidated depreciation entry, larger groups are split over multiple entries
+CONSOLIDATED_DEPRECIATION_ENTRY_SIZE = 500
+
 
 def post_depreciation_entries(date=None):
 	# Return if automatic booking of asset depreciation is disabled
@@ -43,10 +51,43 @@ def post_depreciation_entries(date=None):
 	if not date:
 		date = today()
 
+	consolidate = cint(frappe.db.get_single_value("Accounts Settings", "consolidate_depreciation_entries"))
+
+	if cint(frappe.db.get_single_value("Accounts Settings", "enable_parallel_depreciation_posting")):
+		no_of_jobs = cint(frappe.db.get_single_value("Accounts Settings", "no_of_parallel_depreciation_jobs"))
+		enqueue_depreciation_posting_jobs(date, no_of_jobs or DEFAULT_PARALLEL_DEPRECIATION_JOBS, consolidate)
+		return
+
+	post_depreciation_entries_for_schedules(date, consolidate=consolidate)
+
+
+def post_depreciation_entries_for_schedules(date, asset_depr_schedules=None, consolidate=False):
+	"""
+	Post the depreciation due on `date` for all depreciable Asset Depreciation Schedules, or only for
+	`asset_depr_schedules`. Entries are committed one by one, so schedules that are not posted when
+	the run is interrupted are picked up again by the next run.
+	"""
+	if consolidate:
+		failed_asset_names, error_log_names = post_consolidated_depreciation_entries(
+			date, asset_depr_schedules
+		)
+	else:
+		failed_asset_names, error_log_names = post_depreciation_entries_per_asset(date, asset_depr_schedules)
+
+	if failed_asset_names:
+		set_depr_entry_posting_status_for_failed_assets(failed_asset_names)
+		notify_depr_entry_posting_error(failed_asset_names, error_log_names)
+
+	frappe.db.commit()
+
+
+def post_depreciation_entries_per_asset(date, asset_depr_schedules=None):
 	failed_asset_names = []
 	error_log_names = []
 
-	depreciable_asset_depr_schedules_data = get_depreciable_asset_depr_schedules_data(date)
+	depreciable_asset_depr_schedules_data = get_depreciable_asset_depr_schedules_data(
+		date, asset_depr_schedules
+	)
 
 	credit_and_debit_accounts_for_asset_category_and_company = {}
 	depreciation_cost_center_and_depreciation_series_for_company = (
@@ -98,14 +139,65 @@ def post_depreciation_entries(date=None):
 			error_log = frappe.log_error(e)
 			error_log_names.append(error_log.name)
 
-	if failed_asset_names:
-		set_depr_entry_posting_status_for_failed_assets(failed_asset_names)
-		notify_depr_entry_posting_error(failed_asset_names, error_log_names)
+	return failed_asset_names, error_log_names
 
-	frappe.db.commit()
 
+def enqueue_depreciation_posting_jobs(date, no_of_jobs, consolidate=False):
+	"""Split the depreciable schedules over `no_of_jobs` background jobs that post them concurrently"""
+	job_ids = [f"{DEPRECIATION_POSTING_JOB_ID}::{idx}" for idx in range(max(no_of_jobs, 1))]
+	if any(is_job_enqueued(job_id) for job_id in job_ids):
+		# previous run is still in progress, the schedules it leaves unposted are resumed by the next run
+		return
+
+	for job_id, asset_depr_schedules in zip(
+		job_ids, get_depreciation_posting_jobs(date, no_of_jobs, consolidate), strict=False
+	):
+		frappe.enqueue(
+			post_depreciation_entries_for_schedules,
+			queue="long",
+			timeout=DEPRECIATION_POSTING_TIMEOUT,
+			job_id=job_id,
+			now=frappe.flags.in_test,
+			date=date,
+			asset_depr_schedules=asset_depr_schedules,
+			consolidate=consolidate,
+		)
+
+
+def get_depreciation_posting_jobs(date, no_of_jobs, consolidate=False):
+	"""
+	Returns the Asset Depreciation Schedules to be posted by each job.
+
+	With `consolidate`, schedules that are posted in the same consolidated entry are kept in one job.
+	"""
+	depreciation_cost_centers = get_depreciation_cost_center_and_depreciation_series_for_company()
 
-def get_depreciable_asset_depr_schedules_data(date):
+	batches = {}
+	for row in get_depreciable_schedule_rows(date):
+		if consolidate:
+			key = get_consolidation_key(row, depreciation_cost_centers[row.company][0])
+		else:
+			key = row.asset_depr_schedule
+
+		batches.setdefault(key, {})[row.asset_depr_schedule] = None
+
+	batches = [list(names) for names in batches.values()]
+	if consolidate:
+		batches = [
+			names[i : i + CONSOLIDATED_DEPRECIATION_ENTRY_SIZE]
+			for names in batches
+			for i in range(0, len(names), CONSOLIDATED_DEPRECIATION_ENTRY_SIZE)
+		]
+
+	# assign the largest batches first to the least loaded job
+	jobs = [[] for _i in range(min(max(no_of_jobs, 1), len(batches)))]
+	for names in sorted(batches, key=len, reverse=True):
+		min(jobs, key=len).extend(names)
+
+	return jobs
+
+
+def get_depreciable_asset_depr_schedules_data(date, asset_depr_schedules=None):
 	a = frappe.qb.DocType("Asset")
 	ads = frappe.qb.DocType("Asset Depreciation Schedule")
 	ds = frappe.qb.DocType("Depreciation Schedule")
@@ -127,6 +219,9 @@ def get_depreciable_asset_depr_schedules_data(date):
 		.orderby(a.creation, order=Order.desc)
 	)
 
+	if asset_depr_schedules:
+		res = res.where(ads.name.isin(asset_depr_schedules))
+
 	acc_frozen_upto = get_acc_frozen_upto()
 	if acc_frozen_upto:
 		res = res.where(ds.schedule_date > acc_frozen_upto)
@@ -136,6 +231,204 @@ def get_depreciable_asset_depr_schedules_data(date):
 	return res
 
 
+def get_depreciable_schedule_rows(date, asset_depr_schedules=None):
+	"""Returns the unposted Depreciation Schedule rows due on `date`, with the details of their assets"""
+	a = frappe.qb.DocType("Asset")
+	ads = frappe.qb.DocType("Asset Depreciation Schedule")
+	ds = frappe.qb.DocType("Depreciation Schedule")
+
+	dimension_fields = get_asset_dimension_fields()
+
+	query = (
+		frappe.qb.from_(ads)
+		.join(a)
+		.on(ads.asset == a.name)
+		.join(ds)
+		.on(ads.name == ds.parent)
+		.select(
+			ds.name,
+			ds.schedule_date,
+			ds.depreciation_amount,
+			ads.name.as_("asset_depr_schedule"),
+			ads.finance_book,
+			ads.finance_book_id,
+			a.name.as_("asset"),
+			a.asset_category,
+			a.company,
+			a.cost_center,
+			*(a[fieldname] for fieldname in dimension_fields),
+		)
+		.where(a.calculate_depreciation == 1)
+		.where(a.docstatus == 1)
+		.where(ads.docstatus == 1)
+		.where(a.status.isin(["Submitted", "Partially Depreciated"]))
+		.where(ds.journal_entry.isnull())
+		.where(ds.schedule_date <= date)
+		.orderby(a.creation, order=Order.desc)
+		.orderby(ds.idx)
+	)
+
+	if asset_depr_schedules:
+		query = query.where(ads.name.isin(asset_depr_schedules))
+
+	acc_frozen_upto = get_acc_frozen_upto()
+	if acc_frozen_upto:
+		query = query.where(ds.schedule_date > acc_frozen_upto)
+
+	return query.run(as_dict=True)
+
+
+def get_asset_dimension_fields():
+	meta = frappe.get_meta("Asset")
+	return list(
+		{
+			dimension["fieldname"]
+			for dimension in get_checks_for_pl_and_bs_accounts()
+			if meta.has_field(dimension["fieldname"])
+		}
+	)
+
+
+def get_consolidation_key(row, depreciation_cost_center):
+	return (row.company, row.finance_book, row.cost_center or depreciation_cost_center, row.asset_category)
+
+
+def post_consolidated_depreciation_entries(date, asset_depr_schedules=None):
+	"""
+	Post one Journal Entry per company, finance book, cost center, asset category and posting date
+	for the depreciation due on `date`, with a credit and a debit row per asset.
+	"""
+	failed_asset_names = []
+	error_log_names = []
+
+	credit_and_debit_accounts_for_asset_category_and_company = {}
+	depreciation_cost_center_and_depreciation_series_for_company = (
+		get_depreciation_cost_center_and_depreciation_series_for_company()
+	)
+
+	accounting_dimensions = get_checks_for_pl_and_bs_accounts()
+
+	entries = {}
+	for row in get_depreciable_schedule_rows(date, asset_depr_schedules):
+		key = get_consolidation_key(
+			row, depreciation_cost_center_and_depreciation_series_for_company[row.company][0]
+		)
+		entries.setdefault((*key, getdate(row.schedule_date)), []).append(row)
+
+	for key, rows in entries.items():
+		company, finance_book, cost_center, asset_category, posting_date = key
+
+		for i in range(0, len(rows), CONSOLIDATED_DEPRECIATION_ENTRY_SIZE):
+			batch = rows[i : i + CONSOLIDATED_DEPRECIATION_ENTRY_SIZE]
+
+			try:
+				if (asset_category, company) not in credit_and_debit_accounts_for_asset_category_and_company:
+					credit_and_debit_accounts_for_asset_category_and_company[
+						(asset_category, company)
+					] = get_credit_and_debit_accounts_for_asset_category_and_company(asset_category, company)
+
+				_make_consolidated_journal_entry_for_depreciation(
+					batch,
+					company,
+					finance_book,
+					posting_date,
+					cost_center,
+					depreciation_cost_center_and_depreciation_series_for_company[company][1],
+					*credit_and_debit_accounts_for_asset_category_and_company[(asset_category, company)],
+					accounting_dimensions,
+				)
+
+				frappe.db.commit()
+			except Exception as e:
+				frappe.db.rollback()
+				failed_asset_names.extend(row.asset for row in batch)
+				error_log = frappe.log_error(e)
+				error_log_names.append(error_log.name)
+
+	return list(dict.fromkeys(failed_asset_names)), error_log_names
+
+
+def _make_consolidated_journal_entry_for_depreciation(
+	rows,
+	company,
+	finance_book,
+	posting_date,
+	depreciation_cost_center,
+	depreciation_series,
+	credit_account,
+	debit_account,
+	accounting_dimensions,
+):
+	je = frappe.new_doc("Journal Entry")
+	je.voucher_type = "Depreciation Entry"
+	je.naming_series = depreciation_series
+	je.posting_date = posting_date
+	je.company = company
+	je.finance_book = finance_book
+	je.remark = "Depreciation Entry against {} assets of {} worth {}".format(
+		len(rows), rows[0].asset_category, sum(flt(row.depreciation_amount) for row in rows)
+	)
+
+	for row in rows:
+		for entry in get_depreciation_entry_rows(
+			row,
+			row.asset,
+			row.depreciation_amount,
+			depreciation_cost_center,
+			credit_account,
+			debit_account,
+			accounting_dimensions,
+		):
+			je.append("accounts", entry)
+
+	je.flags.ignore_permissions = True
+	je.flags.planned_depr_entry = True
+	je.save()
+
+	frappe.db.bulk_update("Depreciation Schedule", {row.name: {"journal_entry": je.name} for row in rows})
+
+	if not je.meta.get_workflow():
+		je.submit()
+		update_value_after_depreciation(rows)
+
+	asset_updates = {}
+	for row in rows:
+		asset = frappe.get_doc("Asset", row.asset)
+		asset_updates[row.asset] = {"status": asset.get_status(), "depr_entry_posting_status": "Successful"}
+
+	frappe.db.bulk_update("Asset", asset_updates)
+
+
+def update_value_after_depreciation(rows):
+	"""Reduce the value after depreciation of the finance books of the assets by the posted `rows`"""
+	afb = frappe.qb.DocType("Asset Finance Book")
+
+	depreciation_amounts = {}
+	for row in rows:
+		key = (row.asset, cint(row.finance_book_id))
+		depreciation_amounts[key] = depreciation_amounts.get(key, 0.0) + flt(row.depreciation_amount)
+
+	finance_books = (
+		frappe.qb.from_(afb)
+		.select(afb.name, afb.parent, afb.idx, afb.value_after_depreciation)
+		.where(
+			(afb.parent.isin(list({row.asset for row in rows})))
+			& (afb.parenttype == "Asset")
+			& (afb.parentfield == "finance_books")
+		)
+	).run(as_dict=True)
+
+	updates = {}
+	for d in finance_books:
+		if (d.parent, cint(d.idx)) in depreciation_amounts:
+			updates[d.name] = {
+				"value_after_depreciation": flt(d.value_after_depreciation)
+				- depreciation_amounts[(d.parent, cint(d.idx))]
+			}
+
+	frappe.db.bulk_update("Asset Finance Book", updates)
+
+
 def make_depreciation_entry_for_all_asset_depr_schedules(asset_doc, date=None):
 	for row in asset_doc.get("finance_books"):
 		asset_depr_schedule_name = get_asset_depr_schedule_name(asset_doc.name, "Active", row.finance_book)
@@ -279,19 +572,56 @@ def _make_journal_entry_for_depreciation(
 	je.finance_book = asset_depr_schedule_doc.finance_book
 	je.remark = f"Depreciation Entry against {asset.name} worth {depr_schedule.depreciation_amount}"
 
+	credit_entry, debit_entry = get_depreciation_entry_rows(
+		asset,
+		asset.name,
+		depr_schedule.depreciation_amount,
+		depreciation_cost_center,
+		credit_account,
+		debit_account,
+		accounting_dimensions,
+	)
+
+	je.append("accounts", credit_entry)
+	je.append("accounts", debit_entry)
+
+	je.flags.ignore_permissions = True
+	je.flags.planned_depr_entry = True
+	je.save()
+
+	depr_schedule.db_set("journal_entry", je.name)
+
+	if not je.meta.get_workflow():
+		je.submit()
+		asset.reload()
+		idx = cint(asset_depr_schedule_doc.finance_book_id)
+		row = asset.get("finance_books")[idx - 1]
+		row.value_after_depreciation -= depr_schedule.depreciation_amount
+		row.db_update()
+
+
+def get_depreciation_entry_rows(
+	asset,
+	asset_name,
+	depreciation_amount,
+	depreciation_cost_center,
+	credit_account,
+	debit_account,
+	accounting_dimensions,
+):
 	credit_entry = {
 		"account": credit_account,
-		"credit_in_account_currency": depr_schedule.depreciation_amount,
+		"credit_in_account_currency": depreciation_amount,
 		"reference_type": "Asset",
-		"reference_name": asset.name,
+		"reference_name": asset_name,
 		"cost_center": depreciation_cost_center,
 	}
 
 	debit_entry = {
 		"account": debit_account,
-		"debit_in_account_currency": depr_schedule.depreciation_amount,
+		"debit_in_account_currency": depreciation_amount,
 		"reference_type": "Asset",
-		"reference_name": asset.name,
+		"reference_name": asset_name,
 		"cost_center": depreciation_cost_center,
 	}
 
@@ -312,22 +642,7 @@ def _make_journal_entry_for_depreciation(
 				}
 			)
 
-	je.append("accounts", credit_entry)
-	je.append("accounts", debit_entry)
-
-	je.flags.ignore_permissions = True
-	je.flags.planned_depr_entry = True
-	je.save()
-
-	depr_schedule.db_set("journal_entry", je.name)
-
-	if not je.meta.get_workflow():
-		je.submit()
-		asset.reload()
-		idx = cint(asset_depr_schedule_doc.finance_book_id)
-		row = asset.get("finance_books")[idx - 1]
-		row.value_after_depreciation -= depr_schedule.depreciation_amount
-		row.db_update()
+	return credit_entry, debit_entry
 
 
 def get_depreciation_accounts(asset_category, company):
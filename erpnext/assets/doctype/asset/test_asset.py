@@ -24,6 +24,7 @@ from erpnext.assets.doctype.asset.asset import (
 	update_maintenance_status,
 )
 from erpnext.assets.doctype.asset.depreciation import (
+	get_depreciation_posting_jobs,
 	post_depreciation_entries,
 	restore_asset,
 	scrap_asset,
@@ -32,6 +33,7 @@ from erpnext.assets.doctype.asset_depreciation_schedule.asset_depreciation_sched
 	_check_is_pro_rata,
 	_get_pro_rata_amt,
 	get_asset_depr_schedule_doc,
+	get_asset_depr_schedule_name,
 	get_depr_schedule,
 	get_depreciation_amount,
 )
@@ -1227,6 +1229,50 @@ class TestDepreciationBasics(AssetSetup):
 		self.assertFalse(depr_schedule[1].journal_entry)
 		self.assertFalse(depr_schedule[2].journal_entry)
 
+	def test_post_consolidated_depreciation_entries(self):
+		assets = [
+			create_asset(
+				item_code="Macbook Pro",
+				asset_name=f"Macbook Pro Consolidated {i}",
+				calculate_depreciation=1,
+				available_for_use_date="2019-12-31",
+				depreciation_start_date="2020-12-31",
+				frequency_of_depreciation=12,
+				total_number_of_depreciations=3,
+				expected_value_after_useful_life=10000,
+				submit=1,
+			)
+			for i in range(2)
+		]
+		asset_depr_schedules = {get_asset_depr_schedule_name(asset.name, "Active") for asset in assets}
+
+		# schedules posted in the same consolidated entry are kept in one job
+		jobs = get_depreciation_posting_jobs("2021-06-01", 2, consolidate=True)
+		self.assertTrue(any(asset_depr_schedules <= set(job) for job in jobs))
+
+		frappe.db.set_single_value("Accounts Settings", "consolidate_depreciation_entries", 1)
+		try:
+			post_depreciation_entries(date="2021-06-01")
+		finally:
+			frappe.db.set_single_value("Accounts Settings", "consolidate_depreciation_entries", 0)
+
+		depr_schedules = [get_depr_schedule(asset.name, "Active") for asset in assets]
+		journal_entries = {depr_schedule[0].journal_entry for depr_schedule in depr_schedules}
+		self.assertEqual(len(journal_entries), 1)
+		self.assertFalse(any(depr_schedule[1].journal_entry for depr_schedule in depr_schedules))
+
+		je = frappe.get_doc("Journal Entry", journal_entries.pop())
+		self.assertEqual(je.docstatus, 1)
+		self.assertTrue({asset.name for asset in assets} <= {d.reference_name for d in je.accounts})
+
+		for asset, depr_schedule in zip(assets, depr_schedules, strict=True):
+			asset.load_from_db()
+			self.assertEqual(
+				asset.finance_books[0].value_after_depreciation,
+				asset.gross_purchase_amount - depr_schedule[0].depreciation_amount,
+			)
+			self.assertEqual(asset.status, "Partially Depreciated")
+
 	def test_depr_entry_posting_when_depr_expense_account_is_an_expense_account(self):
 		"""Tests if the Depreciation Expense Account gets debited and the Accumulated Depreciation Account gets credited when the former's an Expense Account."""
 
@@ -2,10 +2,44 @@
 # GPL v3 License. See license.txt
 
 import click
+from frappe.commands import pass_context
 
 
 def call_command(cmd, context):
 	return click.Context(cmd, obj=context).forward(cmd)
 
 
-commands = []
+@click.command("rebuild-account-period-balances")
+@click.option("--company", help="Only rebuild the balances of this company")
+@click.option(
+	"--check", is_flag=True, default=False, help="Only list the balances which do not match GL Entry"
+)
+@pass_context
+def rebuild_account_period_balances(context, company=None, check=False):
+	"Rebuild Account Period Balance from GL Entry"
+	import frappe
+
+	from erpnext.accounts.doctype.account_period_balance.account_period_balance import (
+		check_account_period_balances,
+		rebuild_account_period_balances,
+	)
+
+	for site in context.sites:
+		frappe.init(site=site)
+		frappe.connect()
+		try:
+			if not check:
+				rebuild_account_period_balances(company)
+				continue
+
+			for name in [company] if company else frappe.get_all("Company", pluck="name"):
+				for d in check_account_period_balances(name):
+					click.echo(
+						f"{site}: {name}: {d.account} {d.posting_date} {d.field} "
+						f"expected {d.expected}, found {d.actual}"
+					)
+		finally:
+			frappe.destroy()
+
+
+commands = [rebuild_account_period_balances]
@@ -454,31 +454,23 @@ def get_batches_from_stock_ledger_entries(searchfields, txt, filters, start=0, p
 
 
 def get_batches_from_serial_and_batch_bundle(searchfields, txt, filters, start=0, page_len=100):
-	bundle = frappe.qb.DocType("Serial and Batch Entry")
-	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
 	batch_table = frappe.qb.DocType("Batch")
 
 	expiry_date = filters.get("posting_date") or today()
 
 	bundle_query = (
-		frappe.qb.from_(bundle)
-		.inner_join(stock_ledger_entry)
-		.on(bundle.parent == stock_ledger_entry.serial_and_batch_bundle)
+		frappe.qb.from_(balance)
 		.inner_join(batch_table)
-		.on(batch_table.name == bundle.batch_no)
+		.on(batch_table.name == balance.batch_no)
 		.select(
-			bundle.batch_no,
-			Sum(bundle.qty).as_("qty"),
+			balance.batch_no,
+			balance.qty,
 		)
 		.where((batch_table.expiry_date >= expiry_date) | (batch_table.expiry_date.isnull()))
-		.where(stock_ledger_entry.is_cancelled == 0)
 		.where(
-			(stock_ledger_entry.item_code == filters.get("item_code"))
-			& (batch_table.disabled == 0)
-			& (stock_ledger_entry.serial_and_batch_bundle.isnotnull())
+			(balance.item_code == filters.get("item_code")) & (batch_table.disabled == 0) & (balance.qty > 0)
 		)
-		.groupby(bundle.batch_no, bundle.warehouse)
-		.having(Sum(bundle.qty) > 0)
 		.offset(start)
 		.limit(page_len)
 	)
@@ -489,7 +481,7 @@ def get_batches_from_serial_and_batch_bundle(searchfields, txt, filters, start=0
 	)
 
 	if filters.get("warehouse"):
-		bundle_query = bundle_query.where(stock_ledger_entry.warehouse == filters.get("warehouse"))
+		bundle_query = bundle_query.where(balance.warehouse == filters.get("warehouse"))
 
 	for field in searchfields:
 		bundle_query = bundle_query.select(batch_table[field])
@@ -393,56 +393,54 @@ class StatusUpdater(Document):
 				self._update_percent_field_in_targets(args, update_modified)
 
 	def _update_children(self, args, update_modified):
-		"""Update quantities or amount in child table"""
-		for d in self.get_all_children():
-			if d.doctype != args["source_dt"]:
-				continue
+		"""Update quantities or amount in child table
 
-			self._update_modified(args, update_modified)
+		Sums for all referenced rows are computed with one grouped query per source and written
+		back with a single update, instead of a round trip per child row
+		"""
+		detail_ids = sorted(
+			{d.get(args["join_field"]) for d in self.get_all_children(args["source_dt"])} - {None, ""}
+		)
+		if not detail_ids:
+			return
 
-			# updates qty in the child table
-			args["detail_id"] = d.get(args["join_field"])
+		self._update_modified(args, update_modified)
+		args["detail_ids"] = ", ".join(frappe.db.escape(detail_id) for detail_id in detail_ids)
 
-			args["second_source_condition"] = ""
-			if (
-				args.get("second_source_dt")
-				and args.get("second_source_field")
-				and args.get("second_join_field")
-			):
-				if not args.get("second_source_extra_cond"):
-					args["second_source_extra_cond"] = ""
-
-				args["second_source_condition"] = frappe.db.sql(
-					""" select ifnull((select sum({second_source_field})
-					from `tab{second_source_dt}`
-					where `{second_join_field}`='{detail_id}'
-					and (`tab{second_source_dt}`.docstatus=1)
-					{second_source_extra_cond}), 0) """.format(**args)
-				)[0][0]
+		if not args.get("extra_cond"):
+			args["extra_cond"] = ""
 
-			if args["detail_id"]:
-				if not args.get("extra_cond"):
-					args["extra_cond"] = ""
-
-				args["source_dt_value"] = (
-					frappe.db.sql(
-						"""
-						(select ifnull(sum({source_field}), 0)
-							from `tab{source_dt}` where `{join_field}`='{detail_id}'
-							and (docstatus=1 {cond}) {extra_cond})
-				""".format(**args)
-					)[0][0]
-					or 0.0
-				)
+		source_dt_values = frappe._dict(
+			frappe.db.sql(
+				"""select `{join_field}`, ifnull(sum({source_field}), 0)
+				from `tab{source_dt}` where `{join_field}` in ({detail_ids})
+				and (docstatus=1 {cond}) {extra_cond}
+				group by `{join_field}`""".format(**args)
+			)
+		)
 
-				if args["second_source_condition"]:
-					args["source_dt_value"] += flt(args["second_source_condition"])
+		if args.get("second_source_dt") and args.get("second_source_field") and args.get("second_join_field"):
+			if not args.get("second_source_extra_cond"):
+				args["second_source_extra_cond"] = ""
 
-				frappe.db.sql(
-					"""update `tab{target_dt}`
-					set {target_field} = {source_dt_value} {update_modified}
-					where name='{detail_id}'""".format(**args)
-				)
+			for detail_id, value in frappe.db.sql(
+				"""select `{second_join_field}`, sum({second_source_field})
+				from `tab{second_source_dt}` where `{second_join_field}` in ({detail_ids})
+				and (`tab{second_source_dt}`.docstatus=1) {second_source_extra_cond}
+				group by `{second_join_field}`""".format(**args)
+			):
+				source_dt_values[detail_id] = flt(source_dt_values.get(detail_id)) + flt(value)
+
+		args["source_dt_values"] = " ".join(
+			f"when {frappe.db.escape(detail_id)} then {flt(source_dt_values.get(detail_id))}"
+			for detail_id in detail_ids
+		)
+
+		frappe.db.sql(
+			"""update `tab{target_dt}`
+			set {target_field} = (case name {source_dt_values} end) {update_modified}
+			where name in ({detail_ids})""".format(**args)
+		)
 
 	def _update_percent_field_in_targets(self, args, update_modified=True):
 		"""Update percent field in parent transaction"""
@@ -450,21 +448,25 @@ class StatusUpdater(Document):
 			# if reference to target doc where % is to be updated, is
 			# in source doc's parent form, consider percent_join_field_parent
 			args["name"] = self.get(args["percent_join_field_parent"])
-			self._update_percent_field(args, update_modified)
 		else:
-			distinct_transactions = set(
+			args["name"] = [
 				d.get(args["percent_join_field"]) for d in self.get_all_children(args["source_dt"])
-			)
+			]
 
-			for name in distinct_transactions:
-				if name:
-					args["name"] = name
-					self._update_percent_field(args, update_modified)
+		self._update_percent_field(args, update_modified)
 
 	def _update_percent_field(self, args, update_modified=True):
-		"""Update percent field in parent transaction"""
+		"""Update percent field in parent transaction
+
+		`args["name"]` can be a single target parent or a list of them, all of which are updated together
+		"""
+		names = args["name"] if isinstance(args["name"], list | tuple | set) else [args["name"]]
+		names = sorted({name for name in names if name})
+		if not names:
+			return
 
 		self._update_modified(args, update_modified)
+		args["names"] = ", ".join(frappe.db.escape(name) for name in names)
 
 		if args.get("target_parent_field"):
 			frappe.db.sql(
@@ -473,9 +475,9 @@ class StatusUpdater(Document):
 					ifnull((select
 						ifnull(sum(case when abs({target_ref_field}) > abs({target_field}) then abs({target_field}) else abs({target_ref_field}) end), 0)
 						/ sum(abs({target_ref_field})) * 100
-					from `tab{target_dt}` where parent='{name}' and parenttype='{target_parent_dt}' having sum(abs({target_ref_field})) > 0), 0), 6)
+					from `tab{target_dt}` where parent=`tab{target_parent_dt}`.name and parenttype='{target_parent_dt}' having sum(abs({target_ref_field})) > 0), 0), 6)
 					{update_modified}
-				where name='{name}'""".format(**args)
+				where name in ({names})""".format(**args)
 			)
 
 			# update field
@@ -485,13 +487,14 @@ class StatusUpdater(Document):
 					set {status_field} = (case when {target_parent_field}<0.001 then 'Not {keyword}'
 					else case when {target_parent_field}>=99.999999 then 'Fully {keyword}'
 					else 'Partly {keyword}' end end)
-					where name='{name}'""".format(**args)
+					where name in ({names})""".format(**args)
 				)
 
 			if update_modified:
-				target = frappe.get_doc(args["target_parent_dt"], args["name"])
-				target.set_status(update=True)
-				target.notify_update()
+				for name in names:
+					target = frappe.get_doc(args["target_parent_dt"], name)
+					target.set_status(update=True)
+					target.notify_update()
 
 	def _update_modified(self, args, update_modified):
 		if not update_modified:
@@ -29,6 +29,7 @@ from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle impor
 	get_type_of_transaction,
 )
 from erpnext.stock.stock_ledger import get_items_to_be_repost
+from erpnext.stock.valuation import load_stock_queue
 
 
 class QualityInspectionRequiredError(frappe.ValidationError):
@@ -1461,7 +1462,7 @@ def repost_required_for_queue(doc: StockController) -> bool:
 		return False
 
 	for sle in consuming_sles:
-		if sle.stock_queue != "[]":  # using FIFO/LIFO valuation
+		if load_stock_queue(sle.stock_queue):  # using FIFO/LIFO valuation
 			return True
 	return False
 
@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import inspect
 import json
 
 import frappe
@@ -254,25 +255,29 @@ class calculate_taxes_and_totals:
 			self.doc.round_floats_in(tax)
 
 	def determine_exclusive_rate(self):
-		if not any(cint(tax.included_in_print_rate) for tax in self.doc.get("taxes")):
+		taxes = self.doc.get("taxes")
+		if not any(cint(tax.included_in_print_rate) for tax in taxes):
 			return
 
-		for item in self._items:
-			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
+		pass_tax_rate = accepts_tax_rate(self.get_current_tax_fraction)
+		for item, (item_tax_map, tax_rates) in zip(self._items, self.get_item_tax_rates(), strict=True):
 			cumulated_tax_fraction = 0
 			total_inclusive_tax_amount_per_qty = 0
-			for i, tax in enumerate(self.doc.get("taxes")):
-				(
-					tax.tax_fraction_for_current_item,
-					inclusive_tax_amount_per_qty,
-				) = self.get_current_tax_fraction(tax, item_tax_map)
+			for i, tax in enumerate(taxes):
+				if pass_tax_rate:
+					current_tax_fraction = self.get_current_tax_fraction(
+						tax, item_tax_map, tax_rate=tax_rates[i]
+					)
+				else:
+					current_tax_fraction = self.get_current_tax_fraction(tax, item_tax_map)
+
+				tax.tax_fraction_for_current_item, inclusive_tax_amount_per_qty = current_tax_fraction
 
 				if i == 0:
 					tax.grand_total_fraction_for_current_item = 1 + tax.tax_fraction_for_current_item
 				else:
 					tax.grand_total_fraction_for_current_item = (
-						self.doc.get("taxes")[i - 1].grand_total_fraction_for_current_item
-						+ tax.tax_fraction_for_current_item
+						taxes[i - 1].grand_total_fraction_for_current_item + tax.tax_fraction_for_current_item
 					)
 
 				cumulated_tax_fraction += tax.tax_fraction_for_current_item
@@ -296,7 +301,29 @@ class calculate_taxes_and_totals:
 	def _load_item_tax_rate(self, item_tax_rate):
 		return json.loads(item_tax_rate) if item_tax_rate else {}
 
-	def get_current_tax_fraction(self, tax, item_tax_map):
+	def get_item_tax_rates(self):
+		"""
+		Returns the item tax map and the rate of every tax row for each item.
+		Items sharing an Item Tax Template are parsed and rounded only once.
+		"""
+		taxes = self.doc.get("taxes")
+		rates_by_item_tax_rate = {}
+		item_tax_rates = []
+
+		for item in self._items:
+			item_tax_rate = item.item_tax_rate or ""
+			if item_tax_rate not in rates_by_item_tax_rate:
+				item_tax_map = self._load_item_tax_rate(item_tax_rate)
+				rates_by_item_tax_rate[item_tax_rate] = (
+					item_tax_map,
+					[self._get_tax_rate(tax, item_tax_map) for tax in taxes],
+				)
+
+			item_tax_rates.append(rates_by_item_tax_rate[item_tax_rate])
+
+		return item_tax_rates
+
+	def get_current_tax_fraction(self, tax, item_tax_map, *, tax_rate=None):
 		"""
 		Get tax fraction for calculating tax exclusive amount
 		from tax inclusive amount
@@ -305,7 +332,8 @@ class calculate_taxes_and_totals:
 		inclusive_tax_amount_per_qty = 0
 
 		if cint(tax.included_in_print_rate):
-			tax_rate = self._get_tax_rate(tax, item_tax_map)
+			if tax_rate is None:
+				tax_rate = self._get_tax_rate(tax, item_tax_map)
 
 			if tax.charge_type == "On Net Total":
 				current_tax_fraction = tax_rate / 100.0
@@ -374,24 +402,36 @@ class calculate_taxes_and_totals:
 			]
 		)
 
+		taxes = self.doc.get("taxes")
+		last_item_idx = len(self._items) - 1
+		tax_amount_precisions = [tax.precision("tax_amount") for tax in taxes]
+		accumulate_tax_amount = not (
+			self.discount_amount_applied and self.doc.apply_discount_on == "Grand Total"
+		)
+
+		item_tax_rates = self.get_item_tax_rates()
+		pass_tax_rate = accepts_tax_rate(self.get_current_tax_amount)
 		for n, item in enumerate(self._items):
-			item_tax_map = self._load_item_tax_rate(item.item_tax_rate)
-			for i, tax in enumerate(self.doc.get("taxes")):
+			item_tax_map, tax_rates = item_tax_rates[n]
+			for i, tax in enumerate(taxes):
 				# tax_amount represents the amount of tax for the current step
-				current_tax_amount = self.get_current_tax_amount(item, tax, item_tax_map)
+				if pass_tax_rate:
+					current_tax_amount = self.get_current_tax_amount(
+						item, tax, item_tax_map, tax_rate=tax_rates[i]
+					)
+				else:
+					current_tax_amount = self.get_current_tax_amount(item, tax, item_tax_map)
 				if frappe.flags.round_row_wise_tax:
-					current_tax_amount = flt(current_tax_amount, tax.precision("tax_amount"))
+					current_tax_amount = flt(current_tax_amount, tax_amount_precisions[i])
 
 				# Adjust divisional loss to the last item
 				if tax.charge_type == "Actual":
 					actual_tax_dict[tax.idx] -= current_tax_amount
-					if n == len(self._items) - 1:
+					if n == last_item_idx:
 						current_tax_amount += actual_tax_dict[tax.idx]
 
 				# accumulate tax amount into tax.tax_amount
-				if tax.charge_type != "Actual" and not (
-					self.discount_amount_applied and self.doc.apply_discount_on == "Grand Total"
-				):
+				if tax.charge_type != "Actual" and accumulate_tax_amount:
 					tax.tax_amount += current_tax_amount
 
 				# store tax_amount for current item as it will be used for
@@ -411,11 +451,11 @@ class calculate_taxes_and_totals:
 					tax.grand_total_for_current_item = flt(item.net_amount + current_tax_amount)
 				else:
 					tax.grand_total_for_current_item = flt(
-						self.doc.get("taxes")[i - 1].grand_total_for_current_item + current_tax_amount
+						taxes[i - 1].grand_total_for_current_item + current_tax_amount
 					)
 
 				# set precision in the last item iteration
-				if n == len(self._items) - 1:
+				if n == last_item_idx:
 					self.round_off_totals(tax)
 					self._set_in_company_currency(tax, ["tax_amount", "tax_amount_after_discount_amount"])
 
@@ -426,7 +466,7 @@ class calculate_taxes_and_totals:
 
 					# adjust Discount Amount loss in last tax iteration
 					if (
-						i == (len(self.doc.get("taxes")) - 1)
+						i == (len(taxes) - 1)
 						and self.discount_amount_applied
 						and self.doc.discount_amount
 						and self.doc.apply_discount_on == "Grand Total"
@@ -460,8 +500,9 @@ class calculate_taxes_and_totals:
 		else:
 			tax.total = flt(self.doc.get("taxes")[row_idx - 1].total + tax_amount, tax.precision("total"))
 
-	def get_current_tax_amount(self, item, tax, item_tax_map):
-		tax_rate = self._get_tax_rate(tax, item_tax_map)
+	def get_current_tax_amount(self, item, tax, item_tax_map, *, tax_rate=None):
+		if tax_rate is None:
+			tax_rate = self._get_tax_rate(tax, item_tax_map)
 		current_tax_amount = 0.0
 
 		if tax.charge_type == "Actual":
@@ -983,6 +1024,14 @@ class calculate_taxes_and_totals:
 				)
 
 
+def accepts_tax_rate(method):
+	"""Overrides of the tax methods that predate the precomputed `tax_rate` are called without it"""
+	return any(
+		parameter.name == "tax_rate" or parameter.kind == parameter.VAR_KEYWORD
+		for parameter in inspect.signature(method).parameters.values()
+	)
+
+
 def get_itemised_tax_breakup_html(doc):
 	if not doc.taxes:
 		return
@@ -14,6 +14,10 @@ from frappe.utils import cint, cstr, flt, parse_json, today
 from frappe.website.website_generator import WebsiteGenerator
 
 import erpnext
+from erpnext.manufacturing.doctype.bom.bom_explosion import (
+	clear_bom_explosion_cache,
+	get_exploded_bom_items,
+)
 from erpnext.setup.utils import get_exchange_rate
 from erpnext.stock.doctype.item.item import get_item_details
 from erpnext.stock.get_item_details import get_conversion_factor, get_price_list_rate
@@ -271,10 +275,12 @@ class BOM(WebsiteGenerator):
 	def on_update(self):
 		frappe.cache().hdel("bom_children", self.name)
 		self.check_recursion()
+		clear_bom_explosion_cache([self.name])
 
 	def on_submit(self):
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		clear_bom_explosion_cache([self.name])
 
 	def on_cancel(self):
 		self.db_set("is_active", 0)
@@ -284,6 +290,7 @@ class BOM(WebsiteGenerator):
 		self.validate_bom_links()
 		self.manage_default_bom()
 		self.update_bom_creator_status()
+		clear_bom_explosion_cache([self.name])
 
 	def update_bom_creator_status(self):
 		if not self.bom_creator:
@@ -304,6 +311,7 @@ class BOM(WebsiteGenerator):
 	def on_update_after_submit(self):
 		self.validate_bom_links()
 		self.manage_default_bom()
+		clear_bom_explosion_cache([self.name])
 
 	def get_item_det(self, item_code):
 		item = get_item_details(item_code)
@@ -482,6 +490,8 @@ class BOM(WebsiteGenerator):
 
 		if save:
 			self.db_update()
+			# only the rates of the items have changed
+			clear_bom_explosion_cache([self.name], include_ancestors=False)
 
 		# update parent BOMs
 		if self.total_cost != existing_bom_cost and update_parent:
@@ -920,32 +930,11 @@ class BOM(WebsiteGenerator):
 
 	def get_child_exploded_items(self, bom_no, stock_qty):
 		"""Add all items from Flat BOM of child BOM"""
-		# Did not use qty_consumed_per_unit in the query, as it leads to rounding loss
-		child_fb_items = frappe.db.sql(
-			"""
-			SELECT
-				bom_item.item_code,
-				bom_item.item_name,
-				bom_item.description,
-				bom_item.source_warehouse,
-				bom_item.operation,
-				bom_item.stock_uom,
-				bom_item.stock_qty,
-				bom_item.rate,
-				bom_item.include_item_in_manufacturing,
-				bom_item.sourced_by_supplier,
-				bom_item.stock_qty / ifnull(bom.quantity, 1) AS qty_consumed_per_unit
-			FROM `tabBOM Explosion Item` bom_item, `tabBOM` bom
-			WHERE
-				bom_item.parent = bom.name
-				AND bom.name = %s
-				AND bom.docstatus = 1
-		""",
-			bom_no,
-			as_dict=1,
-		)
+		child_bom = get_exploded_bom_items(bom_no)
+		if child_bom.docstatus != 1:
+			return
 
-		for d in child_fb_items:
+		for d in child_bom.items:
 			self.add_to_cur_exploded_items(
 				frappe._dict(
 					{
@@ -955,7 +944,7 @@ class BOM(WebsiteGenerator):
 						"operation": d["operation"],
 						"description": d["description"],
 						"stock_uom": d["stock_uom"],
-						"stock_qty": d["qty_consumed_per_unit"] * stock_qty,
+						"stock_qty": d["qty"] * stock_qty,
 						"rate": flt(d["rate"]),
 						"include_item_in_manufacturing": d.get("include_item_in_manufacturing", 0),
 						"sourced_by_supplier": d.get("sourced_by_supplier", 0),
@@ -1182,20 +1171,7 @@ def get_bom_items_as_dict(
 
 	is_stock_item = 0 if include_non_stock_items else 1
 	if cint(fetch_exploded):
-		query = query.format(
-			table="BOM Explosion Item",
-			where_conditions="",
-			is_stock_item=is_stock_item,
-			qty_field="stock_qty",
-			group_by_cond=group_by_cond,
-			select_columns=""", bom_item.source_warehouse, bom_item.operation,
-				bom_item.include_item_in_manufacturing, bom_item.description, bom_item.rate, bom_item.sourced_by_supplier,
-				(Select idx from `tabBOM Item` where item_code = bom_item.item_code and parent = %(parent)s limit 1) as idx""",
-		)
-
-		items = frappe.db.sql(
-			query, {"parent": bom, "qty": qty, "bom": bom, "company": company}, as_dict=True
-		)
+		items = get_exploded_items_with_details(bom, company, qty, include_non_stock_items)
 	elif fetch_scrap_items:
 		query = query.format(
 			table="BOM Scrap Item",
@@ -1230,19 +1206,85 @@ def get_bom_items_as_dict(
 		else:
 			item_dict[key] = item
 
-	for item, item_details in item_dict.items():
-		for d in [
-			["Account", "expense_account", "stock_adjustment_account"],
-			["Cost Center", "cost_center", "cost_center"],
-			["Warehouse", "default_warehouse", ""],
-		]:
-			company_in_record = frappe.db.get_value(d[0], item_details.get(d[1]), "company")
-			if not item_details.get(d[1]) or (company_in_record and company != company_in_record):
-				item_dict[item][d[1]] = frappe.get_cached_value("Company", company, d[2]) if d[2] else None
+	set_company_defaults(item_dict, company)
 
 	return item_dict
 
 
+def get_exploded_items_with_details(bom, company, qty=1, include_non_stock_items=False):
+	"""Returns the cached Flat BOM of `bom` for `qty` with the details of the items for `company`"""
+	explosion = get_exploded_bom_items(bom)
+	if explosion.docstatus not in (0, 1) or not explosion.items:
+		return []
+
+	item = frappe.qb.DocType("Item")
+	item_default = frappe.qb.DocType("Item Default")
+	item_details = {
+		d.item_code: d
+		for d in (
+			frappe.qb.from_(item)
+			.left_join(item_default)
+			.on((item_default.parent == item.name) & (item_default.company == company))
+			.select(
+				item.name.as_("item_code"),
+				item.item_name,
+				item.image,
+				item.stock_uom,
+				item.item_group,
+				item.allow_alternative_item,
+				item.is_stock_item,
+				item_default.default_warehouse,
+				item_default.expense_account,
+				item_default.buying_cost_center.as_("cost_center"),
+			)
+			.where(item.name.isin([d.item_code for d in explosion.items]))
+		).run(as_dict=True)
+	}
+
+	items = []
+	for d in explosion.items:
+		details = item_details.get(d.item_code)
+		if not details or (not include_non_stock_items and not details.is_stock_item):
+			continue
+
+		row = frappe._dict(d, **details)
+		del row["is_stock_item"]
+		row.update(
+			{
+				"qty": d.qty * flt(qty),
+				"amount": d.qty * flt(d.rate) * flt(qty),
+				"project": explosion.project,
+			}
+		)
+		items.append(row)
+
+	return sorted(items, key=lambda d: cint(d.idx))
+
+
+def set_company_defaults(item_dict, company):
+	"""Replace the accounts, cost centers and warehouses of items that do not belong to `company`"""
+	for doctype, fieldname, company_fieldname in [
+		["Account", "expense_account", "stock_adjustment_account"],
+		["Cost Center", "cost_center", "cost_center"],
+		["Warehouse", "default_warehouse", ""],
+	]:
+		values = list({d.get(fieldname) for d in item_dict.values() if d.get(fieldname)})
+		companies = (
+			dict(frappe.get_all(doctype, {"name": ("in", values)}, ["name", "company"], as_list=True))
+			if values
+			else {}
+		)
+
+		for item_details in item_dict.values():
+			company_in_record = companies.get(item_details.get(fieldname))
+			if not item_details.get(fieldname) or (company_in_record and company != company_in_record):
+				item_details[fieldname] = (
+					frappe.get_cached_value("Company", company, company_fieldname)
+					if company_fieldname
+					else None
+				)
+
+
 @frappe.whitelist()
 def get_bom_items(bom, company, qty=1, fetch_exploded=1):
 	items = get_bom_items_as_dict(bom, company, qty, fetch_exploded, include_non_stock_items=True).values()
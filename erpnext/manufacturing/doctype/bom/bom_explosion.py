@@ -0,0 +1,241 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# License: GNU General Public License v3. See license.txt
+
+import frappe
+from frappe.utils import flt
+
+# per-unit quantities of the items of each BOM, see `clear_bom_explosion_cache` for invalidation
+CACHE_KEY = "bom_explosion"
+# bounds how long an explosion cached from a stale read can outlive the change of its BOM
+CACHE_EXPIRY = 6 * 60 * 60
+
+
+def get_exploded_bom_items(bom_no):
+	"""
+	Returns the Flat BOM of `bom_no` with the `qty` of every item required per unit of the BOM.
+
+	Rows of the same item are merged, keeping the details of the first row.
+	"""
+	explosion = get_bom_explosion(bom_no)
+	if "exploded_items" not in explosion:
+		explosion["exploded_items"] = _get_exploded_bom_items(bom_no)
+		set_bom_explosion(bom_no, explosion)
+
+	return explosion["exploded_items"]
+
+
+def _get_exploded_bom_items(bom_no):
+	bom = frappe.qb.DocType("BOM")
+	bom_item = frappe.qb.DocType("BOM Item")
+	bei = frappe.qb.DocType("BOM Explosion Item")
+
+	details = (
+		frappe.qb.from_(bom)
+		.select(bom.docstatus, bom.quantity, bom.project)
+		.where(bom.name == bom_no)
+		.run(as_dict=True)
+	)
+	if not details:
+		return frappe._dict(docstatus=None, quantity=1, project=None, items=[])
+
+	details = details[0]
+	rows = (
+		frappe.qb.from_(bei)
+		.select(
+			bei.item_code,
+			bei.item_name,
+			bei.description,
+			bei.source_warehouse,
+			bei.operation,
+			bei.stock_uom,
+			bei.stock_qty,
+			bei.rate,
+			bei.include_item_in_manufacturing,
+			bei.sourced_by_supplier,
+		)
+		.where(bei.parent == bom_no)
+		.orderby(bei.idx)
+	).run(as_dict=True)
+
+	# position of the item in the BOM, if it is not consumed from a sub-assembly
+	bom_item_idx = {}
+	for item_code, idx in (
+		frappe.qb.from_(bom_item)
+		.select(bom_item.item_code, bom_item.idx)
+		.where((bom_item.parent == bom_no) & (bom_item.parenttype == "BOM"))
+		.orderby(bom_item.idx)
+	).run():
+		bom_item_idx.setdefault(item_code, idx)
+
+	items = {}
+	for row in rows:
+		qty = flt(row.pop("stock_qty")) / (flt(details.quantity) or 1)
+		if row.item_code in items:
+			items[row.item_code].qty += qty
+		else:
+			row.qty = qty
+			row.idx = bom_item_idx.get(row.item_code)
+			items[row.item_code] = row
+
+	details.items = list(items.values())
+	return details
+
+
+def get_flat_bom_items(
+	bom_no, include_exploded_items=False, include_non_stock_items=False, include_subcontracted_items=False
+):
+	"""
+	Returns the items of `bom_no` with the `qty` required per unit of the BOM.
+
+	With `include_exploded_items`, sub-assemblies that are manufactured or purchased (or subcontracted,
+	with `include_subcontracted_items`) are replaced by the items of their default BOM, recursively.
+	"""
+	key = (
+		"flat_items",
+		bool(include_exploded_items),
+		bool(include_non_stock_items),
+		bool(include_subcontracted_items),
+	)
+
+	explosion = get_bom_explosion(bom_no)
+	if key not in explosion:
+		explosion[key] = _get_flat_bom_items(
+			bom_no, include_exploded_items, include_non_stock_items, include_subcontracted_items
+		)
+		set_bom_explosion(bom_no, explosion)
+
+	return explosion[key]
+
+
+def _get_flat_bom_items(bom_no, include_exploded_items, include_non_stock_items, include_subcontracted_items):
+	items = {}
+
+	def add_item(row, qty):
+		if row.item_code in items:
+			items[row.item_code].qty += qty
+		else:
+			items[row.item_code] = frappe._dict(
+				item_code=row.item_code,
+				qty=qty,
+				source_warehouse=row.source_warehouse,
+				description=row.description,
+				stock_uom=row.stock_uom,
+			)
+
+	for row in get_bom_components(bom_no):
+		if not include_non_stock_items and not row.is_stock_item:
+			continue
+
+		if not include_exploded_items or not row.default_bom:
+			add_item(row, row.qty)
+			continue
+
+		if (
+			(row.default_material_request_type in ["Manufacture", "Purchase"] and not row.is_sub_contracted)
+			or (row.is_sub_contracted and include_subcontracted_items)
+		) and row.qty > 0:
+			for child in get_flat_bom_items(
+				row.default_bom, include_exploded_items, include_non_stock_items, include_subcontracted_items
+			):
+				add_item(child, child.qty * row.qty)
+
+	return list(items.values())
+
+
+def get_bom_components(bom_no):
+	"""Returns the items of `bom_no`, merged by item code, with the `qty` required per unit of the BOM"""
+	bom = frappe.qb.DocType("BOM")
+	bom_item = frappe.qb.DocType("BOM Item")
+	item = frappe.qb.DocType("Item")
+
+	rows = (
+		frappe.qb.from_(bom_item)
+		.join(bom)
+		.on(bom.name == bom_item.parent)
+		.join(item)
+		.on(item.name == bom_item.item_code)
+		.select(
+			bom_item.item_code,
+			bom_item.stock_qty,
+			bom.quantity,
+			bom_item.source_warehouse,
+			bom_item.description,
+			bom_item.stock_uom,
+			item.is_stock_item,
+			item.default_bom,
+			item.default_material_request_type,
+			item.is_sub_contracted_item.as_("is_sub_contracted"),
+		)
+		.where((bom.name == bom_no) & (bom_item.docstatus < 2) & (bom_item.parenttype == "BOM"))
+		.orderby(bom_item.idx)
+	).run(as_dict=True)
+
+	components = {}
+	for row in rows:
+		qty = flt(row.pop("stock_qty")) / (flt(row.pop("quantity")) or 1)
+		if row.item_code in components:
+			components[row.item_code].qty += qty
+		else:
+			row.qty = qty
+			components[row.item_code] = row
+
+	return list(components.values())
+
+
+def get_bom_explosion(bom_no):
+	return frappe.cache().get_value(get_cache_key(bom_no)) or {}
+
+
+def set_bom_explosion(bom_no, explosion):
+	frappe.cache().set_value(get_cache_key(bom_no), explosion, expires_in_sec=CACHE_EXPIRY)
+
+
+def get_cache_key(bom_no):
+	return f"{CACHE_KEY}::{bom_no}"
+
+
+def clear_bom_explosion_cache(boms, include_ancestors=True):
+	"""Clear the cached explosions of `boms` and, with `include_ancestors`, of all the BOMs that include them"""
+	boms = set(boms)
+	if include_ancestors:
+		boms |= get_ancestor_boms(boms)
+
+	if keys := [get_cache_key(bom_no) for bom_no in boms]:
+		clear_now_and_after_transaction(lambda: frappe.cache().delete_value(keys))
+
+
+def clear_all_bom_explosions():
+	clear_now_and_after_transaction(lambda: frappe.cache().delete_keys(CACHE_KEY))
+
+
+def clear_now_and_after_transaction(clear):
+	# other transactions can cache explosions read before this one commits or rolls back
+	clear()
+	frappe.db.after_commit.add(clear)
+	frappe.db.after_rollback.add(clear)
+
+
+def get_ancestor_boms(boms):
+	"""Returns the BOMs that include `boms`, directly or through the default BOM of an item, at any level"""
+	bom = frappe.qb.DocType("BOM")
+	bom_item = frappe.qb.DocType("BOM Item")
+
+	ancestors, boms = set(), set(boms)
+	while boms:
+		items = frappe.qb.from_(bom).select(bom.item).where(bom.name.isin(list(boms))).run(pluck=True)
+
+		condition = bom_item.bom_no.isin(list(boms))
+		if items:
+			condition |= bom_item.item_code.isin(items)
+
+		parents = (
+			frappe.qb.from_(bom_item)
+			.select(bom_item.parent)
+			.distinct()
+			.where((bom_item.parenttype == "BOM") & (bom_item.docstatus < 2) & condition)
+		).run(pluck=True)
+
+		boms = set(parents) - ancestors
+		ancestors |= boms
+
+	return ancestors
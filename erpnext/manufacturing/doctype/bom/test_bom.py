@@ -755,6 +755,26 @@ class TestBOM(FrappeTestCase):
 		self.assertTrue("_Test RM Item 2 Fixed Asset Item" not in items)
 		self.assertTrue("_Test RM Item 3 Manufacture Item" in items)
 
+	def test_bom_explosion_cache_cleared_on_child_bom_change(self):
+		from erpnext.manufacturing.doctype.bom.bom_explosion import get_bom_explosion, get_flat_bom_items
+		from erpnext.manufacturing.doctype.production_plan.test_production_plan import make_bom
+
+		prefix = "_Test BOM Explosion "
+		tree = {"FG": {"Sub Assembly": {"RM 1": {}}, "RM 2": {}}}
+		parent_bom = create_nested_bom(tree, prefix=prefix)
+
+		def get_flat_qty():
+			items = get_flat_bom_items(parent_bom.name, include_exploded_items=True)
+			return {d.item_code: d.qty for d in items}
+
+		self.assertEqual(get_flat_qty(), {prefix + "RM 1": 1, prefix + "RM 2": 1})
+		self.assertTrue(get_bom_explosion(parent_bom.name))
+
+		# a new default BOM of the sub assembly changes the explosion of the parent BOM
+		make_bom(item=prefix + "Sub Assembly", raw_materials=[prefix + "RM 1"], rm_qty=3, currency="INR")
+		self.assertFalse(get_bom_explosion(parent_bom.name))
+		self.assertEqual(get_flat_qty(), {prefix + "RM 1": 3, prefix + "RM 2": 1})
+
 
 def get_default_bom(item_code="_Test FG Item 2"):
 	return frappe.db.get_value("BOM", {"item": item_code, "is_active": 1, "is_default": 1})
@@ -0,0 +1,446 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.meta import get_field_precision
+from frappe.query_builder.functions import IfNull, Sum
+from frappe.utils import create_batch, flt
+
+from erpnext.manufacturing.doctype.bom.bom import get_bom_item_rate
+from erpnext.manufacturing.doctype.bom.bom_explosion import clear_bom_explosion_cache
+
+# BOMs loaded, costed and written back together
+BOM_COST_ROLLUP_CHUNK_SIZE = 1000
+
+BOM_FIELDS = (
+	"name",
+	"company",
+	"currency",
+	"quantity",
+	"is_active",
+	"conversion_rate",
+	"plc_conversion_rate",
+	"rm_cost_as_per",
+	"buying_price_list",
+	"set_rate_of_sub_assembly_item_based_on_bom",
+	"bom_creator",
+	"with_operations",
+	"fg_based_operating_cost",
+	"operating_cost_per_bom_quantity",
+	"operating_cost",
+	"base_operating_cost",
+	"raw_material_cost",
+	"base_raw_material_cost",
+	"scrap_material_cost",
+	"base_scrap_material_cost",
+	"total_cost",
+	"base_total_cost",
+)
+
+BOM_COST_FIELDS = (
+	"operating_cost",
+	"base_operating_cost",
+	"raw_material_cost",
+	"base_raw_material_cost",
+	"scrap_material_cost",
+	"base_scrap_material_cost",
+	"total_cost",
+	"base_total_cost",
+)
+
+CHILD_FIELDS = {
+	"BOM Item": (
+		"item_code",
+		"bom_no",
+		"qty",
+		"uom",
+		"stock_uom",
+		"stock_qty",
+		"conversion_factor",
+		"sourced_by_supplier",
+		"is_stock_item",
+		"rate",
+		"base_rate",
+		"amount",
+		"base_amount",
+		"qty_consumed_per_unit",
+	),
+	"BOM Operation": (
+		"workstation",
+		"hour_rate",
+		"base_hour_rate",
+		"time_in_mins",
+		"batch_size",
+		"set_cost_based_on_bom_qty",
+		"operating_cost",
+		"base_operating_cost",
+		"cost_per_unit",
+		"base_cost_per_unit",
+	),
+	"BOM Scrap Item": ("stock_qty", "rate", "base_rate", "amount", "base_amount"),
+	"BOM Explosion Item": ("item_code", "stock_qty", "rate", "amount"),
+}
+
+CHILD_TABLES = {
+	"BOM Item": "items",
+	"BOM Operation": "operations",
+	"BOM Scrap Item": "scrap_items",
+	"BOM Explosion Item": "exploded_items",
+}
+
+
+class BOMCostRollup:
+	"""
+	Costs of BOMs updated in memory the way `BOM.update_cost` does for one BOM at a time.
+
+	Item details, valuation rates, price list rates and workstation hour rates are looked up once
+	per run. The unit cost and exploded item rates of every updated BOM are kept, so BOMs must be
+	updated bottom-up: a BOM is updated after the BOMs of its sub-assemblies. Only the cost
+	fields that changed are written back.
+	"""
+
+	def __init__(self):
+		self.items = {}
+		self.valuation_rates = {}
+		self.price_list_rates = {}
+		self.unit_costs = {}
+		self.exploded_item_rates = {}
+		self.precisions = {}
+		self.workstation_hour_rates = dict(
+			frappe.get_all("Workstation", fields=["name", "hour_rate"], as_list=True)
+		)
+
+	def update_cost(self, boms, commit=False):
+		"""Update the cost of `boms`, the BOMs of their sub-assemblies must be updated before"""
+		for chunk in create_batch(boms, BOM_COST_ROLLUP_CHUNK_SIZE):
+			self.update_cost_in_chunk(chunk)
+
+			if commit and not frappe.flags.in_test:
+				frappe.db.commit()  # nosemgrep
+
+	def update_cost_in_chunk(self, boms):
+		bom_docs = self.load_boms(boms)
+
+		item_codes = {d.item_code for bom in bom_docs for d in bom["items"]}
+		self.load_items(item_codes)
+		for company in {bom.company for bom in bom_docs}:
+			self.load_valuation_rates(item_codes, company)
+
+		self.load_sub_assembly_costs({d.bom_no for bom in bom_docs for d in bom["items"] if d.bom_no})
+
+		updates = {doctype: {} for doctype in ("BOM", *CHILD_TABLES)}
+		changed_boms = []
+		for bom in bom_docs:
+			if self.calculate_cost(bom, updates):
+				changed_boms.append(bom.name)
+
+			self.unit_costs[bom.name] = (
+				flt(bom.base_total_cost) / flt(bom.quantity) if bom.is_active and flt(bom.quantity) else 0
+			)
+			self.exploded_item_rates[bom.name] = {d.item_code: flt(d.rate) for d in bom["exploded_items"]}
+
+		for doctype, rows in updates.items():
+			if rows:
+				frappe.db.bulk_update(doctype, rows, update_modified=False)
+
+		if changed_boms:
+			clear_bom_explosion_cache(changed_boms, include_ancestors=False)
+
+	def load_boms(self, boms):
+		bom_table = frappe.qb.DocType("BOM")
+		bom_docs = {
+			bom.name: bom
+			for bom in frappe.qb.from_(bom_table)
+			.select(*(bom_table[field] for field in BOM_FIELDS))
+			.where(bom_table.name.isin(boms))
+			.run(as_dict=True)
+		}
+
+		for bom in bom_docs.values():
+			for table in CHILD_TABLES.values():
+				bom[table] = []
+
+		for doctype, table in CHILD_TABLES.items():
+			child = frappe.qb.DocType(doctype)
+			rows = (
+				frappe.qb.from_(child)
+				.select(child.name, child.parent, *(child[field] for field in CHILD_FIELDS[doctype]))
+				.where((child.parent.isin(boms)) & (child.parenttype == "BOM") & (child.parentfield == table))
+				.orderby(child.parent)
+				.orderby(child.idx)
+			).run(as_dict=True)
+
+			for row in rows:
+				bom_docs[row.parent][table].append(row)
+
+		return [bom_docs[name] for name in boms if name in bom_docs]
+
+	def load_items(self, item_codes):
+		item_codes = [item_code for item_code in item_codes if item_code not in self.items]
+		for batch in create_batch(item_codes, BOM_COST_ROLLUP_CHUNK_SIZE):
+			for item in frappe.get_all(
+				"Item",
+				filters={"name": ("in", batch)},
+				fields=["name", "is_customer_provided_item", "valuation_rate", "last_purchase_rate"],
+			):
+				self.items[item.name] = item
+
+	def load_valuation_rates(self, item_codes, company):
+		"""Average valuation rate of the items over the warehouses of `company`, see `get_valuation_rate`"""
+		item_codes = [
+			item_code for item_code in item_codes if (item_code, company) not in self.valuation_rates
+		]
+		bin_table = frappe.qb.DocType("Bin")
+		wh_table = frappe.qb.DocType("Warehouse")
+
+		for batch in create_batch(item_codes, BOM_COST_ROLLUP_CHUNK_SIZE):
+			valuation_rates = dict(
+				(
+					frappe.qb.from_(bin_table)
+					.join(wh_table)
+					.on(bin_table.warehouse == wh_table.name)
+					.select(
+						bin_table.item_code,
+						IfNull(Sum(bin_table.stock_value) / Sum(bin_table.actual_qty), 0.0),
+					)
+					.where((bin_table.item_code.isin(batch)) & (wh_table.company == company))
+					.groupby(bin_table.item_code)
+				).run()
+			)
+
+			for item_code in batch:
+				valuation_rate = valuation_rates.get(item_code)
+				if valuation_rate is not None and valuation_rate <= 0:
+					valuation_rate = get_last_valuation_rate(item_code)
+
+				if not valuation_rate:
+					valuation_rate = (self.items.get(item_code) or {}).get("valuation_rate")
+
+				self.valuation_rates[(item_code, company)] = flt(valuation_rate)
+
+	def load_sub_assembly_costs(self, boms):
+		"""Unit cost and exploded item rates of the sub-assembly BOMs that are not updated in this run"""
+		boms = [bom for bom in boms if bom not in self.unit_costs]
+		bom_table = frappe.qb.DocType("BOM")
+		bei = frappe.qb.DocType("BOM Explosion Item")
+
+		for batch in create_batch(boms, BOM_COST_ROLLUP_CHUNK_SIZE):
+			for name, is_active, base_total_cost, quantity in (
+				frappe.qb.from_(bom_table)
+				.select(bom_table.name, bom_table.is_active, bom_table.base_total_cost, bom_table.quantity)
+				.where(bom_table.name.isin(batch))
+			).run():
+				self.unit_costs[name] = flt(base_total_cost) / flt(quantity) if is_active and quantity else 0
+				self.exploded_item_rates[name] = {}
+
+			for parent, item_code, rate in (
+				frappe.qb.from_(bei)
+				.select(bei.parent, bei.item_code, bei.rate)
+				.where((bei.parent.isin(batch)) & (bei.parenttype == "BOM"))
+				.orderby(bei.parent)
+				.orderby(bei.idx)
+			).run():
+				self.exploded_item_rates.setdefault(parent, {})[item_code] = flt(rate)
+
+	def calculate_cost(self, bom, updates):
+		"""Calculate the costs of `bom`, like `BOM.calculate_cost`, and add the changed ones to `updates`"""
+		if not bom.rm_cost_as_per:
+			bom.rm_cost_as_per = "Valuation Rate"
+
+		stored_costs = {field: bom[field] for field in BOM_COST_FIELDS}
+
+		self.calculate_op_cost(bom, updates["BOM Operation"])
+		self.calculate_rm_cost(bom, updates["BOM Item"])
+		self.calculate_sm_cost(bom, updates["BOM Scrap Item"])
+		self.calculate_exploded_cost(bom, updates["BOM Explosion Item"])
+
+		bom.total_cost = bom.operating_cost + bom.raw_material_cost - bom.scrap_material_cost
+		bom.base_total_cost = (
+			bom.base_operating_cost + bom.base_raw_material_cost - bom.base_scrap_material_cost
+		)
+
+		changes = get_changes(stored_costs, {field: bom[field] for field in BOM_COST_FIELDS})
+		if changes:
+			updates["BOM"][bom.name] = changes
+
+		return bool(changes) or any(
+			row.name in updates[doctype] for doctype, table in CHILD_TABLES.items() for row in bom[table]
+		)
+
+	def calculate_op_cost(self, bom, updates):
+		operating_cost = base_operating_cost = 0
+		if bom.with_operations:
+			for row in bom.operations:
+				if row.workstation:
+					self.update_rate_and_time(bom, row, updates)
+
+				row_operating_cost, row_base_operating_cost = row.operating_cost, row.base_operating_cost
+				if row.set_cost_based_on_bom_qty:
+					row_operating_cost = flt(row.cost_per_unit) * flt(bom.quantity)
+					row_base_operating_cost = flt(row.base_cost_per_unit) * flt(bom.quantity)
+
+				operating_cost += flt(row_operating_cost)
+				base_operating_cost += flt(row_base_operating_cost)
+
+		elif bom.fg_based_operating_cost:
+			operating_cost = flt(bom.quantity) * flt(bom.operating_cost_per_bom_quantity)
+			base_operating_cost = flt(operating_cost * bom.conversion_rate, 2)
+
+		bom.operating_cost, bom.base_operating_cost = operating_cost, base_operating_cost
+
+	def update_rate_and_time(self, bom, row, updates):
+		values = {}
+		hour_rate = flt(self.workstation_hour_rates.get(row.workstation))
+		if hour_rate:
+			values["hour_rate"] = hour_rate / flt(bom.conversion_rate) if bom.conversion_rate else hour_rate
+
+		hour_rate = values.get("hour_rate", row.hour_rate)
+		if hour_rate and row.time_in_mins:
+			values["base_hour_rate"] = flt(hour_rate) * flt(bom.conversion_rate)
+			values["operating_cost"] = flt(hour_rate) * flt(row.time_in_mins) / 60.0
+			values["base_operating_cost"] = flt(values["operating_cost"]) * flt(bom.conversion_rate)
+			values["cost_per_unit"] = values["operating_cost"] / (row.batch_size or 1.0)
+			values["base_cost_per_unit"] = values["base_operating_cost"] / (row.batch_size or 1.0)
+
+		add_changes(updates, row, values)
+
+	def calculate_rm_cost(self, bom, updates):
+		raw_material_cost = base_raw_material_cost = 0
+		for row in bom["items"]:
+			if not row.is_stock_item and bom.rm_cost_as_per == "Valuation Rate":
+				continue
+
+			rate = row.rate if bom.bom_creator else self.get_rm_rate(bom, row)
+			amount = flt(rate, self.precision("BOM Item", "rate")) * flt(
+				row.qty, self.precision("BOM Item", "qty")
+			)
+			values = {
+				"rate": rate,
+				"base_rate": flt(rate) * flt(bom.conversion_rate),
+				"amount": amount,
+				"base_amount": amount * flt(bom.conversion_rate),
+				"qty_consumed_per_unit": flt(row.stock_qty, self.precision("BOM Item", "stock_qty"))
+				/ flt(bom.quantity, self.precision("BOM", "quantity")),
+			}
+
+			add_changes(updates, row, values)
+			raw_material_cost += values["amount"]
+			base_raw_material_cost += values["base_amount"]
+
+		bom.raw_material_cost, bom.base_raw_material_cost = raw_material_cost, base_raw_material_cost
+
+	def get_rm_rate(self, bom, row):
+		"""Rate of a raw material as per the BOM's `rm_cost_as_per`, see `BOM.get_rm_rate`"""
+		rate = 0
+		if (
+			not (self.items.get(row.item_code) or {}).get("is_customer_provided_item")
+			and not row.sourced_by_supplier
+		):
+			if row.bom_no and bom.set_rate_of_sub_assembly_item_based_on_bom:
+				rate = flt(self.unit_costs.get(row.bom_no)) * (row.conversion_factor or 1)
+			elif bom.rm_cost_as_per == "Valuation Rate":
+				rate = self.valuation_rates.get((row.item_code, bom.company), 0) * (
+					row.conversion_factor or 1
+				)
+			elif bom.rm_cost_as_per == "Last Purchase Rate":
+				rate = flt((self.items.get(row.item_code) or {}).get("last_purchase_rate")) * (
+					row.conversion_factor or 1
+				)
+			else:
+				rate = self.get_price_list_rate(bom, row)
+
+		return flt(rate) * flt(bom.plc_conversion_rate or 1) / (bom.conversion_rate or 1)
+
+	def get_price_list_rate(self, bom, row):
+		key = (
+			bom.buying_price_list,
+			bom.company,
+			bom.currency,
+			row.item_code,
+			row.qty or 1,
+			row.uom or row.stock_uom,
+			row.stock_uom,
+			row.conversion_factor or 1,
+		)
+		if key not in self.price_list_rates:
+			self.price_list_rates[key] = get_bom_item_rate(
+				{
+					"company": bom.company,
+					"item_code": row.item_code,
+					"qty": row.qty,
+					"uom": row.uom,
+					"stock_uom": row.stock_uom,
+					"conversion_factor": row.conversion_factor,
+				},
+				bom,
+			)
+
+		return self.price_list_rates[key]
+
+	def calculate_sm_cost(self, bom, updates):
+		conversion_rate = flt(bom.conversion_rate, self.precision("BOM", "conversion_rate"))
+
+		scrap_material_cost = base_scrap_material_cost = 0
+		for row in bom.scrap_items:
+			amount = flt(row.rate, self.precision("BOM Scrap Item", "rate")) * flt(
+				row.stock_qty, self.precision("BOM Scrap Item", "stock_qty")
+			)
+			values = {
+				"base_rate": flt(row.rate, self.precision("BOM Scrap Item", "rate")) * conversion_rate,
+				"amount": amount,
+				"base_amount": flt(amount, self.precision("BOM Scrap Item", "amount")) * conversion_rate,
+			}
+
+			add_changes(updates, row, values)
+			scrap_material_cost += values["amount"]
+			base_scrap_material_cost += values["base_amount"]
+
+		bom.scrap_material_cost, bom.base_scrap_material_cost = scrap_material_cost, base_scrap_material_cost
+
+	def calculate_exploded_cost(self, bom, updates):
+		"Set the rates of the exploded items from the raw materials, see `BOM.get_rm_rate_map`"
+		rm_rate_map = {}
+		for row in bom["items"]:
+			if row.bom_no:
+				rm_rate_map.update(self.exploded_item_rates.get(row.bom_no) or {})
+			else:
+				rm_rate_map[row.item_code] = flt(row.base_rate) / flt(row.conversion_factor or 1.0)
+
+		for row in bom.exploded_items:
+			rate = flt(rm_rate_map.get(row.item_code))
+			add_changes(updates, row, {"rate": rate, "amount": flt(row.stock_qty) * rate})
+
+	def precision(self, doctype, fieldname):
+		if (doctype, fieldname) not in self.precisions:
+			self.precisions[(doctype, fieldname)] = get_field_precision(
+				frappe.get_meta(doctype).get_field(fieldname)
+			)
+
+		return self.precisions[(doctype, fieldname)]
+
+
+def get_changes(row, values):
+	"""Returns the `values` that differ from the ones in `row`"""
+	return {field: value for field, value in values.items() if flt(row.get(field), 9) != flt(value, 9)}
+
+
+def add_changes(updates, row, values):
+	"""Apply `values` to `row` and add the ones that changed to `updates`"""
+	if changes := get_changes(row, values):
+		updates.setdefault(row.name, {}).update(changes)
+
+	row.update(values)
+
+
+def get_last_valuation_rate(item_code):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	last_val_rate = (
+		frappe.qb.from_(sle)
+		.select(sle.valuation_rate)
+		.where((sle.item_code == item_code) & (sle.valuation_rate > 0) & (sle.is_cancelled == 0))
+		.orderby(sle.posting_datetime, order=frappe.qb.desc)
+		.orderby(sle.creation, order=frappe.qb.desc)
+		.limit(1)
+	).run()
+
+	return flt(last_val_rate[0][0]) if last_val_rate else 0
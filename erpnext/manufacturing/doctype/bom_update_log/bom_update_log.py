@@ -8,7 +8,7 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.query_builder import DocType, Interval
 from frappe.query_builder.functions import Now
-from frappe.utils import cint, cstr
+from frappe.utils import cint, create_batch, cstr
 
 from erpnext.manufacturing.doctype.bom_update_log.bom_updation_utils import (
 	get_leaf_boms,
@@ -18,6 +18,9 @@ from erpnext.manufacturing.doctype.bom_update_log.bom_updation_utils import (
 	set_values_in_log,
 )
 
+# a batch of 7k BOMs is costed in memory, see `BOMCostRollup`
+BOM_COST_UPDATE_TIMEOUT = 2 * 60 * 60
+
 
 class BOMMissingError(frappe.ValidationError):
 	pass
@@ -162,7 +165,7 @@ def process_boms_cost_level_wise(
 				"current_level": current_level,
 			}
 		else:
-			# Resume next level. via Cron Job.
+			# Resume next level. Via the job completing the last batch of a level, or Cron Job.
 			if not parent_boms:
 				return
 
@@ -179,29 +182,28 @@ def process_boms_cost_level_wise(
 
 
 def queue_bom_cost_jobs(current_boms_list: list[str], update_doc: "BOMUpdateLog", current_level: int) -> None:
-	"Queue batches of 20k BOMs of the same level to process parallelly"
-	batch_no = 0
-
-	while current_boms_list:
-		batch_no += 1
-		batch_size = 7_000
-		boms_to_process = current_boms_list[:batch_size]  # slice out batch of 20k BOMs
-
-		# update list to exclude 20K (queued) BOMs
-		current_boms_list = current_boms_list[batch_size:] if len(current_boms_list) > batch_size else []
+	"Queue batches of 7k BOMs of the same level to process parallelly"
+	batch_size = 7_000
+	batches = []
 
+	# insert every batch of the level before any job runs, see `update_cost_in_level`
+	for batch_no, boms_to_process in enumerate(create_batch(current_boms_list, batch_size), start=1):
 		batch_row = update_doc.append(
 			"bom_batches", {"level": current_level, "batch_no": batch_no, "status": "Pending"}
 		)
 		batch_row.db_insert()
+		batches.append((batch_row.name, boms_to_process))
 
+	for batch_name, boms_to_process in batches:
 		frappe.enqueue(
 			method="erpnext.manufacturing.doctype.bom_update_log.bom_updation_utils.update_cost_in_level",
 			doc=update_doc,
 			bom_list=boms_to_process,
-			batch_name=batch_row.name,
+			batch_name=batch_name,
 			queue="long",
+			timeout=BOM_COST_UPDATE_TIMEOUT,
 			now=frappe.flags.in_test,
+			enqueue_after_commit=True,
 		)
 
 
@@ -225,40 +227,61 @@ def resume_bom_cost_update_jobs():
 		return
 
 	for log in in_progress_logs:
-		# check if all log batches of current level are processed
-		bom_batches = frappe.db.get_all(
-			"BOM Update Batch",
-			{"parent": log.name, "level": log.current_level},
-			["name", "boms_updated", "status"],
-		)
-		incomplete_level = any(row.get("status") == "Pending" for row in bom_batches)
-		if not bom_batches or incomplete_level:
-			continue
-
-		# Prep parent BOMs & updated processed BOMs for next level
-		current_boms, processed_boms = get_processed_current_boms(log, bom_batches)
-		parent_boms = get_next_higher_level_boms(child_boms=current_boms, processed_boms=processed_boms)
-
-		# Unset processed BOMs (it is used for next level BOMs) & change status if log is complete
-		status = "Completed" if not parent_boms else "In Progress"
-		processed_boms = json.dumps([] if not parent_boms else processed_boms)
-		set_values_in_log(
-			log.name,
-			values={
-				"processed_boms": processed_boms,
-				"status": status,
-			},
-			commit=True,
-		)
+		resume_bom_cost_update_job(log.name)
 
-		# clear progress section
-		if status == "Completed":
-			frappe.db.delete("BOM Update Batch", {"parent": log.name})
 
-		if parent_boms:  # there is a next level to process
-			process_boms_cost_level_wise(
-				update_doc=frappe.get_doc("BOM Update Log", log.name), parent_boms=parent_boms
-			)
+def resume_bom_cost_update_job(log_name: str) -> None:
+	"""
+	Start the next level of the log, or mark it as Complete, once its current level is processed.
+
+	Called by the job completing the last batch of a level and by the Cron job. The log is locked
+	so that only one of them starts the next level.
+	"""
+	log = frappe.db.get_value(
+		"BOM Update Log",
+		log_name,
+		["name", "status", "processed_boms", "current_level"],
+		as_dict=True,
+		for_update=True,
+	)
+	if log.status != "In Progress":
+		return
+
+	# check if all log batches of current level are processed
+	bom_batches = frappe.db.get_all(
+		"BOM Update Batch",
+		{"parent": log.name, "level": log.current_level},
+		["name", "boms_updated", "status"],
+	)
+	incomplete_level = any(row.get("status") == "Pending" for row in bom_batches)
+	if not bom_batches or incomplete_level:
+		return
+
+	# Prep parent BOMs & updated processed BOMs for next level
+	current_boms, processed_boms = get_processed_current_boms(log, bom_batches)
+	parent_boms = get_next_higher_level_boms(child_boms=current_boms, processed_boms=processed_boms)
+
+	# Unset processed BOMs (it is used for next level BOMs) & change status if log is complete
+	status = "Completed" if not parent_boms else "In Progress"
+	processed_boms = json.dumps([] if not parent_boms else processed_boms)
+	set_values_in_log(
+		log.name,
+		values={
+			"processed_boms": processed_boms,
+			"status": status,
+		},
+		# the next level is committed with the values, so that the lock is held until it is queued
+		commit=not parent_boms,
+	)
+
+	# clear progress section
+	if status == "Completed":
+		frappe.db.delete("BOM Update Batch", {"parent": log.name})
+
+	if parent_boms:  # there is a next level to process
+		process_boms_cost_level_wise(
+			update_doc=frappe.get_doc("BOM Update Log", log.name), parent_boms=parent_boms
+		)
 
 
 def get_processed_current_boms(
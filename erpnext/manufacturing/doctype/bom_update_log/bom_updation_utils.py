@@ -12,6 +12,9 @@ if TYPE_CHECKING:
 import frappe
 from frappe import _
 
+from erpnext.manufacturing.doctype.bom.bom_explosion import clear_bom_explosion_cache
+from erpnext.manufacturing.doctype.bom_update_log.bom_cost_rollup import BOMCostRollup
+
 
 def replace_bom(boms: dict, log_name: str) -> None:
 	"Replace current BOM with new BOM in parent BOMs."
@@ -23,6 +26,7 @@ def replace_bom(boms: dict, log_name: str) -> None:
 	update_new_bom_in_bom_items(unit_cost, current_bom, new_bom)
 
 	frappe.cache().delete_key("bom_children")
+	clear_bom_explosion_cache([current_bom, new_bom])
 	parent_boms = get_ancestor_boms(new_bom)
 
 	for bom in parent_boms:
@@ -51,7 +55,7 @@ def update_cost_in_level(doc: "BOMUpdateLog", bom_list: list[str], batch_name: i
 		if status == "Failed":
 			return
 
-		update_cost_in_boms(bom_list=bom_list)  # main updation logic
+		BOMCostRollup().update_cost(bom_list, commit=True)  # main updation logic
 
 		bom_batch = frappe.qb.DocType("BOM Update Batch")
 		(
@@ -60,6 +64,11 @@ def update_cost_in_level(doc: "BOMUpdateLog", bom_list: list[str], batch_name: i
 			.set(bom_batch.status, "Completed")
 			.where(bom_batch.name == batch_name)
 		).run()
+
+		# start the next level without waiting for the Cron job if this was the last batch of the level
+		from erpnext.manufacturing.doctype.bom_update_log.bom_update_log import resume_bom_cost_update_job
+
+		resume_bom_cost_update_job(doc.name)
 	except Exception:
 		handle_exception(doc)
 	finally:
@@ -112,18 +121,6 @@ def get_bom_unit_cost(bom_name: str) -> float:
 	return frappe.utils.flt(new_bom_unitcost[0][0])
 
 
-def update_cost_in_boms(bom_list: list[str]) -> None:
-	"Updates cost in given BOMs. Returns current and total updated BOMs."
-
-	for index, bom in enumerate(bom_list):
-		bom_doc = frappe.get_doc("BOM", bom, for_update=True)
-		bom_doc.calculate_cost(save_updates=True, update_hour_rate=True)
-		bom_doc.db_update()
-
-		if (index % 50 == 0) and not frappe.flags.in_test:
-			frappe.db.commit()  # nosemgrep
-
-
 def get_next_higher_level_boms(child_boms: list[str], processed_boms: dict[str, bool]) -> list[str]:
 	"Generate immediate higher level dependants with no unresolved dependencies (children)."
 
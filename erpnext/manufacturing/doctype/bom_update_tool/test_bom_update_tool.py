@@ -64,3 +64,43 @@ class TestBOMUpdateTool(FrappeTestCase):
 
 		doc.load_from_db()
 		self.assertEqual(doc.total_cost, 200)
+
+	@timeout
+	def test_bom_cost_rollup_over_levels(self):
+		for item in [
+			"BOM Rollup Test FG",
+			"BOM Rollup Test Sub Assembly",
+			"BOM Rollup Test RM 1",
+			"BOM Rollup Test RM 2",
+		]:
+			item_doc = create_item(item, valuation_rate=100)
+			if item_doc.valuation_rate != 100.00:
+				frappe.db.set_value("Item", item_doc.name, "valuation_rate", 100)
+
+		sub_assembly_bom = make_bom(
+			item="BOM Rollup Test Sub Assembly", raw_materials=["BOM Rollup Test RM 1"], currency="INR"
+		)
+		fg_bom = make_bom(
+			item="BOM Rollup Test FG",
+			raw_materials=["BOM Rollup Test Sub Assembly", "BOM Rollup Test RM 2"],
+			currency="INR",
+		)
+		self.assertEqual(fg_bom.items[0].bom_no, sub_assembly_bom.name)
+		self.assertEqual(fg_bom.total_cost, 200)
+
+		frappe.db.set_value("Item", "BOM Rollup Test RM 1", "valuation_rate", 300)
+		update_cost_in_all_boms_in_test()
+
+		sub_assembly_bom.load_from_db()
+		fg_bom.load_from_db()
+		self.assertEqual(sub_assembly_bom.total_cost, 300)
+		self.assertEqual(fg_bom.items[0].rate, 300)
+		self.assertEqual(fg_bom.total_cost, 400)
+		self.assertEqual(
+			{d.item_code: d.rate for d in fg_bom.exploded_items},
+			{"BOM Rollup Test RM 1": 300, "BOM Rollup Test RM 2": 100},
+		)
+
+		# costs written by the rollup are the ones calculated on the document
+		fg_bom.calculate_cost()
+		self.assertEqual(fg_bom.total_cost, 400)
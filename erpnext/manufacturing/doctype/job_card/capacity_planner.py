@@ -0,0 +1,163 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import bisect
+import datetime
+
+import frappe
+from frappe.utils import add_days, cint, get_datetime
+
+from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
+	get_mins_between_operations,
+)
+from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
+from erpnext.support.doctype.issue.issue import get_holidays
+
+
+class CapacityPlanner:
+	"""
+	Busy time of workstations while the operations of Work Orders are scheduled into Job Cards.
+
+	The time logs and scheduled times of Job Cards ending after `from_time` are read once per
+	workstation (or workstation type) and kept sorted by start time, so that looking up the
+	logs overlapping a slot does not hit the database. Job Cards scheduled with the planner
+	must be added to it with `add_job_card`.
+	"""
+
+	def __init__(self, from_time=None):
+		self.from_time = get_datetime(from_time) if from_time else None
+		self.time_logs = {}
+		self.max_duration = {}
+		self.workstations = {}
+		self.holidays = {}
+
+		self.allow_overtime = cint(frappe.db.get_single_value("Manufacturing Settings", "allow_overtime"))
+		self.allow_production_on_holidays = cint(
+			frappe.db.get_single_value("Manufacturing Settings", "allow_production_on_holidays")
+		)
+		self.mins_between_operations = get_mins_between_operations()
+
+	def set_from_time(self, from_time):
+		"""Make the planner include the time logs ending after `from_time`"""
+		from_time = get_datetime(from_time)
+		if self.from_time and from_time < self.from_time:
+			# logs added so far are in the database, they are read again with the earlier ones
+			self.time_logs, self.max_duration = {}, {}
+			self.from_time = from_time
+
+	def get_time_logs(self, args, workstation=None, workstation_type=None):
+		"""
+		Returns the time logs of Job Cards on `workstation` (and/or of `workstation_type`) that
+		overlap the `from_time` and `to_time` of `args`, sorted by their end time.
+		"""
+		key = ("workstation", workstation) if workstation else ("workstation_type", workstation_type)
+		if not workstation and not workstation_type:
+			key = ("all", None)
+
+		if key not in self.time_logs:
+			self.load_time_logs(key)
+
+		from_time, to_time = get_datetime(args.from_time), get_datetime(args.to_time)
+		time_logs = self.time_logs[key]
+
+		# every overlapping log starts at most `max_duration` before the earlier of the two times
+		start = bisect.bisect_left(
+			time_logs,
+			min(from_time, to_time) - self.max_duration[key],
+			key=lambda d: d.from_time,
+		)
+		end = bisect.bisect_right(time_logs, max(from_time, to_time), key=lambda d: d.from_time)
+
+		overlapping = [
+			d
+			for d in time_logs[start:end]
+			if (not workstation or not workstation_type or d.workstation_type == workstation_type)
+			and (
+				(d.from_time < from_time and d.to_time > from_time)
+				or (d.from_time < to_time and d.to_time > to_time)
+				or (d.from_time >= from_time and d.to_time <= to_time)
+			)
+		]
+
+		return sorted(overlapping, key=lambda d: d.to_time)
+
+	def load_time_logs(self, key):
+		jc = frappe.qb.DocType("Job Card")
+
+		time_logs = []
+		for doctype in ("Job Card Time Log", "Job Card Scheduled Time"):
+			jctl = frappe.qb.DocType(doctype)
+			query = (
+				frappe.qb.from_(jctl)
+				.from_(jc)
+				.select(
+					jc.name.as_("name"),
+					jctl.name.as_("row_name"),
+					jctl.from_time,
+					jctl.to_time,
+					jc.workstation,
+					jc.workstation_type,
+				)
+				.where(
+					(jctl.parent == jc.name)
+					& (jc.docstatus < 2)
+					& (jctl.from_time.isnotnull())
+					& (jctl.to_time.isnotnull())
+				)
+				.orderby(jctl.to_time)
+			)
+
+			if key[0] != "all":
+				query = query.where(jc[key[0]] == key[1])
+
+			if self.from_time:
+				query = query.where(jctl.to_time > self.from_time)
+
+			if doctype != "Job Card Time Log":
+				query = query.where(jc.total_time_in_mins == 0)
+
+			time_logs.extend(query.run(as_dict=True))
+
+		self.time_logs[key] = sorted(time_logs, key=lambda d: d.from_time)
+		self.max_duration[key] = max(
+			(d.to_time - d.from_time for d in time_logs), default=datetime.timedelta(0)
+		)
+
+	def add_job_card(self, job_card):
+		"""Add the scheduled times of a Job Card created with the planner"""
+		for row in job_card.scheduled_time_logs:
+			time_log = frappe._dict(
+				name=job_card.name,
+				row_name=row.name,
+				from_time=get_datetime(row.from_time),
+				to_time=get_datetime(row.to_time),
+				workstation=job_card.workstation,
+				workstation_type=job_card.workstation_type,
+			)
+
+			for key in self.time_logs:
+				if key[0] == "all" or time_log[key[0]] == key[1]:
+					self.add_time_log(key, time_log)
+
+	def add_time_log(self, key, time_log):
+		bisect.insort_right(self.time_logs[key], time_log, key=lambda d: d.from_time)
+		self.max_duration[key] = max(self.max_duration[key], time_log.to_time - time_log.from_time)
+
+	def get_workstations(self, workstation_type):
+		if workstation_type not in self.workstations:
+			self.workstations[workstation_type] = get_workstations(workstation_type)
+
+		return self.workstations[workstation_type]
+
+	def get_working_date(self, workstation_doc, schedule_date):
+		"""Returns the first day from `schedule_date` that is not a holiday of the workstation"""
+		if not workstation_doc.holiday_list or self.allow_production_on_holidays:
+			return schedule_date
+
+		if workstation_doc.holiday_list not in self.holidays:
+			self.holidays[workstation_doc.holiday_list] = set(get_holidays(workstation_doc.holiday_list))
+
+		while schedule_date in self.holidays[workstation_doc.holiday_list]:
+			schedule_date = add_days(schedule_date, 1)
+
+		return schedule_date
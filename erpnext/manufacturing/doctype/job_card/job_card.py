@@ -23,9 +23,7 @@ from frappe.utils import (
 	time_diff_in_hours,
 )
 
-from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
-	get_mins_between_operations,
-)
+from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.workstation_type.workstation_type import get_workstations
 from erpnext.subcontracting.doctype.subcontracting_bom.subcontracting_bom import (
 	get_subcontracting_boms_for_finished_goods,
@@ -274,12 +272,17 @@ class JobCard(Document):
 		for row in self.sub_operations:
 			self.total_completed_qty += row.completed_qty
 
-	def get_overlap_for(self, args, open_job_cards=None):
+	def get_overlap_for(self, args, open_job_cards=None, capacity_planner=None):
 		time_logs = []
 
-		time_logs.extend(self.get_time_logs(args, "Job Card Time Log"))
+		if capacity_planner and not args.get("employee"):
+			time_logs.extend(capacity_planner.get_time_logs(args, self.workstation, self.workstation_type))
+		else:
+			time_logs.extend(self.get_time_logs(args, "Job Card Time Log"))
 
-		time_logs.extend(self.get_time_logs(args, "Job Card Scheduled Time", open_job_cards=open_job_cards))
+			time_logs.extend(
+				self.get_time_logs(args, "Job Card Scheduled Time", open_job_cards=open_job_cards)
+			)
 
 		if not time_logs:
 			return {}
@@ -300,7 +303,9 @@ class JobCard(Document):
 			return {}
 
 		if not self.workstation and self.workstation_type and time_logs:
-			if workstation_time := self.get_workstation_based_on_available_slot(time_logs):
+			if workstation_time := self.get_workstation_based_on_available_slot(
+				time_logs, capacity_planner=capacity_planner
+			):
 				self.workstation = workstation_time.get("workstation")
 				return workstation_time
 
@@ -417,8 +422,11 @@ class JobCard(Document):
 		jobs = query.run(as_dict=True)
 		return [job.get("name") for job in jobs] if jobs else []
 
-	def get_workstation_based_on_available_slot(self, existing_time_logs) -> dict:
-		workstations = get_workstations(self.workstation_type)
+	def get_workstation_based_on_available_slot(self, existing_time_logs, capacity_planner=None) -> dict:
+		if capacity_planner:
+			workstations = capacity_planner.get_workstations(self.workstation_type)
+		else:
+			workstations = get_workstations(self.workstation_type)
 		if workstations:
 			busy_workstations = self.time_slot_wise_busy_workstations(existing_time_logs)
 			for time_slot in busy_workstations:
@@ -444,44 +452,56 @@ class JobCard(Document):
 
 		return time_slot
 
-	def schedule_time_logs(self, row):
+	def schedule_time_logs(self, row, capacity_planner=None):
+		"""
+		Add scheduled time logs for `row` from its planned start time, on the first free slots within
+		the working hours of the workstation. Pass a `CapacityPlanner` to share the busy time of the
+		workstations read from the database between the Job Cards of several operations.
+		"""
+		if not capacity_planner:
+			capacity_planner = CapacityPlanner(row.planned_start_time)
+
 		row.remaining_time_in_mins = row.time_in_mins
 		while row.remaining_time_in_mins > 0:
 			args = frappe._dict({"from_time": row.planned_start_time, "to_time": row.planned_end_time})
 
-			self.validate_overlap_for_workstation(args, row)
-			self.check_workstation_time(row)
+			self.validate_overlap_for_workstation(args, row, capacity_planner)
+			self.check_workstation_time(row, capacity_planner)
 
-	def validate_overlap_for_workstation(self, args, row):
-		# get the last record based on the to time from the job card
-		data = self.get_overlap_for(args)
+	def validate_overlap_for_workstation(self, args, row, capacity_planner=None):
+		if not capacity_planner:
+			capacity_planner = CapacityPlanner(args.from_time)
 
-		if not self.workstation:
-			workstations = get_workstations(self.workstation_type)
-			if workstations:
-				# Get the first workstation
-				self.workstation = workstations[0]
+		while True:
+			# get the last record based on the to time from the job card
+			data = self.get_overlap_for(args, capacity_planner=capacity_planner)
 
-		if not data:
-			row.planned_start_time = args.from_time
-			return
+			if not self.workstation:
+				workstations = capacity_planner.get_workstations(self.workstation_type)
+				if workstations:
+					# Get the first workstation
+					self.workstation = workstations[0]
+
+			if not data:
+				row.planned_start_time = args.from_time
+				return
 
-		if data:
 			if data.get("planned_start_time"):
 				args.planned_start_time = get_datetime(data.planned_start_time)
 			else:
-				args.planned_start_time = get_datetime(data.to_time + get_mins_between_operations())
+				args.planned_start_time = get_datetime(
+					data.to_time + capacity_planner.mins_between_operations
+				)
 
 			args.from_time = args.planned_start_time
 			args.to_time = add_to_date(args.planned_start_time, minutes=row.remaining_time_in_mins)
 
-			self.validate_overlap_for_workstation(args, row)
+	def check_workstation_time(self, row, capacity_planner=None):
+		if not capacity_planner:
+			capacity_planner = CapacityPlanner(row.planned_start_time)
 
-	def check_workstation_time(self, row):
 		workstation_doc = frappe.get_cached_doc("Workstation", self.workstation)
-		if not workstation_doc.working_hours or cint(
-			frappe.db.get_single_value("Manufacturing Settings", "allow_overtime")
-		):
+		if not workstation_doc.working_hours or capacity_planner.allow_overtime:
 			if get_datetime(row.planned_end_time) <= get_datetime(row.planned_start_time):
 				row.planned_end_time = add_to_date(row.planned_start_time, minutes=row.time_in_mins)
 				row.remaining_time_in_mins = 0.0
@@ -496,7 +516,7 @@ class JobCard(Document):
 		start_date = getdate(row.planned_start_time)
 		start_time = get_time(row.planned_start_time)
 
-		new_start_date = workstation_doc.validate_workstation_holiday(start_date)
+		new_start_date = capacity_planner.get_working_date(workstation_doc, start_date)
 
 		if new_start_date != start_date:
 			row.planned_start_time = datetime.datetime.combine(new_start_date, start_time)
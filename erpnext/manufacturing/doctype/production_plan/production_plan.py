@@ -25,6 +25,7 @@ from pypika.terms import ExistsCriterion
 
 from erpnext.manufacturing.doctype.bom.bom import get_children as get_bom_children
 from erpnext.manufacturing.doctype.bom.bom import validate_bom_no
+from erpnext.manufacturing.doctype.bom.bom_explosion import get_exploded_bom_items, get_flat_bom_items
 from erpnext.manufacturing.doctype.work_order.work_order import get_item_details
 from erpnext.setup.doctype.item_group.item_group import get_item_group_defaults
 from erpnext.stock.get_item_details import get_conversion_factor
@@ -1095,49 +1096,66 @@ def download_raw_materials(doc, warehouses=None):
 
 
 def get_exploded_items(item_details, company, bom_no, include_non_stock_items, planned_qty=1, doc=None):
-	bei = frappe.qb.DocType("BOM Explosion Item")
-	bom = frappe.qb.DocType("BOM")
+	explosion = get_exploded_bom_items(bom_no)
+	if explosion.docstatus not in (0, 1):
+		return item_details
+
+	item_master = get_item_planning_details([d.item_code for d in explosion.items], company)
+	for d in explosion.items:
+		details = item_master.get(d.item_code)
+		if not details or (not include_non_stock_items and not details.is_stock_item):
+			continue
+
+		item_details.setdefault(
+			d.item_code,
+			frappe._dict(
+				details,
+				qty=d.qty * flt(planned_qty),
+				description=d.description,
+				stock_uom=d.stock_uom,
+				source_warehouse=d.source_warehouse,
+			),
+		)
+
+	return item_details
+
+
+def get_item_planning_details(item_codes, company):
+	"""Returns the planning details of `item_codes` for `company`, keyed by item code"""
+	if not item_codes:
+		return {}
+
 	item = frappe.qb.DocType("Item")
 	item_default = frappe.qb.DocType("Item Default")
 	item_uom = frappe.qb.DocType("UOM Conversion Detail")
 
-	data = (
-		frappe.qb.from_(bei)
-		.join(bom)
-		.on(bom.name == bei.parent)
-		.join(item)
-		.on(item.name == bei.item_code)
+	items = (
+		frappe.qb.from_(item)
 		.left_join(item_default)
-		.on((item_default.parent == item.name) & (item_default.company == company))
+		.on((item.name == item_default.parent) & (item_default.company == company))
 		.left_join(item_uom)
 		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
 		.select(
-			(IfNull(Sum(bei.stock_qty / IfNull(bom.quantity, 1)), 0) * planned_qty).as_("qty"),
-			item.item_name,
 			item.name.as_("item_code"),
-			bei.description,
-			bei.stock_uom,
-			item.min_order_qty,
-			bei.source_warehouse,
+			item.item_name,
+			item.is_stock_item,
 			item.default_material_request_type,
+			item.is_sub_contracted_item.as_("is_sub_contracted"),
+			item.default_bom,
 			item.min_order_qty,
+			item.safety_stock,
 			item_default.default_warehouse,
 			item.purchase_uom,
 			item_uom.conversion_factor,
-			item.safety_stock,
-		)
-		.where(
-			(bei.docstatus < 2)
-			& (bom.name == bom_no)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
 		)
-		.groupby(bei.item_code, bei.stock_uom)
+		.where(item.name.isin(list(set(item_codes))))
 	).run(as_dict=True)
 
-	for d in data:
+	item_details = {}
+	for d in items:
 		if not d.conversion_factor and d.purchase_uom:
 			d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
-		item_details.setdefault(d.get("item_code"), d)
+		item_details.setdefault(d.item_code, d)
 
 	return item_details
 
@@ -1159,73 +1177,24 @@ def get_subitems(
 	parent_qty,
 	planned_qty=1,
 ):
-	bom_item = frappe.qb.DocType("BOM Item")
-	bom = frappe.qb.DocType("BOM")
-	item = frappe.qb.DocType("Item")
-	item_default = frappe.qb.DocType("Item Default")
-	item_uom = frappe.qb.DocType("UOM Conversion Detail")
-
-	items = (
-		frappe.qb.from_(bom_item)
-		.join(bom)
-		.on(bom.name == bom_item.parent)
-		.join(item)
-		.on(bom_item.item_code == item.name)
-		.left_join(item_default)
-		.on((item.name == item_default.parent) & (item_default.company == company))
-		.left_join(item_uom)
-		.on((item.name == item_uom.parent) & (item_uom.uom == item.purchase_uom))
-		.select(
-			bom_item.item_code,
-			item.default_material_request_type,
-			item.item_name,
-			IfNull(parent_qty * Sum(bom_item.stock_qty / IfNull(bom.quantity, 1)) * planned_qty, 0).as_(
-				"qty"
-			),
-			item.is_sub_contracted_item.as_("is_sub_contracted"),
-			bom_item.source_warehouse,
-			item.default_bom.as_("default_bom"),
-			bom_item.description.as_("description"),
-			bom_item.stock_uom.as_("stock_uom"),
-			item.min_order_qty.as_("min_order_qty"),
-			item.safety_stock.as_("safety_stock"),
-			item_default.default_warehouse,
-			item.purchase_uom,
-			item_uom.conversion_factor,
-		)
-		.where(
-			(bom.name == bom_no)
-			& (bom_item.docstatus < 2)
-			& (item.is_stock_item.isin([0, 1]) if include_non_stock_items else item.is_stock_item == 1)
-		)
-		.groupby(bom_item.item_code)
-	).run(as_dict=True)
+	items = get_flat_bom_items(
+		bom_no,
+		include_exploded_items=data.get("include_exploded_items"),
+		include_non_stock_items=include_non_stock_items,
+		include_subcontracted_items=include_subcontracted_items,
+	)
 
+	item_master = get_item_planning_details(
+		[d.item_code for d in items if d.item_code not in item_details], company
+	)
 	for d in items:
-		if not data.get("include_exploded_items") or not d.default_bom:
-			if d.item_code in item_details:
-				item_details[d.item_code].qty = item_details[d.item_code].qty + d.qty
-			else:
-				if not d.conversion_factor and d.purchase_uom:
-					d.conversion_factor = get_uom_conversion_factor(d.item_code, d.purchase_uom)
+		qty = flt(parent_qty) * d.qty * flt(planned_qty)
+		if d.item_code in item_details:
+			item_details[d.item_code].qty = item_details[d.item_code].qty + qty
+		elif d.item_code in item_master:
+			item_details[d.item_code] = frappe._dict(item_master[d.item_code], **d)
+			item_details[d.item_code].qty = qty
 
-				item_details[d.item_code] = d
-
-		if data.get("include_exploded_items") and d.default_bom:
-			if (
-				d.default_material_request_type in ["Manufacture", "Purchase"] and not d.is_sub_contracted
-			) or (d.is_sub_contracted and include_subcontracted_items):
-				if d.qty > 0:
-					get_subitems(
-						doc,
-						data,
-						item_details,
-						d.default_bom,
-						company,
-						include_non_stock_items,
-						include_subcontracted_items,
-						d.qty,
-					)
 	return item_details
 
 
@@ -1238,6 +1207,7 @@ def get_material_request_items(
 	include_safety_stock,
 	warehouse,
 	bin_dict,
+	conversion_factors=None,
 ):
 	total_qty = row["qty"]
 
@@ -1265,7 +1235,7 @@ def get_material_request_items(
 
 			required_qty = required_qty / row["conversion_factor"]
 
-	if frappe.db.get_value("UOM", row["purchase_uom"], "must_be_whole_number"):
+	if frappe.get_cached_value("UOM", row["purchase_uom"], "must_be_whole_number"):
 		required_qty = ceil(required_qty)
 
 	if include_safety_stock:
@@ -1279,9 +1249,17 @@ def get_material_request_items(
 		and item_details.purchase_uom
 		and item_details.purchase_uom != item_details.stock_uom
 	):
-		conversion_factor = (
-			get_conversion_factor(row.item_code, item_details.purchase_uom).get("conversion_factor") or 1.0
-		)
+		if conversion_factors is None:
+			conversion_factors = {}
+
+		key = (row.item_code, item_details.purchase_uom)
+		if key not in conversion_factors:
+			conversion_factors[key] = (
+				get_conversion_factor(row.item_code, item_details.purchase_uom).get("conversion_factor")
+				or 1.0
+			)
+
+		conversion_factor = conversion_factors[key]
 
 	if required_qty > 0:
 		return {
@@ -1412,6 +1390,116 @@ def get_bin_details(row, company, for_warehouse=None, all_warehouse=False):
 	return query.run(as_dict=True)
 
 
+def get_first_bin_details(rows, company, for_warehouse=None):
+	"""
+	Returns the bin details that `get_bin_details` returns first for each of `rows`, i.e. of the
+	first warehouse (by name) under `for_warehouse` or the source or default warehouse of the row.
+	"""
+	item_codes = list({row["item_code"] for row in rows})
+	if not item_codes:
+		return []
+
+	bin = frappe.qb.DocType("Bin")
+	wh = frappe.qb.DocType("Warehouse")
+
+	bins = {}
+	for d in (
+		frappe.qb.from_(bin)
+		.join(wh)
+		.on(wh.name == bin.warehouse)
+		.select(
+			bin.item_code,
+			bin.warehouse,
+			wh.lft,
+			wh.rgt,
+			IfNull(bin.projected_qty, 0).as_("projected_qty"),
+			IfNull(bin.actual_qty, 0).as_("actual_qty"),
+			IfNull(bin.ordered_qty, 0).as_("ordered_qty"),
+			IfNull(bin.reserved_qty_for_production, 0).as_("reserved_qty_for_production"),
+			IfNull(bin.planned_qty, 0).as_("planned_qty"),
+		)
+		.where((bin.item_code.isin(item_codes)) & (wh.company == company))
+		.orderby(bin.item_code, bin.warehouse)
+	).run(as_dict=True):
+		bins.setdefault(d.pop("item_code"), []).append(d)
+
+	warehouses = {
+		for_warehouse or row.get("source_warehouse") or row.get("default_warehouse") for row in rows
+	}
+
+	warehouse_bounds = {
+		d.name: (d.lft, d.rgt)
+		for d in frappe.get_all(
+			"Warehouse",
+			filters={"name": ("in", list(filter(None, warehouses)))},
+			fields=["name", "lft", "rgt"],
+		)
+	}
+
+	bin_details = []
+	for row in rows:
+		warehouse = for_warehouse or row.get("source_warehouse") or row.get("default_warehouse")
+		lft, rgt = warehouse_bounds.get(warehouse, (None, None))
+
+		bin_dict = next(
+			(
+				d
+				for d in bins.get(row["item_code"], [])
+				if not warehouse or (lft is not None and d.lft >= lft and d.rgt <= rgt)
+			),
+			None,
+		)
+		bin_details.append(
+			frappe._dict({key: value for key, value in bin_dict.items() if key not in ("lft", "rgt")})
+			if bin_dict
+			else {}
+		)
+
+	return bin_details
+
+
+def get_available_locations(item_codes, warehouses, company):
+	"""
+	Returns the stock of items without serial and batch nos in `warehouses`, keyed by item code,
+	as `get_available_item_locations` finds it. Serial and batch items are left out.
+	"""
+	from erpnext.stock.doctype.pick_list.pick_list import get_rejected_warehouses
+
+	item_codes = [
+		d.name
+		for d in frappe.get_all(
+			"Item",
+			filters={"name": ("in", list(set(item_codes))), "has_serial_no": 0, "has_batch_no": 0},
+			fields=["name"],
+		)
+	]
+	if not item_codes:
+		return {}
+
+	bin = frappe.qb.DocType("Bin")
+	query = (
+		frappe.qb.from_(bin)
+		.select(bin.item_code, bin.warehouse, bin.actual_qty.as_("qty"))
+		.where((bin.item_code.isin(item_codes)) & (bin.actual_qty > 0))
+		.orderby(bin.creation)
+	)
+
+	if warehouses:
+		query = query.where(bin.warehouse.isin(warehouses))
+	else:
+		wh = frappe.qb.DocType("Warehouse")
+		query = query.from_(wh).where((bin.warehouse == wh.name) & (wh.company == company))
+
+	if rejected_warehouses := get_rejected_warehouses():
+		query = query.where(bin.warehouse.notin(rejected_warehouses))
+
+	locations = {item_code: [] for item_code in item_codes}
+	for d in query.run(as_dict=True):
+		locations[d.pop("item_code")].append(d)
+
+	return locations
+
+
 @frappe.whitelist()
 def get_so_details(sales_order):
 	return frappe.db.get_value(
@@ -1579,31 +1667,39 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 			else:
 				so_item_details[sales_order][item_code] = details
 
+	rows = [
+		(sales_order, details)
+		for sales_order, item_dict in so_item_details.items()
+		for details in item_dict.values()
+	]
+	bin_details = get_first_bin_details([details for sales_order, details in rows], doc.company, warehouse)
+
 	mr_items = []
-	for sales_order in so_item_details:
-		item_dict = so_item_details[sales_order]
-		for details in item_dict.values():
-			bin_dict = get_bin_details(details, doc.company, warehouse)
-			bin_dict = bin_dict[0] if bin_dict else {}
-
-			if details.qty > 0:
-				items = get_material_request_items(
-					doc,
-					details,
-					sales_order,
-					company,
-					ignore_existing_ordered_qty,
-					include_safety_stock,
-					warehouse,
-					bin_dict,
-				)
-				if items:
-					mr_items.append(items)
+	conversion_factors = {}
+	for (sales_order, details), bin_dict in zip(rows, bin_details, strict=True):
+		if details.qty > 0:
+			items = get_material_request_items(
+				doc,
+				details,
+				sales_order,
+				company,
+				ignore_existing_ordered_qty,
+				include_safety_stock,
+				warehouse,
+				bin_dict,
+				conversion_factors=conversion_factors,
+			)
+			if items:
+				mr_items.append(items)
 
 	if (not ignore_existing_ordered_qty or get_parent_warehouse_data) and warehouses:
+		locations = get_available_locations([d.get("item_code") for d in mr_items], warehouses, company)
+
 		new_mr_items = []
 		for item in mr_items:
-			get_materials_from_other_locations(item, warehouses, new_mr_items, company)
+			get_materials_from_other_locations(
+				item, warehouses, new_mr_items, company, locations=locations.get(item.get("item_code"))
+			)
 
 		mr_items = new_mr_items
 
@@ -1623,20 +1719,31 @@ def get_items_for_material_requests(doc, warehouses=None, get_parent_warehouse_d
 	return mr_items
 
 
-def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
-	from erpnext.stock.doctype.pick_list.pick_list import get_available_item_locations
+def get_materials_from_other_locations(item, warehouses, new_mr_items, company, locations=None):
+	"""
+	Split `item` into transfers from the stock available in `warehouses` and a request for the rest.
 
-	stock_uom, purchase_uom = frappe.db.get_value(
-		"Item", item.get("item_code"), ["stock_uom", "purchase_uom"]
+	`locations` are the stock of the item in `warehouses`, as returned by `get_available_locations`.
+	"""
+	from erpnext.stock.doctype.pick_list.pick_list import (
+		get_available_item_locations,
+		get_locations_based_on_required_qty,
 	)
 
-	locations = get_available_item_locations(
-		item.get("item_code"),
-		warehouses,
-		item.get("quantity") * item.get("conversion_factor"),
-		company,
-		ignore_validation=True,
-	)
+	purchase_uom = frappe.get_cached_value("Item", item.get("item_code"), "purchase_uom")
+
+	if locations is None:
+		locations = get_available_item_locations(
+			item.get("item_code"),
+			warehouses,
+			item.get("quantity") * item.get("conversion_factor"),
+			company,
+			ignore_validation=True,
+		)
+	elif locations:
+		locations = get_locations_based_on_required_qty(
+			[frappe._dict(d) for d in locations], item.get("quantity") * item.get("conversion_factor")
+		)
 
 	required_qty = item.get("quantity")
 	if item.get("conversion_factor") and item.get("purchase_uom") != item.get("stock_uom"):
@@ -1670,7 +1777,7 @@ def get_materials_from_other_locations(item, warehouses, new_mr_items, company):
 	if flt(required_qty, precision) > 0:
 		required_qty = required_qty
 
-		if frappe.db.get_value("UOM", purchase_uom, "must_be_whole_number"):
+		if frappe.get_cached_value("UOM", purchase_uom, "must_be_whole_number"):
 			required_qty = ceil(required_qty)
 
 		item["quantity"] = required_qty / item.get("conversion_factor")
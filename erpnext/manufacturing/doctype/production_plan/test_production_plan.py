@@ -6,6 +6,8 @@ from frappe.utils import add_to_date, flt, getdate, now_datetime, nowdate
 
 from erpnext.controllers.item_variant import create_variant
 from erpnext.manufacturing.doctype.production_plan.production_plan import (
+	get_bin_details,
+	get_first_bin_details,
 	get_items_for_material_requests,
 	get_non_completed_production_plans,
 	get_sales_orders,
@@ -1613,6 +1615,31 @@ class TestProductionPlan(FrappeTestCase):
 			self.assertEqual(row.production_item, sf_item)
 			self.assertEqual(row.qty, 5.0)
 
+	def test_first_bin_details_in_bulk(self):
+		from erpnext.stock.doctype.warehouse.test_warehouse import create_warehouse
+
+		parent_warehouse = "_Test Warehouse Group - _TC"
+		sub_warehouse = create_warehouse("_Test Bulk Bin Warehouse")
+
+		item = make_item(properties={"is_stock_item": 1}).name
+		other_item = make_item(properties={"is_stock_item": 1}).name
+		make_stock_entry(item_code=item, qty=5, target=sub_warehouse, rate=100)
+		make_stock_entry(item_code=item, qty=3, target="_Test Warehouse - _TC", rate=100)
+		make_stock_entry(item_code=other_item, qty=2, target="_Test Warehouse - _TC", rate=100)
+
+		rows = [
+			frappe._dict(item_code=item, source_warehouse=parent_warehouse),
+			frappe._dict(item_code=item, default_warehouse="_Test Warehouse - _TC"),
+			frappe._dict(item_code=other_item, source_warehouse=parent_warehouse),
+			frappe._dict(item_code=other_item),
+		]
+
+		for for_warehouse in (None, parent_warehouse):
+			bin_details = get_first_bin_details(rows, "_Test Company", for_warehouse)
+			for row, bin_dict in zip(rows, bin_details, strict=True):
+				expected = get_bin_details(row, "_Test Company", for_warehouse)
+				self.assertEqual(bin_dict, expected[0] if expected else {})
+
 
 def create_production_plan(**args):
 	"""
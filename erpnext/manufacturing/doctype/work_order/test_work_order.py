@@ -1916,6 +1916,81 @@ class TestWorkOrder(FrappeTestCase):
 			"Manufacturing Settings", {"disable_capacity_planning": 1, "mins_between_operations": 0}
 		)
 
+	def test_capacity_planner_schedules_work_orders_after_each_other(self):
+		from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
+
+		frappe.db.set_single_value(
+			"Manufacturing Settings",
+			{
+				"disable_capacity_planning": 0,
+				"capacity_planning_for_days": 30,
+				"mins_between_operations": 10,
+			},
+		)
+
+		properties = {"is_stock_item": 1, "valuation_rate": 100}
+		fg_item = make_item("Test FG Item For Capacity Planner", properties).name
+		rm_item = make_item("Test RM Item For Capacity Planner", properties).name
+
+		workstation = "Test Workstation For Capacity Planner"
+		if not frappe.db.exists("Workstation", workstation):
+			make_workstation(workstation=workstation, production_capacity=1)
+
+		operation = "Test Operation For Capacity Planner"
+		if not frappe.db.exists("Operation", operation):
+			make_operation(operation=operation, workstation=workstation)
+
+		bom_doc = make_bom(
+			item=fg_item,
+			source_warehouse="Stores - _TC",
+			raw_materials=[rm_item],
+			with_operations=1,
+			do_not_submit=True,
+		)
+		bom_doc.append(
+			"operations",
+			{"operation": operation, "time_in_mins": 60, "hour_rate": 100, "workstation": workstation},
+		)
+		bom_doc.submit()
+
+		operations = []
+		for _i in range(2):
+			wo_doc = make_wo_order_test_record(
+				production_item=fg_item, qty=1, planned_start_date="2024-03-04 00:00:00"
+			)
+			operation_row = frappe.db.get_value(
+				"Work Order Operation",
+				{"parent": wo_doc.name},
+				["planned_start_time", "planned_end_time"],
+				as_dict=True,
+			)
+			scheduled_time = frappe.db.get_value(
+				"Job Card Scheduled Time",
+				{"parent": frappe.db.get_value("Job Card", {"work_order": wo_doc.name})},
+				["from_time", "to_time"],
+				as_dict=True,
+			)
+
+			# planned times of the operation are saved as scheduled in the Job Card
+			self.assertEqual(operation_row.planned_start_time, scheduled_time.from_time)
+			self.assertEqual(operation_row.planned_end_time, scheduled_time.to_time)
+			operations.append(operation_row)
+
+		self.assertEqual(
+			operations[1].planned_start_time, add_to_date(operations[0].planned_end_time, minutes=10)
+		)
+
+		planner = CapacityPlanner("2024-03-04 00:00:00")
+		time_logs = planner.get_time_logs(
+			frappe._dict(from_time=operations[0].planned_start_time, to_time=operations[1].planned_end_time),
+			workstation,
+		)
+		self.assertEqual(len(time_logs), 2)
+
+		frappe.db.set_single_value(
+			"Manufacturing Settings", {"disable_capacity_planning": 1, "mins_between_operations": 0}
+		)
+
 	def test_partial_material_consumption_with_batch(self):
 		from erpnext.stock.doctype.stock_entry.test_stock_entry import (
 			make_stock_entry as make_stock_entry_test_record,
@@ -28,6 +28,7 @@ from erpnext.manufacturing.doctype.bom.bom import (
 	get_bom_items_as_dict,
 	validate_bom_no,
 )
+from erpnext.manufacturing.doctype.job_card.capacity_planner import CapacityPlanner
 from erpnext.manufacturing.doctype.manufacturing_settings.manufacturing_settings import (
 	get_mins_between_operations,
 )
@@ -613,28 +614,56 @@ class WorkOrder(Document):
 
 		frappe.db.bulk_insert("Serial No", fields=fields, values=set(serial_nos_details))
 
-	def create_job_card(self):
+	def create_job_card(self, capacity_planner=None):
+		"""
+		Create Job Cards for the operations. With capacity planning, a `CapacityPlanner` can be
+		passed to schedule the operations of several Work Orders against the same busy time.
+		"""
 		manufacturing_settings_doc = frappe.get_doc("Manufacturing Settings")
 
 		enable_capacity_planning = not cint(manufacturing_settings_doc.disable_capacity_planning)
 		plan_days = cint(manufacturing_settings_doc.capacity_planning_for_days) or 30
 
+		if enable_capacity_planning:
+			if capacity_planner:
+				capacity_planner.set_from_time(self.planned_start_date)
+			else:
+				capacity_planner = CapacityPlanner(self.planned_start_date)
+
+		scheduled_operations = {}
 		for index, row in enumerate(self.operations):
 			qty = self.qty
 			while qty > 0:
 				qty = split_qty_based_on_batch_size(self, row, qty)
 				if row.job_card_qty > 0:
-					self.prepare_data_for_job_card(row, index, plan_days, enable_capacity_planning)
+					self.prepare_data_for_job_card(
+						row, index, plan_days, enable_capacity_planning, capacity_planner
+					)
+					if enable_capacity_planning:
+						scheduled_operations[row.name] = {
+							"planned_start_time": row.planned_start_time,
+							"planned_end_time": row.planned_end_time,
+							"batch_size": row.batch_size,
+						}
+
+		if scheduled_operations:
+			frappe.db.bulk_update("Work Order Operation", scheduled_operations)
 
 		planned_end_date = self.operations and self.operations[-1].planned_end_time
 		if planned_end_date:
 			self.db_set("planned_end_date", planned_end_date)
 
-	def prepare_data_for_job_card(self, row, index, plan_days, enable_capacity_planning):
+	def prepare_data_for_job_card(
+		self, row, index, plan_days, enable_capacity_planning, capacity_planner=None
+	):
 		self.set_operation_start_end_time(index, row)
 
 		job_card_doc = create_job_card(
-			self, row, auto_create=True, enable_capacity_planning=enable_capacity_planning
+			self,
+			row,
+			auto_create=True,
+			enable_capacity_planning=enable_capacity_planning,
+			capacity_planner=capacity_planner,
 		)
 
 		if enable_capacity_planning and job_card_doc:
@@ -654,8 +683,6 @@ class WorkOrder(Document):
 					CapacityError,
 				)
 
-			row.db_update()
-
 	def set_operation_start_end_time(self, idx, row):
 		"""Set start and end time for given operation. If first operation, set start as
 		`planned_start_date`, else add time diff to end time of earlier operation."""
@@ -1606,7 +1633,9 @@ def validate_operation_data(row):
 		)
 
 
-def create_job_card(work_order, row, enable_capacity_planning=False, auto_create=False):
+def create_job_card(
+	work_order, row, enable_capacity_planning=False, auto_create=False, capacity_planner=None
+):
 	doc = frappe.new_doc("Job Card")
 	doc.update(
 		{
@@ -1643,9 +1672,12 @@ def create_job_card(work_order, row, enable_capacity_planning=False, auto_create
 	if auto_create:
 		doc.flags.ignore_mandatory = True
 		if enable_capacity_planning:
-			doc.schedule_time_logs(row)
+			doc.schedule_time_logs(row, capacity_planner)
 
 		doc.insert()
+		if enable_capacity_planning and capacity_planner:
+			capacity_planner.add_job_card(doc)
+
 		frappe.msgprint(_("Job card {0} created").format(get_link_to_form("Job Card", doc.name)), alert=True)
 
 	if enable_capacity_planning:
@@ -0,0 +1,7 @@
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	rebuild_batch_warehouse_balances,
+)
+
+
+def execute():
+	rebuild_batch_warehouse_balances()
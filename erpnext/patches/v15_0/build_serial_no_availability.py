@@ -0,0 +1,7 @@
+from erpnext.stock.doctype.serial_no_availability.serial_no_availability import (
+	rebuild_serial_no_availability,
+)
+
+
+def execute():
+	rebuild_serial_no_availability()
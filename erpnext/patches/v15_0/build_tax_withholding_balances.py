@@ -0,0 +1,7 @@
+from erpnext.accounts.doctype.tax_withholding_balance.tax_withholding_balance import (
+	rebuild_tax_withholding_balances,
+)
+
+
+def execute():
+	rebuild_tax_withholding_balances()
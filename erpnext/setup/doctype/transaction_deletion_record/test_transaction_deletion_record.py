@@ -39,6 +39,29 @@ class TestTransactionDeletionRecord(FrappeTestCase):
 		tasks_containing_company = frappe.get_all("Task", filters={"company": "Dunder Mifflin Paper Co"})
 		self.assertEqual(tasks_containing_company, [])
 
+	def test_deletion_in_batches(self):
+		for _i in range(5):
+			create_task("Dunder Mifflin Paper Co")
+
+		tdr = frappe.get_doc({"doctype": "Transaction Deletion Record", "company": "Dunder Mifflin Paper Co"})
+		tdr.insert()
+		tdr.process_in_single_transaction = True
+		tdr.submit()
+		tdr.batch_size = 2
+		tdr.start_deletion_tasks()
+
+		self.assertEqual(frappe.get_all("Task", filters={"company": "Dunder Mifflin Paper Co"}), [])
+		self.assertEqual(frappe.db.get_value("Transaction Deletion Record", tdr.name, "status"), "Completed")
+
+		task_row = frappe.db.get_value(
+			"Transaction Deletion Record Details",
+			{"parent": tdr.name, "doctype_name": "Task"},
+			["no_of_docs", "done"],
+			as_dict=True,
+		)
+		self.assertEqual(task_row.no_of_docs, 5)
+		self.assertEqual(task_row.done, 1)
+
 	def test_company_transaction_deletion_request(self):
 		from erpnext.setup.doctype.company.company import create_transaction_deletion_request
 
@@ -1,13 +1,14 @@
 # Copyright (c) 2021, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
+import time
 from collections import OrderedDict
 
 import frappe
 from frappe import _, qb
 from frappe.desk.notifications import clear_notifications
 from frappe.model.document import Document
-from frappe.utils import cint, comma_and, create_batch, get_link_to_form
+from frappe.utils import cint, comma_and, create_batch, flt, get_link_to_form
 from frappe.utils.background_jobs import get_job, is_job_enqueued
 
 
@@ -45,6 +46,9 @@ class TransactionDeletionRecord(Document):
 	def __init__(self, *args, **kwargs):
 		super().__init__(*args, **kwargs)
 		self.batch_size = 5000
+		# a doctype still being deleted after this many seconds continues in a new job,
+		# so that its job does not run into the timeout of the long queue
+		self.max_job_duration = 900
 		# Tasks are listed by their execution order
 		self.task_to_internal_method_map = OrderedDict(
 			{
@@ -158,12 +162,15 @@ class TransactionDeletionRecord(Document):
 				try:
 					task()
 				except Exception:
-					frappe.db.rollback()
-					traceback = frappe.get_traceback(with_context=True)
-					if traceback:
-						message = "Traceback: <br>" + traceback
-						frappe.db.set_value(self.doctype, self.name, "error_log", message)
-					frappe.db.set_value(self.doctype, self.name, "status", "Failed")
+					self.log_failure()
+
+	def log_failure(self):
+		frappe.db.rollback()
+		traceback = frappe.get_traceback(with_context=True)
+		if traceback:
+			message = "Traceback: <br>" + traceback
+			frappe.db.set_value(self.doctype, self.name, "error_log", message)
+		frappe.db.set_value(self.doctype, self.name, "status", "Failed")
 
 	def delete_notifications(self):
 		self.validate_doc_status()
@@ -280,56 +287,141 @@ class TransactionDeletionRecord(Document):
 		self.enqueue_task(task="Delete Transactions")
 
 	def delete_company_transactions(self):
+		"""Start deleting the documents of every pending doctype, each in a job of its own"""
 		self.validate_doc_status()
 		if not self.delete_transactions:
-			doctypes_to_be_ignored_list = self.get_doctypes_to_be_ignored_list()
-			self.get_doctypes_with_company_field(doctypes_to_be_ignored_list)
+			pending_doctypes = [d for d in self.doctypes if d.doctype_name != self.doctype and not d.done]
+			if not pending_doctypes:
+				self.complete_if_all_doctypes_deleted()
 
-			self.get_all_child_doctypes()
-			for docfield in self.doctypes:
-				if docfield.doctype_name != self.doctype and not docfield.done:
-					no_of_docs = self.get_number_of_docs_linked_with_specified_company(
-						docfield.doctype_name, docfield.docfield_name
-					)
-					if no_of_docs > 0:
-						reference_docs = frappe.get_all(
-							docfield.doctype_name,
-							filters={docfield.docfield_name: self.company},
-							limit=self.batch_size,
-						)
-						reference_doc_names = [r.name for r in reference_docs]
-
-						self.delete_version_log(docfield.doctype_name, reference_doc_names)
-						self.delete_communications(docfield.doctype_name, reference_doc_names)
-						self.delete_comments(docfield.doctype_name, reference_doc_names)
-						self.unlink_attachments(docfield.doctype_name, reference_doc_names)
-						self.delete_child_tables(docfield.doctype_name, reference_doc_names)
-						self.delete_docs_linked_with_specified_company(
-							docfield.doctype_name, reference_doc_names
-						)
-						processed = int(docfield.no_of_docs) + len(reference_doc_names)
-						frappe.db.set_value(docfield.doctype, docfield.name, "no_of_docs", processed)
-					else:
-						# reset naming series
-						naming_series = frappe.db.get_value("DocType", docfield.doctype_name, "autoname")
-						if naming_series:
-							if "#" in naming_series:
-								self.update_naming_series(naming_series, docfield.doctype_name)
-						frappe.db.set_value(docfield.doctype, docfield.name, "done", 1)
-
-			pending_doctypes = frappe.db.get_all(
-				"Transaction Deletion Record Details",
-				filters={"parent": self.name, "done": 0},
-				pluck="doctype_name",
+			# doctypes are independent of each other, so they are deleted concurrently
+			for docfield in pending_doctypes:
+				self.enqueue_doctype_deletion(docfield.doctype_name)
+
+	def enqueue_doctype_deletion(self, doctype_name, resume=False):
+		if self.process_in_single_transaction:
+			self.execute_doctype_deletion(doctype_name=doctype_name)
+			return
+
+		job_id = None
+		if not resume:
+			job_id = f"{self.name}_delete_{frappe.scrub(doctype_name)}"
+			if is_job_enqueued(job_id):
+				return
+
+		frappe.enqueue(
+			"frappe.utils.background_jobs.run_doc_method",
+			doctype=self.doctype,
+			name=self.name,
+			doc_method="execute_doctype_deletion",
+			job_id=job_id,
+			queue="long",
+			enqueue_after_commit=True,
+			doctype_name=doctype_name,
+		)
+
+	def execute_doctype_deletion(self, doctype_name: str | None = None):
+		try:
+			self.delete_doctype_transactions(doctype_name)
+		except Exception:
+			self.log_failure()
+
+	def delete_doctype_transactions(self, doctype_name):
+		"""
+		Delete the documents of `doctype_name` linked with the company in batches of primary keys.
+
+		Every batch is committed, so that locks are held only while a batch is deleted and the
+		deletion resumes from the remaining documents if the job is stopped.
+		"""
+		docfield = next((d for d in self.doctypes if d.doctype_name == doctype_name and not d.done), None)
+		if not docfield or not self.is_running():
+			return
+
+		started_at = time.monotonic()
+		last_name = None
+
+		while reference_doc_names := self.get_next_batch(docfield, last_name):
+			batch_started_at = time.monotonic()
+
+			self.delete_version_log(docfield.doctype_name, reference_doc_names)
+			self.delete_communications(docfield.doctype_name, reference_doc_names)
+			self.delete_comments(docfield.doctype_name, reference_doc_names)
+			self.unlink_attachments(docfield.doctype_name, reference_doc_names)
+			self.delete_child_tables(docfield.doctype_name, reference_doc_names)
+			self.delete_docs_linked_with_specified_company(
+				docfield.doctype_name, docfield.docfield_name, reference_doc_names
 			)
-			if pending_doctypes:
-				# as method is enqueued after commit, calling itself will not make validate_doc_status to throw
-				# recursively call this task to delete all transactions
-				self.enqueue_task(task="Delete Transactions")
-			else:
-				self.db_set("status", "Completed")
-				self.db_set("delete_transactions", 1)
-				self.db_set("error_log", None)
+
+			last_name = reference_doc_names[-1]
+			self.update_progress(docfield, len(reference_doc_names), time.monotonic() - batch_started_at)
+			self.commit()
+
+			if not self.is_running():
+				return
+
+			if not self.process_in_single_transaction and (
+				time.monotonic() - started_at > self.max_job_duration
+			):
+				self.enqueue_doctype_deletion(docfield.doctype_name, resume=True)
+				return
+
+		# reset naming series
+		naming_series = frappe.db.get_value("DocType", docfield.doctype_name, "autoname")
+		if naming_series:
+			if "#" in naming_series:
+				self.update_naming_series(naming_series, docfield.doctype_name)
+		frappe.db.set_value(docfield.doctype, docfield.name, "done", 1)
+		self.commit()
+
+		self.complete_if_all_doctypes_deleted()
+
+	def get_next_batch(self, docfield, last_name=None):
+		table = qb.DocType(docfield.doctype_name)
+		query = (
+			qb.from_(table)
+			.select(table.name)
+			.where(table[docfield.docfield_name] == self.company)
+			.orderby(table.name)
+			.limit(self.batch_size)
+		)
+
+		if last_name:
+			query = query.where(table.name > last_name)
+
+		return query.run(pluck=True)
+
+	def update_progress(self, docfield, no_of_docs, time_taken):
+		docfield.no_of_docs = cint(docfield.no_of_docs) + no_of_docs
+		docfield.time_taken = flt(docfield.time_taken) + time_taken
+		docfield.docs_per_second = (
+			flt(docfield.no_of_docs / docfield.time_taken) if docfield.time_taken else 0
+		)
+
+		frappe.db.set_value(
+			docfield.doctype,
+			docfield.name,
+			{
+				"no_of_docs": docfield.no_of_docs,
+				"time_taken": docfield.time_taken,
+				"docs_per_second": docfield.docs_per_second,
+			},
+		)
+
+	def complete_if_all_doctypes_deleted(self):
+		# every doctype job commits its own row before checking, so the last one to finish sees all rows done
+		if frappe.db.exists("Transaction Deletion Record Details", {"parent": self.name, "done": 0}):
+			return
+
+		self.db_set("status", "Completed")
+		self.db_set("delete_transactions", 1)
+		self.db_set("error_log", None)
+
+	def is_running(self):
+		return frappe.db.get_value(self.doctype, self.name, "status") == "Running"
+
+	def commit(self):
+		if not self.process_in_single_transaction:
+			frappe.db.commit()
 
 	def get_doctypes_to_be_ignored_list(self):
 		singles = frappe.get_all("DocType", filters={"issingle": 1}, pluck="name")
@@ -374,8 +466,12 @@ class TransactionDeletionRecord(Document):
 		for table in child_tables:
 			frappe.db.delete(table, {"parent": ["in", reference_doc_names]})
 
-	def delete_docs_linked_with_specified_company(self, doctype, reference_doc_names):
-		frappe.db.delete(doctype, {"name": ("in", reference_doc_names)})
+	def delete_docs_linked_with_specified_company(self, doctype, company_fieldname, reference_doc_names):
+		# delete exactly the fetched batch, like its children, versions and comments
+		table = qb.DocType(doctype)
+		qb.from_(table).delete().where(
+			(table.name.isin(reference_doc_names)) & (table[company_fieldname] == self.company)
+		).run()
 
 	def update_naming_series(self, naming_series, doctype_name):
 		if "." in naming_series:
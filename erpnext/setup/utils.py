@@ -36,7 +36,10 @@ def before_tests():
 			}
 		)
 
+	from erpnext.stock.get_item_details import clear_all_item_price_cache
+
 	frappe.db.sql("delete from `tabItem Price`")
+	clear_all_item_price_cache()
 
 	_enable_all_roles_for_admin()
 
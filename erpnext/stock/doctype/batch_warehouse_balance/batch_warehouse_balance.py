@@ -0,0 +1,151 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import hashlib
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import Sum
+from frappe.utils import cstr, flt, now
+
+
+class BatchWarehouseBalance(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		batch_no: DF.Link | None
+		item_code: DF.Link | None
+		qty: DF.Float
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def update_batch_warehouse_balances(serial_and_batch_bundle, item_code, sign=1):
+	"""Add the batch qty of a bundle to (or on cancellation subtract it from) the running balances"""
+	entry = frappe.qb.DocType("Serial and Batch Entry")
+	entries = (
+		frappe.qb.from_(entry)
+		.select(entry.batch_no, entry.warehouse, Sum(entry.qty).as_("qty"))
+		.where(
+			(entry.parent == serial_and_batch_bundle) & (entry.batch_no.isnotnull()) & (entry.batch_no != "")
+		)
+		.groupby(entry.batch_no, entry.warehouse)
+	).run(as_dict=True)
+
+	balances = {}
+	for row in entries:
+		name = get_batch_warehouse_balance_name(row.batch_no, row.warehouse)
+		balances[name] = frappe._dict(
+			item_code=item_code, batch_no=row.batch_no, warehouse=row.warehouse, qty=sign * flt(row.qty)
+		)
+
+	add_to_batch_warehouse_balances(balances)
+
+
+def update_batch_warehouse_balance(item_code, batch_no, warehouse, qty):
+	"""Add `qty` to the running balance of the batch in the warehouse"""
+	name = get_batch_warehouse_balance_name(batch_no, warehouse)
+	add_to_batch_warehouse_balances(
+		{name: frappe._dict(item_code=item_code, batch_no=batch_no, warehouse=warehouse, qty=flt(qty))}
+	)
+
+
+def add_to_batch_warehouse_balances(balances):
+	"""Add the qty of `balances`, keyed by the Batch Warehouse Balance name, to the running balances"""
+	if not balances:
+		return
+
+	bwb = frappe.qb.DocType("Batch Warehouse Balance")
+	existing = set(frappe.qb.from_(bwb).select(bwb.name).where(bwb.name.isin(list(balances))).run(pluck=True))
+
+	# rows inserted concurrently by another transaction are ignored and updated below
+	new_balances = {name: balance for name, balance in balances.items() if name not in existing}
+	if new_balances:
+		insert_batch_warehouse_balances(new_balances, zero_qty=True, ignore_duplicates=True)
+
+	for name, balance in balances.items():
+		frappe.qb.update(bwb).set(bwb.qty, bwb.qty + balance.qty).where(bwb.name == name).run()
+
+
+def get_batch_warehouse_balance_name(batch_no, warehouse):
+	return hashlib.sha1(f"{cstr(batch_no)}\n{cstr(warehouse)}".encode()).hexdigest()
+
+
+def insert_batch_warehouse_balances(balances, zero_qty=False, ignore_duplicates=False):
+	fields = [
+		"name",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+		"item_code",
+		"batch_no",
+		"warehouse",
+		"qty",
+	]
+
+	timestamp = now()
+	values = [
+		(
+			name,
+			timestamp,
+			timestamp,
+			frappe.session.user,
+			frappe.session.user,
+			balance.item_code,
+			balance.batch_no,
+			balance.warehouse,
+			0.0 if zero_qty else balance.qty,
+		)
+		for name, balance in balances.items()
+	]
+
+	frappe.db.bulk_insert("Batch Warehouse Balance", fields, values, ignore_duplicates=ignore_duplicates)
+
+
+def get_batch_warehouse_balances_from_ledger(item_code):
+	"""Aggregate the batch qty of the active Stock Ledger Entries of `item_code`"""
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	entry = frappe.qb.DocType("Serial and Batch Entry")
+
+	entries = (
+		frappe.qb.from_(sle)
+		.inner_join(entry)
+		.on(sle.serial_and_batch_bundle == entry.parent)
+		.select(entry.batch_no, entry.warehouse, Sum(entry.qty).as_("qty"))
+		.where(
+			(sle.item_code == item_code)
+			& (sle.is_cancelled == 0)
+			& (entry.batch_no.isnotnull())
+			& (entry.batch_no != "")
+		)
+		.groupby(entry.batch_no, entry.warehouse)
+	).run(as_dict=True)
+
+	return {
+		get_batch_warehouse_balance_name(row.batch_no, row.warehouse): frappe._dict(
+			item_code=item_code, batch_no=row.batch_no, warehouse=row.warehouse, qty=flt(row.qty)
+		)
+		for row in entries
+	}
+
+
+def rebuild_batch_warehouse_balances(item_code=None):
+	"""Recompute the running balances of `item_code`, or of all batched items, from the Stock Ledger"""
+	item_codes = [item_code] if item_code else frappe.get_all("Item", {"has_batch_no": 1}, pluck="name")
+
+	for item_code in item_codes:
+		frappe.db.delete("Batch Warehouse Balance", {"item_code": item_code})
+		if balances := get_batch_warehouse_balances_from_ledger(item_code):
+			insert_batch_warehouse_balances(balances)
+
+
+def on_doctype_update():
+	frappe.db.add_index("Batch Warehouse Balance", ["item_code", "warehouse"])
@@ -0,0 +1,79 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	rebuild_batch_warehouse_balances,
+)
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import get_auto_batch_nos
+from erpnext.stock.doctype.serial_and_batch_bundle.test_serial_and_batch_bundle import (
+	get_batch_from_bundle,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+
+
+class TestBatchWarehouseBalance(FrappeTestCase):
+	def get_batch_qty(self, item_code, posting_date=None):
+		batches = get_auto_batch_nos(
+			frappe._dict(item_code=item_code, warehouse="_Test Warehouse - _TC", posting_date=posting_date)
+		)
+		return {d.batch_no: d.qty for d in batches}
+
+	def get_balances(self, item_code):
+		return dict(
+			frappe.get_all(
+				"Batch Warehouse Balance", {"item_code": item_code}, ["batch_no", "qty"], as_list=True
+			)
+		)
+
+	def test_batch_warehouse_balance(self):
+		item_code = make_item(
+			"_Test Batch Warehouse Balance Item",
+			{
+				"is_stock_item": 1,
+				"has_batch_no": 1,
+				"create_new_batch": 1,
+				"batch_number_series": "TEST-BWB-.#####",
+			},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(nowdate(), -5),
+		)
+		batch1 = get_batch_from_bundle(se.items[0].serial_and_batch_bundle)
+
+		se = make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=5, rate=100, posting_date=add_days(nowdate(), -3)
+		)
+		batch2 = get_batch_from_bundle(se.items[0].serial_and_batch_bundle)
+
+		issue = make_stock_entry(
+			item_code=item_code,
+			from_warehouse=warehouse,
+			qty=4,
+			batch_no=batch1,
+			posting_date=add_days(nowdate(), -1),
+		)
+
+		self.assertEqual(self.get_balances(item_code), {batch1: 6, batch2: 5})
+		self.assertEqual(self.get_batch_qty(item_code), {batch1: 6, batch2: 5})
+
+		# backdated lookups take the later entries out of the running balance
+		self.assertEqual(self.get_batch_qty(item_code, add_days(nowdate(), -4)), {batch1: 10})
+		self.assertEqual(self.get_batch_qty(item_code, add_days(nowdate(), -2)), {batch1: 10, batch2: 5})
+
+		issue.cancel()
+		self.assertEqual(self.get_balances(item_code), {batch1: 10, batch2: 5})
+
+		frappe.db.set_value("Batch Warehouse Balance", {"batch_no": batch1}, "qty", 1)
+		rebuild_batch_warehouse_balances(item_code)
+		self.assertEqual(self.get_balances(item_code), {batch1: 10, batch2: 5})
@@ -6,7 +6,22 @@ import frappe
 from frappe.model.document import Document
 from frappe.query_builder import Case, Order
 from frappe.query_builder.functions import Coalesce, CombineDatetime, Sum
-from frappe.utils import flt
+from frappe.utils import flt, now
+
+# quantities which make up the projected qty, with the sign they are added with
+PROJECTED_QTY_FIELDS = {
+	"actual_qty": 1,
+	"ordered_qty": 1,
+	"indented_qty": 1,
+	"planned_qty": 1,
+	"reserved_qty": -1,
+	"reserved_qty_for_production": -1,
+	"reserved_qty_for_sub_contract": -1,
+	"reserved_qty_for_production_plan": -1,
+}
+
+# quantities which can be passed as increments to `update_qty`
+BIN_QTY_DELTA_FIELDS = ("ordered_qty", "reserved_qty", "indented_qty", "planned_qty")
 
 
 class Bin(Document):
@@ -229,61 +244,97 @@ def get_bin_details(bin_name):
 	)
 
 
+def get_projected_qty_expression(values=None, deltas=None):
+	"""Returns the projected qty of a Bin row as an SQL expression over its current quantities
+
+	:param values: quantities which are being set to a new value
+	:param deltas: quantities which are being incremented by the given amount
+	"""
+	bin = frappe.qb.DocType("Bin")
+	values, deltas = values or {}, deltas or {}
+
+	projected_qty = None
+	for field, sign in PROJECTED_QTY_FIELDS.items():
+		qty = values[field] if field in values else bin[field]
+		if flt(deltas.get(field)):
+			qty = qty + flt(deltas[field])
+
+		if projected_qty is None:
+			projected_qty = qty
+		else:
+			projected_qty = projected_qty + qty if sign > 0 else projected_qty - qty
+
+	return projected_qty
+
+
+def update_bin_quantities(bin_name, values=None, deltas=None):
+	"""Set `values` and add `deltas` to the quantities of a Bin and derive its projected qty
+
+	Everything is done in a single update which does not read the Bin first, so concurrent
+	postings against the same Bin only wait on each other's row lock.
+	"""
+	bin = frappe.qb.DocType("Bin")
+	values, deltas = values or {}, deltas or {}
+
+	# projected qty is set first, as MariaDB evaluates the remaining assignments using updated values
+	query = (
+		frappe.qb.update(bin)
+		.set(bin.projected_qty, get_projected_qty_expression(values, deltas))
+		.set(bin.modified, now())
+		.set(bin.modified_by, frappe.session.user)
+		.where(bin.name == bin_name)
+	)
+
+	for field, value in values.items():
+		query = query.set(bin[field], value)
+
+	for field, delta in deltas.items():
+		if flt(delta) and field not in values:
+			query = query.set(bin[field], bin[field] + flt(delta))
+
+	query.run()
+
+
 def update_qty(bin_name, args):
 	from erpnext.controllers.stock_controller import future_sle_exists
 
-	bin_details = get_bin_details(bin_name)
 	# actual qty is already updated by processing current voucher
-	actual_qty = bin_details.actual_qty or 0.0
-	sle = frappe.qb.DocType("Stock Ledger Entry")
+	values = {}
 
 	# actual qty is not up to date in case of backdated transaction
 	if future_sle_exists(args, allow_force_reposting=False):
-		last_sle_qty = (
-			frappe.qb.from_(sle)
-			.select(sle.qty_after_transaction)
-			.where(
-				(sle.item_code == args.get("item_code"))
-				& (sle.warehouse == args.get("warehouse"))
-				& (sle.is_cancelled == 0)
-			)
-			.orderby(CombineDatetime(sle.posting_date, sle.posting_time), order=Order.desc)
-			.orderby(sle.creation, order=Order.desc)
-			.limit(1)
-			.run()
-		)
+		values["actual_qty"] = get_last_sle_qty(args.get("item_code"), args.get("warehouse"))
 
-		actual_qty = 0.0
-		if last_sle_qty:
-			actual_qty = last_sle_qty[0][0]
-
-	ordered_qty = flt(bin_details.ordered_qty) + flt(args.get("ordered_qty"))
-	reserved_qty = flt(bin_details.reserved_qty) + flt(args.get("reserved_qty"))
-	indented_qty = flt(bin_details.indented_qty) + flt(args.get("indented_qty"))
-	planned_qty = flt(bin_details.planned_qty) + flt(args.get("planned_qty"))
-
-	# compute projected qty
-	projected_qty = (
-		flt(actual_qty)
-		+ flt(ordered_qty)
-		+ flt(indented_qty)
-		+ flt(planned_qty)
-		- flt(reserved_qty)
-		- flt(bin_details.reserved_qty_for_production)
-		- flt(bin_details.reserved_qty_for_sub_contract)
-		- flt(bin_details.reserved_qty_for_production_plan)
-	)
+	deltas = {field: flt(args.get(field)) for field in BIN_QTY_DELTA_FIELDS}
+	update_bin_quantities(bin_name, values, deltas)
 
-	frappe.db.set_value(
-		"Bin",
-		bin_name,
-		{
-			"actual_qty": actual_qty,
-			"ordered_qty": ordered_qty,
-			"reserved_qty": reserved_qty,
-			"indented_qty": indented_qty,
-			"planned_qty": planned_qty,
-			"projected_qty": projected_qty,
-		},
-		update_modified=True,
+
+def update_qty_for_bins(bin_args):
+	"""Update Bins once for all the rows posted against them
+
+	:param bin_args: dict of Bin name and list of the args of every row posted against it
+	"""
+	# a fixed order keeps concurrent vouchers from locking the same Bins in opposite orders
+	for bin_name in sorted(bin_args):
+		rows = bin_args[bin_name]
+
+		args = frappe._dict(rows[-1])
+		for field in BIN_QTY_DELTA_FIELDS:
+			args[field] = sum(flt(row.get(field)) for row in rows)
+
+		update_qty(bin_name, args)
+
+
+def get_last_sle_qty(item_code, warehouse):
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	last_sle_qty = (
+		frappe.qb.from_(sle)
+		.select(sle.qty_after_transaction)
+		.where((sle.item_code == item_code) & (sle.warehouse == warehouse) & (sle.is_cancelled == 0))
+		.orderby(CombineDatetime(sle.posting_date, sle.posting_time), order=Order.desc)
+		.orderby(sle.creation, order=Order.desc)
+		.limit(1)
+		.run()
 	)
+
+	return flt(last_sle_qty[0][0]) if last_sle_qty else 0.0
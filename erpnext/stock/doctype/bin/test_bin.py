@@ -4,8 +4,11 @@
 import frappe
 from frappe.tests.utils import FrappeTestCase
 
+from erpnext.stock.doctype.bin.bin import update_qty
 from erpnext.stock.doctype.item.test_item import make_item
-from erpnext.stock.utils import _create_bin
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.stock_balance import reconcile_bins, update_bin_qty
+from erpnext.stock.utils import _create_bin, get_or_make_bin
 
 
 class TestBin(FrappeTestCase):
@@ -32,3 +35,50 @@ class TestBin(FrappeTestCase):
 		indexes = frappe.db.sql("show index from tabBin where Non_unique = 0", as_dict=1)
 		if not any(index.get("Key_name") == "unique_item_warehouse" for index in indexes):
 			self.fail("Expected unique index on item-warehouse")
+
+	def test_delta_qty_update(self):
+		item_code = make_item("_TestBinDeltaItem", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		bin_name = get_or_make_bin(item_code, warehouse)
+
+		update_bin_qty(item_code, warehouse, {"reserved_qty": 4})
+		update_qty(bin_name, frappe._dict(item_code=item_code, warehouse=warehouse, ordered_qty=10))
+		update_qty(bin_name, frappe._dict(item_code=item_code, warehouse=warehouse, ordered_qty=-3))
+
+		bin = frappe.get_doc("Bin", bin_name)
+		self.assertEqual(bin.ordered_qty, 7)
+		self.assertEqual(bin.reserved_qty, 4)
+		self.assertEqual(bin.projected_qty, 3)
+
+	def test_bin_updated_once_for_voucher(self):
+		item_code = make_item("_TestBinVoucherItem", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=5, rate=10, do_not_save=True)
+		row = se.items[0].as_dict()
+		row.update({"name": None, "idx": None, "qty": 7})
+		se.append("items", row)
+		se.submit()
+
+		bin = frappe.get_doc("Bin", get_or_make_bin(item_code, warehouse))
+		self.assertEqual(bin.actual_qty, 12)
+		self.assertEqual(bin.projected_qty, 12)
+
+	def test_reconcile_bins(self):
+		item_code = make_item("_TestBinReconcileItem", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=10, rate=10)
+
+		bin_name = get_or_make_bin(item_code, warehouse)
+		frappe.db.set_value("Bin", bin_name, {"actual_qty": 3, "reserved_qty": 2, "projected_qty": 1})
+
+		mismatches = [d for d in reconcile_bins() if d.bin == bin_name]
+		self.assertEqual(len(mismatches), 1)
+		self.assertEqual(mismatches[0].expected, {"actual_qty": 10, "reserved_qty": 0})
+
+		bin = frappe.get_doc("Bin", bin_name)
+		self.assertEqual(bin.actual_qty, 10)
+		self.assertEqual(bin.reserved_qty, 0)
+		self.assertEqual(bin.projected_qty, 10)
+
+		self.assertFalse([d for d in reconcile_bins() if d.bin == bin_name])
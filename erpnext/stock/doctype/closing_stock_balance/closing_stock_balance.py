@@ -8,9 +8,11 @@ from frappe import _
 from frappe.core.doctype.prepared_report.prepared_report import create_json_gz_file
 from frappe.desk.form.load import get_attachments
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form, parse_json
+from frappe.query_builder.functions import Coalesce, Max, Min
+from frappe.utils import add_days, get_first_day, get_last_day, get_link_to_form, getdate, nowdate, parse_json
 from frappe.utils.background_jobs import enqueue
 
+from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
 from erpnext.stock.report.stock_balance.stock_balance import execute
 
 
@@ -27,6 +29,7 @@ class ClosingStockBalance(Document):
 		company: DF.Link | None
 		from_date: DF.Date | None
 		include_uom: DF.Link | None
+		is_system_generated: DF.Check
 		item_code: DF.Link | None
 		item_group: DF.Link | None
 		naming_series: DF.Literal["CBAL-.#####"]
@@ -71,9 +74,10 @@ class ClosingStockBalance(Document):
 		)
 
 		for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]:
-			if self.get(fieldname):
-				query = query.where(table[fieldname] == self.get(fieldname))
+			query = query.where(Coalesce(table[fieldname], "") == (self.get(fieldname) or ""))
 
+		# system generated balances are kept independently of the ones created by users
+		query = query.where(table.is_system_generated == self.is_system_generated)
 		query = query.run(as_dict=True)
 
 		if query and query[0].name:
@@ -83,7 +87,10 @@ class ClosingStockBalance(Document):
 
 	def on_submit(self):
 		self.set_status(save=True)
-		self.enqueue_job()
+
+		# system generated balances are prepared by the scheduler, one after the other
+		if not self.is_system_generated:
+			self.enqueue_job()
 
 	def on_cancel(self):
 		self.set_status(save=True)
@@ -116,16 +123,25 @@ class ClosingStockBalance(Document):
 					"item_group": self.item_group,
 					"warehouse_type": self.warehouse_type,
 					"include_uom": self.include_uom,
-					"ignore_closing_balance": 1,
 					"show_variant_attributes": 1,
 					"show_stock_ageing_data": 1,
+					"group_by_inventory_dimensions": 1,
 				}
 			)
 		)
 
-		create_json_gz_file(
-			{"columns": columns, "data": data}, self.doctype, self.name, "closing-stock-balance"
-		)
+		prepared_data = {"columns": columns, "data": data, "group_by_inventory_dimensions": 1}
+		if not any(
+			self.get(fieldname) for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]
+		):
+			# stock ageing replays the stock ledger from the FIFO slots of the whole company
+			fifo_slots = FIFOSlots(
+				frappe._dict(company=self.company, to_date=self.to_date, show_warehouse_wise_stock=True)
+			)
+			fifo_slots.generate()
+			prepared_data["fifo_slots"] = fifo_slots.get_checkpoint()
+
+		create_json_gz_file(prepared_data, self.doctype, self.name, "closing-stock-balance")
 
 	def get_prepared_data(self):
 		if attachments := get_attachments(self.doctype, self.name):
@@ -145,10 +161,167 @@ def prepare_closing_stock_balance(name):
 	doc = frappe.get_doc("Closing Stock Balance", name)
 
 	doc.db_set("status", "In Progress")
+	doc.clear_attachment()
+	# entries posted from here on can queue the balance again, see invalidate_closing_stock_balances
+	commit()
 
 	try:
 		doc.create_closing_stock_balance_entries()
-		doc.db_set("status", "Completed")
+		set_status_if_in_progress(doc.name, "Completed")
 	except Exception:
-		doc.db_set("status", "Failed")
+		set_status_if_in_progress(doc.name, "Failed")
 		doc.log_error(title="Closing Stock Balance Failed")
+
+
+def set_status_if_in_progress(name, status):
+	"""Balances invalidated while being prepared stay queued to be prepared again"""
+	table = frappe.qb.DocType("Closing Stock Balance")
+	frappe.qb.update(table).set(table.status, status).where(
+		(table.name == name) & (table.status == "In Progress")
+	).run()
+
+
+def create_closing_stock_balances():
+	"""Keep a monthly Closing Stock Balance of every company for stock reports to start from
+
+	Each month is prepared from the balance of the previous month and the stock ledger entries of
+	the month itself. Balances invalidated by backdated entries are prepared again first.
+	"""
+	for company in frappe.get_all("Company", pluck="name"):
+		if has_pending_reposts(company):
+			# the stock ledger is prepared again after reposting
+			continue
+
+		for name in get_invalidated_closing_balances(company):
+			prepare_closing_stock_balance(name)
+			commit()
+
+		for from_date, to_date in get_periods_without_closing_balance(company):
+			doc = frappe.get_doc(
+				{
+					"doctype": "Closing Stock Balance",
+					"company": company,
+					"from_date": from_date,
+					"to_date": to_date,
+					"is_system_generated": 1,
+				}
+			)
+			doc.flags.ignore_permissions = True
+			doc.submit()
+
+			prepare_closing_stock_balance(doc.name)
+			commit()
+
+
+def commit():
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+
+def has_pending_reposts(company):
+	return frappe.db.exists(
+		"Repost Item Valuation",
+		{"company": company, "docstatus": 1, "status": ("in", ["Queued", "In Progress"])},
+	)
+
+
+def get_invalidated_closing_balances(company):
+	return frappe.get_all(
+		"Closing Stock Balance",
+		filters={
+			"company": company,
+			"docstatus": 1,
+			"is_system_generated": 1,
+			"status": ("in", ["Queued", "Failed"]),
+		},
+		order_by="to_date",
+		pluck="name",
+	)
+
+
+def get_periods_without_closing_balance(company):
+	"""Returns the months, up to the last one, which have no system generated Closing Stock Balance"""
+	table = frappe.qb.DocType("Closing Stock Balance")
+	last_to_date = (
+		frappe.qb.from_(table)
+		.select(Max(table.to_date))
+		.where((table.company == company) & (table.docstatus == 1) & (table.is_system_generated == 1))
+	).run()[0][0]
+
+	if last_to_date:
+		from_date = add_days(last_to_date, 1)
+	else:
+		sle = frappe.qb.DocType("Stock Ledger Entry")
+		first_posting_date = (
+			frappe.qb.from_(sle)
+			.select(Min(sle.posting_date))
+			.where((sle.company == company) & (sle.is_cancelled == 0))
+		).run()[0][0]
+
+		if not first_posting_date:
+			return []
+
+		from_date = get_first_day(first_posting_date)
+
+	periods = []
+	last_closed_date = add_days(get_first_day(nowdate()), -1)
+	while getdate(from_date) <= getdate(last_closed_date):
+		to_date = get_last_day(from_date)
+		periods.append((getdate(from_date), to_date))
+		from_date = add_days(to_date, 1)
+
+	return periods
+
+
+def invalidate_closing_stock_balances(company, posting_date):
+	"""Queue the system generated balances of the month of `posting_date` and after to be prepared again"""
+	names = frappe.get_all(
+		"Closing Stock Balance",
+		filters={
+			"company": company,
+			"docstatus": 1,
+			"is_system_generated": 1,
+			"status": ("in", ["In Progress", "Completed"]),
+			"to_date": (">=", posting_date),
+		},
+		pluck="name",
+	)
+
+	if names:
+		table = frappe.qb.DocType("Closing Stock Balance")
+		frappe.qb.update(table).set(table.status, "Queued").where(table.name.isin(names)).run()
+
+
+def get_latest_closing_stock_balance(company, before_date=None):
+	"""Returns the prepared data of the latest completed Closing Stock Balance of the whole company
+
+	:param before_date: only consider balances which end before this date
+	"""
+	table = frappe.qb.DocType("Closing Stock Balance")
+	query = (
+		frappe.qb.from_(table)
+		.select(table.name, table.to_date)
+		.where((table.docstatus == 1) & (table.company == company) & (table.status == "Completed"))
+		.orderby(table.to_date, order=frappe.qb.desc)
+		.limit(1)
+	)
+
+	if before_date:
+		query = query.where(table.to_date < before_date)
+
+	for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]:
+		query = query.where(Coalesce(table[fieldname], "") == "")
+
+	closing_balance = query.run(as_dict=True)
+	if not closing_balance:
+		return
+
+	prepared_data = frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_prepared_data()
+	if "data" not in prepared_data:
+		return
+
+	return frappe._dict(
+		to_date=closing_balance[0].to_date,
+		data=prepared_data.data,
+		fifo_slots=prepared_data.get("fifo_slots"),
+	)
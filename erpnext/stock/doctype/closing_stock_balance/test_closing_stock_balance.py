@@ -1,9 +1,109 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_months, get_first_day, get_last_day, getdate, nowdate
+
+from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+	create_closing_stock_balances,
+	set_status_if_in_progress,
+)
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.report.stock_ageing.stock_ageing import FIFOSlots
+from erpnext.stock.report.stock_balance.stock_balance import execute
 
 
 class TestClosingStockBalance(FrappeTestCase):
-	pass
+	def test_system_generated_closing_stock_balance(self):
+		item_code = make_item("_Test Closing Balance Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		last_month = add_months(get_first_day(nowdate()), -1)
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(last_month, 2),
+		)
+		create_closing_stock_balances()
+
+		closing_balance = frappe.db.get_value(
+			"Closing Stock Balance",
+			{"company": "_Test Company", "is_system_generated": 1, "to_date": get_last_day(last_month)},
+			["name", "status"],
+			as_dict=True,
+		)
+		self.assertEqual(closing_balance.status, "Completed")
+
+		make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=5, rate=100)
+		self.assertEqual(get_balance(item_code), (15, 1500))
+
+		# backdated entries queue the closing balance to be prepared again
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=3, rate=100, posting_date=add_days(last_month, 5)
+		)
+		self.assertEqual(
+			frappe.db.get_value("Closing Stock Balance", closing_balance.name, "status"), "Queued"
+		)
+		self.assertEqual(get_balance(item_code), (18, 1800))
+
+		create_closing_stock_balances()
+		self.assertEqual(
+			frappe.db.get_value("Closing Stock Balance", closing_balance.name, "status"), "Completed"
+		)
+		self.assertEqual(get_balance(item_code), (18, 1800))
+
+		# a balance invalidated while it is being prepared is not marked completed
+		frappe.db.set_value("Closing Stock Balance", closing_balance.name, "status", "In Progress")
+		make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=2, rate=100, posting_date=add_days(last_month, 6)
+		)
+		set_status_if_in_progress(closing_balance.name, "Completed")
+		self.assertEqual(
+			frappe.db.get_value("Closing Stock Balance", closing_balance.name, "status"), "Queued"
+		)
+
+	def test_stock_ageing_from_fifo_slots_checkpoint(self):
+		item_code = make_item("_Test Ageing Checkpoint Item", {"is_stock_item": 1}).name
+		warehouse = "_Test Warehouse - _TC"
+		last_month = add_months(get_first_day(nowdate()), -1)
+
+		make_stock_entry(
+			item_code=item_code,
+			to_warehouse=warehouse,
+			qty=10,
+			rate=100,
+			posting_date=add_days(last_month, 2),
+		)
+		make_stock_entry(
+			item_code=item_code, from_warehouse=warehouse, qty=4, posting_date=add_days(last_month, 3)
+		)
+		make_stock_entry(item_code=item_code, to_warehouse=warehouse, qty=6, rate=100)
+
+		filters = frappe._dict(
+			company="_Test Company", to_date=nowdate(), item_code=item_code, show_warehouse_wise_stock=True
+		)
+		expected = get_fifo_slots(FIFOSlots(filters).generate())
+
+		create_closing_stock_balances()
+		fifo_slots = FIFOSlots(filters)
+		slots = get_fifo_slots(fifo_slots.generate())
+
+		self.assertEqual(fifo_slots.checkpoint_date, get_last_day(last_month))
+		self.assertEqual(slots, expected)
+		self.assertEqual(slots[(item_code, warehouse)][0], [[6, add_days(last_month, 2)], [6, getdate()]])
+
+
+def get_fifo_slots(item_details):
+	return {key: (row["fifo_queue"], row["total_qty"]) for key, row in item_details.items()}
+
+
+def get_balance(item_code):
+	_columns, data = execute(
+		frappe._dict(company="_Test Company", from_date=nowdate(), to_date=nowdate(), item_code=item_code)
+	)
+
+	return data[0].bal_qty, data[0].bal_val
@@ -979,6 +979,32 @@ class TestDeliveryNote(FrappeTestCase):
 		self.assertEqual(dn2.per_billed, 100)
 		self.assertEqual(dn2.status, "Completed")
 
+	def test_delivered_qty_for_multiple_so_items(self):
+		from erpnext.selling.doctype.sales_order.sales_order import make_delivery_note
+
+		frappe.db.set_single_value("Stock Settings", "allow_negative_stock", 1)
+
+		item_list = [
+			{"item_code": item_code, "warehouse": "_Test Warehouse - _TC", "qty": 10, "rate": 100}
+			for item_code in ("_Test Item", "_Test Item Home Desktop 100", "_Test Item Home Desktop 200")
+		]
+		so = make_sales_order(item_list=item_list)
+
+		dn = make_delivery_note(so.name)
+		dn.items[0].qty = 4
+		dn.items[1].qty = 10
+		dn.remove(dn.items[2])
+		dn.submit()
+
+		so.load_from_db()
+		self.assertEqual([d.delivered_qty for d in so.items], [4, 10, 0])
+		self.assertEqual(flt(so.per_delivered, 2), 46.67)
+
+		dn.cancel()
+		so.load_from_db()
+		self.assertEqual([d.delivered_qty for d in so.items], [0, 0, 0])
+		self.assertEqual(so.per_delivered, 0)
+
 	def test_dn_billing_status_case3(self):
 		# SO -> DN1 -> SI and SO -> SI and SO -> DN2
 		from erpnext.selling.doctype.sales_order.sales_order import make_delivery_note
@@ -220,6 +220,24 @@ class Item(Document):
 	def on_update(self):
 		self.update_variants()
 		self.update_item_price()
+		self.clear_bom_explosion_cache()
+
+	def clear_bom_explosion_cache(self):
+		"""The explosions of BOMs depend on whether their items are stocked and planned through a BOM"""
+		if self.flags.in_insert or not any(
+			self.has_value_changed(fieldname)
+			for fieldname in (
+				"is_stock_item",
+				"default_bom",
+				"default_material_request_type",
+				"is_sub_contracted_item",
+			)
+		):
+			return
+
+		from erpnext.manufacturing.doctype.bom.bom_explosion import clear_all_bom_explosions
+
+		clear_all_bom_explosions()
 
 	def validate_description(self):
 		"""Clean HTML description if set"""
@@ -536,6 +554,13 @@ class Item(Document):
 
 	def on_trash(self):
 		frappe.db.sql("""delete from tabBin where item_code=%s""", self.name)
+		from erpnext.stock.get_item_details import clear_item_price_cache
+
+		for price_list in frappe.get_all(
+			"Item Price", filters={"item_code": self.name}, pluck="price_list", distinct=True
+		):
+			clear_item_price_cache(self.name, price_list)
+
 		frappe.db.sql("delete from `tabItem Price` where item_code=%s", self.name)
 		for variant_of in frappe.get_all("Item", filters={"variant_of": self.name}):
 			frappe.delete_doc("Item", variant_of.name)
@@ -550,6 +575,8 @@ class Item(Document):
 			self.delete_old_bins(old_name)
 
 	def after_rename(self, old_name, new_name, merge):
+		from erpnext.stock.get_item_details import clear_item_price_cache
+
 		if merge:
 			self.validate_duplicate_item_in_stock_reconciliation(old_name, new_name)
 			frappe.msgprint(
@@ -559,6 +586,15 @@ class Item(Document):
 			)
 
 		frappe.db.set_value("Item", new_name, "item_code", new_name)
+		for price_list in frappe.get_all(
+			"Item Price", filters={"item_code": new_name}, pluck="price_list", distinct=True
+		):
+			clear_item_price_cache(old_name, price_list)
+			clear_item_price_cache(new_name, price_list)
+
+		from erpnext.manufacturing.doctype.bom.bom_explosion import clear_all_bom_explosions
+
+		clear_all_bom_explosions()
 
 		if merge:
 			self.set_last_purchase_rate(new_name)
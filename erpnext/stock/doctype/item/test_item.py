@@ -26,7 +26,7 @@ from erpnext.stock.doctype.item.item import (
 	validate_is_stock_item,
 )
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
-from erpnext.stock.get_item_details import get_item_details
+from erpnext.stock.get_item_details import get_item_details, get_items_details
 
 test_ignore = ["BOM"]
 test_dependencies = ["Warehouse", "Item Group", "Item Tax Template", "Brand", "Item Attribute"]
@@ -156,6 +156,27 @@ class TestItem(FrappeTestCase):
 		for key, value in to_check.items():
 			self.assertEqual(value, details.get(key), key)
 
+	def test_get_items_details(self):
+		company = "_Test Company"
+		currency = frappe.get_cached_value("Company", company, "default_currency")
+		args = {
+			"company": company,
+			"price_list": "_Test Price List",
+			"currency": currency,
+			"doctype": "Sales Order",
+			"conversion_rate": 1,
+			"price_list_currency": currency,
+			"plc_conversion_rate": 1,
+			"order_type": "Sales",
+			"customer": "_Test Customer",
+			"conversion_factor": 1,
+			"ignore_pricing_rule": 1,
+		}
+		rows = [dict(args, item_code=item_code) for item_code in ("_Test Item", "_Test Item 2", "_Test Item")]
+
+		expected = [get_item_details(row) for row in rows]
+		self.assertEqual(get_items_details(rows), expected)
+
 	def test_get_asset_item_details(self):
 		from erpnext.assets.doctype.asset.test_asset import create_asset_category, create_fixed_asset_item
 
@@ -8,6 +8,8 @@ from frappe.model.document import Document
 from frappe.query_builder import Criterion
 from frappe.query_builder.functions import Cast_
 
+from erpnext.stock.get_item_details import clear_item_price_cache
+
 
 class ItemPriceDuplicateItem(frappe.ValidationError):
 	pass
@@ -155,3 +157,12 @@ class ItemPrice(Document):
 		if self.buying and not self.selling:
 			# if only buying then remove customer
 			self.customer = None
+
+	def on_update(self):
+		clear_item_price_cache(self.item_code, self.price_list)
+
+		if previous := self.get_doc_before_save():
+			clear_item_price_cache(previous.item_code, previous.price_list)
+
+	def on_trash(self):
+		clear_item_price_cache(self.item_code, self.price_list)
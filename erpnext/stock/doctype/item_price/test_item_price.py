@@ -152,6 +152,23 @@ class TestItemPrice(FrappeTestCase):
 		price = get_price_list_rate_for(args, doc.item_code)
 		self.assertEqual(price, 10)
 
+	def test_cached_price_is_cleared_on_update(self):
+		doc = frappe.copy_doc(test_records[1])
+		args = {
+			"price_list": doc.price_list,
+			"uom": "_Test UOM",
+			"qty": 7,
+		}
+		self.assertEqual(get_price_list_rate_for(args, doc.item_code), 10)
+
+		item_price = frappe.get_doc(
+			"Item Price", {"item_code": doc.item_code, "price_list": doc.price_list, "price_list_rate": 10}
+		)
+		item_price.price_list_rate = 5
+		item_price.save()
+
+		self.assertEqual(get_price_list_rate_for(args, doc.item_code), 5)
+
 	def test_invalid_item(self):
 		doc = frappe.copy_doc(test_records[1])
 		# Enter invalid item code
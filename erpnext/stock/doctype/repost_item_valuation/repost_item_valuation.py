@@ -16,13 +16,19 @@ import erpnext
 from erpnext.accounts.general_ledger import validate_accounting_period
 from erpnext.accounts.utils import get_future_stock_vouchers, repost_gle_for_stock_vouchers
 from erpnext.stock.stock_ledger import (
+	ItemWarehouseGraph,
 	get_affected_transactions,
 	get_items_to_be_repost,
 	repost_future_sle,
 )
+from erpnext.stock.utils import get_combine_datetime
 
 RecoverableErrors = (JobTimeoutException, QueryDeadlockError, QueryTimeoutError)
 
+PARALLEL_REPOSTING_RUN_KEY = "parallel_reposting_run"
+DEFAULT_PARALLEL_REPOSTING_JOBS = 4
+PARALLEL_REPOSTING_TIMEOUT = 6 * 60 * 60
+
 
 class RepostItemValuation(Document):
 	# begin: auto-generated types
@@ -110,6 +116,7 @@ class RepostItemValuation(Document):
 			"company": self.company,
 			"status": "Completed",
 			"docstatus": 1,
+			"is_system_generated": 0,
 			"to_date": (">=", self.posting_date),
 		}
 
@@ -196,6 +203,11 @@ class RepostItemValuation(Document):
 
 		        These flags are useful for asserting real time behaviour like quantity updates.
 		"""
+		from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+			invalidate_closing_stock_balances,
+		)
+
+		invalidate_closing_stock_balances(self.company, self.posting_date)
 
 		if not frappe.flags.in_test:
 			return
@@ -257,11 +269,17 @@ def on_doctype_update():
 	frappe.db.add_index("Repost Item Valuation", ["warehouse", "item_code"], "item_warehouse")
 
 
-def repost(doc):
+def repost(doc, repost_gl=True):
+	"""Repost stock ledger and GL entries of the document.
+
+	When `repost_gl` is False only the stock ledger is reposted and the document is left
+	"In Progress", GL entries are then reposted by the coordinator of the parallel run.
+	Returns True if reposting was successful."""
+
 	try:
 		frappe.flags.through_repost_item_valuation = True
 		if not frappe.db.exists("Repost Item Valuation", doc.name):
-			return
+			return False
 
 		# This is to avoid TooManyWritesError in case of large reposts
 		frappe.db.MAX_WRITES_PER_TRANSACTION *= 4
@@ -271,10 +289,14 @@ def repost(doc):
 			frappe.db.commit()
 
 		repost_sl_entries(doc)
+		if not repost_gl:
+			return True
+
 		repost_gl_entries(doc)
 
 		doc.set_status("Completed")
 		remove_attached_file(doc.name)
+		return True
 
 	except Exception as e:
 		if frappe.flags.in_test:
@@ -283,35 +305,40 @@ def repost(doc):
 			raise
 
 		frappe.db.rollback()
-		traceback = frappe.get_traceback(with_context=True)
-		doc.log_error("Unable to repost item valuation")
+		handle_reposting_error(doc, e)
+		return False
+	finally:
+		if not frappe.flags.in_test:
+			frappe.db.commit()
 
-		message = frappe.message_log.pop() if frappe.message_log else ""
-		if isinstance(message, dict):
-			message = message.get("message")
 
-		if traceback:
-			message += "<br><br>" + "<b>Traceback:</b> <br>" + traceback
+def handle_reposting_error(doc, exception):
+	traceback = frappe.get_traceback(with_context=True)
+	doc.log_error("Unable to repost item valuation")
 
-		frappe.db.set_value(
-			doc.doctype,
-			doc.name,
-			{
-				"error_log": message,
-				"status": "Failed",
-			},
-		)
+	message = frappe.message_log.pop() if frappe.message_log else ""
+	if isinstance(message, dict):
+		message = message.get("message")
 
-		outgoing_email_account = frappe.get_cached_value(
-			"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
-		)
+	if traceback:
+		message += "<br><br>" + "<b>Traceback:</b> <br>" + traceback
 
-		if outgoing_email_account and not isinstance(e, RecoverableErrors):
-			notify_error_to_stock_managers(doc, message)
-			doc.set_status("Failed")
-	finally:
-		if not frappe.flags.in_test:
-			frappe.db.commit()
+	frappe.db.set_value(
+		doc.doctype,
+		doc.name,
+		{
+			"error_log": message,
+			"status": "Failed",
+		},
+	)
+
+	outgoing_email_account = frappe.get_cached_value(
+		"Email Account", {"default_outgoing": 1, "enable_outgoing": 1}, "name"
+	)
+
+	if outgoing_email_account and not isinstance(exception, RecoverableErrors):
+		notify_error_to_stock_managers(doc, message)
+		doc.set_status("Failed")
 
 
 def remove_attached_file(docname):
@@ -434,6 +461,11 @@ def repost_entries():
 
 	riv_entries = get_repost_item_valuation_entries()
 
+	repost_settings = frappe.get_cached_doc("Stock Reposting Settings")
+	if repost_settings.enable_parallel_reposting and len(riv_entries) > 1:
+		repost_entries_in_parallel(riv_entries, cint(repost_settings.no_of_parallel_reposting_jobs))
+		return
+
 	for row in riv_entries:
 		doc = frappe.get_doc("Repost Item Valuation", row.name)
 		if doc.status in ("Queued", "In Progress"):
@@ -445,6 +477,198 @@ def repost_entries():
 		return
 
 
+def repost_entries_in_parallel(riv_entries, no_of_jobs=None):
+	"""
+	Start a parallel reposting run.
+
+	Queued entries are split into partitions of item-warehouses which do not depend on each other,
+	partitions are distributed over `no_of_jobs` background jobs which repost the stock ledger.
+	The job finishing last enqueues the reposting of the GL entries of all the affected transactions,
+	once per company.
+	"""
+
+	if is_parallel_reposting_running():
+		return
+
+	docs = [frappe.get_doc("Repost Item Valuation", row.name) for row in riv_entries]
+	docs = [doc for doc in docs if doc.status in ("Queued", "In Progress")]
+	if not docs:
+		return
+
+	run_id = frappe.generate_hash(length=10)
+	jobs = get_reposting_jobs(docs, no_of_jobs or DEFAULT_PARALLEL_REPOSTING_JOBS)
+	frappe.cache.set_value(
+		PARALLEL_REPOSTING_RUN_KEY,
+		{"run_id": run_id, "no_of_jobs": len(jobs)},
+		expires_in_sec=PARALLEL_REPOSTING_TIMEOUT,
+	)
+
+	for idx, riv_names in enumerate(jobs):
+		frappe.enqueue(
+			repost_partition,
+			queue="long",
+			timeout=PARALLEL_REPOSTING_TIMEOUT,
+			job_id=f"{run_id}::{idx}",
+			now=frappe.flags.in_test,
+			run_id=run_id,
+			job_idx=idx,
+			no_of_jobs=len(jobs),
+			riv_names=riv_names,
+		)
+
+
+def is_parallel_reposting_running():
+	# the run is cleared once its GL entries are reposted, or expires if a job never finishes
+	return bool(frappe.cache.get_value(PARALLEL_REPOSTING_RUN_KEY))
+
+
+def get_reposting_jobs(docs, no_of_jobs):
+	"""Returns list of entry names per job, entries of one partition are always in the same job
+	and keep the order of the reposting queue."""
+
+	graph = ItemWarehouseGraph()
+	doc_keys = {}
+	for doc in docs:
+		rows = [
+			(
+				row.get("item_code"),
+				row.get("warehouse"),
+				get_combine_datetime(row.get("posting_date"), row.get("posting_time")),
+			)
+			for row in get_items_to_be_repost_for_doc(doc)
+		]
+
+		graph.add_group(rows)
+		doc_keys[doc.name] = (rows[0][0], rows[0][1]) if rows else None
+
+	graph.build()
+	partitions = graph.get_partitions()
+
+	partition_wise_docs = {}
+	for doc in docs:
+		root = graph.find(doc_keys[doc.name]) if doc_keys[doc.name] else doc.name
+		partition_wise_docs.setdefault(root, []).append(doc.name)
+
+	# assign largest partitions first to the least loaded job
+	jobs = [[] for _i in range(min(max(no_of_jobs, 1), len(partition_wise_docs)))]
+	job_load = [0] * len(jobs)
+	for root, names in sorted(
+		partition_wise_docs.items(), key=lambda d: len(partitions.get(d[0], [])) + len(d[1]), reverse=True
+	):
+		idx = job_load.index(min(job_load))
+		jobs[idx].extend(names)
+		job_load[idx] += len(partitions.get(root, [])) + len(names)
+
+	queue_position = {doc.name: idx for idx, doc in enumerate(docs)}
+	return [sorted(names, key=queue_position.get) for names in jobs if names]
+
+
+def get_items_to_be_repost_for_doc(doc):
+	if doc.based_on == "Transaction":
+		return get_items_to_be_repost(doc.voucher_type, doc.voucher_no, doc=doc)
+
+	return [
+		frappe._dict(
+			{
+				"item_code": doc.item_code,
+				"warehouse": doc.warehouse,
+				"posting_date": doc.posting_date,
+				"posting_time": doc.posting_time,
+			}
+		)
+	]
+
+
+def repost_partition(run_id, job_idx, no_of_jobs, riv_names):
+	"""Repost stock ledger of the entries of one job in queue order, the last job to finish
+	enqueues the reposting of GL entries."""
+
+	claim_key = frappe.cache.make_key(f"{PARALLEL_REPOSTING_RUN_KEY}:{run_id}:{job_idx}")
+	if not frappe.cache.set(claim_key, 1, nx=True, ex=PARALLEL_REPOSTING_TIMEOUT):
+		# already picked up by another worker
+		return
+
+	reposted_entries = []
+	try:
+		for name in riv_names:
+			doc = frappe.get_doc("Repost Item Valuation", name)
+			if doc.status not in ("Queued", "In Progress"):
+				continue
+
+			if repost(doc, repost_gl=False):
+				reposted_entries.append(name)
+				doc.deduplicate_similar_repost()
+	finally:
+		frappe.cache.hset(f"{PARALLEL_REPOSTING_RUN_KEY}:{run_id}", str(job_idx), reposted_entries)
+
+		finished_jobs_key = frappe.cache.make_key(f"{PARALLEL_REPOSTING_RUN_KEY}:{run_id}:finished")
+		finished_jobs = frappe.cache.incr(finished_jobs_key)
+		frappe.cache.expire(finished_jobs_key, PARALLEL_REPOSTING_TIMEOUT)
+		if finished_jobs == no_of_jobs:
+			frappe.cache.delete(finished_jobs_key)
+			frappe.enqueue(
+				repost_gl_entries_of_run,
+				queue="long",
+				timeout=PARALLEL_REPOSTING_TIMEOUT,
+				job_id=f"{run_id}::gl",
+				now=frappe.flags.in_test,
+				run_id=run_id,
+			)
+
+
+def repost_gl_entries_of_run(run_id):
+	"""Repost GL entries of the entries reposted by all the jobs of the run and end the run."""
+
+	results = frappe.cache.hgetall(f"{PARALLEL_REPOSTING_RUN_KEY}:{run_id}") or {}
+	reposted_entries = [name for names in results.values() for name in names]
+
+	try:
+		repost_gl_entries_in_bulk(
+			[frappe.get_doc("Repost Item Valuation", name) for name in reposted_entries]
+		)
+	finally:
+		frappe.cache.delete_value(f"{PARALLEL_REPOSTING_RUN_KEY}:{run_id}")
+		frappe.cache.delete_value(PARALLEL_REPOSTING_RUN_KEY)
+
+
+def repost_gl_entries_in_bulk(docs):
+	"""Repost GL entries of all the affected transactions of the entries once per company."""
+
+	company_wise_docs = {}
+	for doc in docs:
+		doc.reload()
+		company_wise_docs.setdefault(doc.company, []).append(doc)
+
+	for company, company_docs in company_wise_docs.items():
+		try:
+			if cint(erpnext.is_perpetual_inventory_enabled(company)):
+				affected_transactions = set()
+				for doc in company_docs:
+					affected_transactions.update(_get_directly_dependent_vouchers(doc))
+					affected_transactions.update(get_affected_transactions(doc))
+
+				repost_gle_for_stock_vouchers(
+					list(affected_transactions),
+					min(getdate(doc.posting_date) for doc in company_docs),
+					company,
+				)
+
+			for doc in company_docs:
+				doc.set_status("Completed")
+				remove_attached_file(doc.name)
+
+		except Exception as e:
+			if frappe.flags.in_test:
+				raise
+
+			frappe.db.rollback()
+			for doc in company_docs:
+				handle_reposting_error(doc, e)
+		finally:
+			if not frappe.flags.in_test:
+				frappe.db.commit()
+
+
 def get_repost_item_valuation_entries():
 	return frappe.db.sql(
 		""" SELECT name from `tabRepost Item Valuation`
@@ -454,3 +454,66 @@ class TestRepostItemValuation(FrappeTestCase, StockTestMixin):
 						"name",
 					)
 				)
+
+	def test_parallel_reposting_partitions(self):
+		from erpnext.stock.doctype.repost_item_valuation.repost_item_valuation import (
+			PARALLEL_REPOSTING_RUN_KEY,
+			get_reposting_jobs,
+			is_parallel_reposting_running,
+			repost_entries_in_parallel,
+		)
+
+		item1 = make_item(properties={"is_stock_item": 1}).name
+		item2 = make_item(properties={"is_stock_item": 1}).name
+
+		for item_code in (item1, item2):
+			make_stock_entry(
+				item_code=item_code,
+				target="Stores - _TC",
+				qty=10,
+				rate=100,
+				posting_date=add_days(today(), -5),
+			)
+
+		# transfer makes item1 in "_Test Warehouse - _TC" dependent on item1 in "Stores - _TC"
+		make_stock_entry(
+			item_code=item1,
+			source="Stores - _TC",
+			target="_Test Warehouse - _TC",
+			qty=5,
+			posting_date=add_days(today(), -2),
+		)
+
+		rivs = []
+		for item_code, warehouse in (
+			(item1, "Stores - _TC"),
+			(item2, "Stores - _TC"),
+			(item1, "_Test Warehouse - _TC"),
+		):
+			riv = frappe.get_doc(
+				doctype="Repost Item Valuation",
+				item_code=item_code,
+				warehouse=warehouse,
+				based_on="Item and Warehouse",
+				posting_date=add_days(today(), -4),
+				posting_time="00:01:00",
+			)
+			riv.flags.dont_run_in_test = True
+			riv.submit()
+			rivs.append(riv)
+
+		jobs = get_reposting_jobs(rivs, 4)
+		self.assertEqual(len(jobs), 2)
+		self.assertIn([rivs[0].name, rivs[2].name], jobs)
+		self.assertIn([rivs[1].name], jobs)
+
+		# single job keeps the order of the queue
+		self.assertEqual(get_reposting_jobs(rivs, 1), [[riv.name for riv in rivs]])
+
+		# the last partition job reposts the GL entries and ends the run
+		frappe.cache.delete_value(PARALLEL_REPOSTING_RUN_KEY)
+		repost_entries_in_parallel([frappe._dict(name=riv.name) for riv in rivs], 4)
+		for riv in rivs:
+			self.assertEqual(frappe.db.get_value("Repost Item Valuation", riv.name, "status"), "Completed")
+
+		self.assertFalse(is_parallel_reposting_running())
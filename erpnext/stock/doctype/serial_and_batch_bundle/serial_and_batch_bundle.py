@@ -8,7 +8,7 @@ from collections import Counter, defaultdict
 import frappe
 from frappe import _, _dict, bold
 from frappe.model.document import Document
-from frappe.query_builder.functions import CombineDatetime, Sum
+from frappe.query_builder.functions import Coalesce, CombineDatetime, Sum
 from frappe.utils import (
 	add_days,
 	cint,
@@ -21,6 +21,7 @@ from frappe.utils import (
 	today,
 )
 from frappe.utils.csvutils import build_csv_response
+from pypika import Order
 
 from erpnext.stock.serial_batch_bundle import (
 	BatchNoValuation,
@@ -854,6 +855,17 @@ class SerialandBatchBundle(Document):
 	def on_submit(self):
 		self.validate_batch_inventory()
 		self.validate_serial_nos_inventory()
+		self.update_serial_no_availability()
+
+	def update_serial_no_availability(self):
+		from erpnext.stock.doctype.serial_no_availability.serial_no_availability import (
+			update_serial_no_availability,
+		)
+
+		if not self.has_serial_no or self.type_of_transaction not in ["Inward", "Outward"]:
+			return
+
+		update_serial_no_availability([d.serial_no for d in self.entries if d.serial_no])
 
 	def set_purchase_document_no(self):
 		if not self.has_serial_no:
@@ -922,6 +934,7 @@ class SerialandBatchBundle(Document):
 
 	def on_cancel(self):
 		self.validate_voucher_no_docstatus()
+		self.update_serial_no_availability()
 
 	def validate_voucher_no_docstatus(self):
 		if frappe.db.get_value(self.voucher_type, self.voucher_no, "docstatus") == 1:
@@ -1448,24 +1461,10 @@ def get_available_batches_qty(available_batches):
 
 
 def get_available_serial_nos(kwargs):
-	fields = ["name as serial_no", "warehouse"]
-	if kwargs.has_batch_no:
-		fields.append("batch_no")
-
-	order_by = "creation"
-	if kwargs.based_on == "LIFO":
-		order_by = "creation desc"
-	elif kwargs.based_on == "Expiry":
-		order_by = "amc_expiry_date asc"
-
-	filters = {"item_code": kwargs.item_code}
-
 	# ignore_warehouse is used for backdated stock transactions
 	# There might be chances that the serial no not exists in the warehouse during backdated stock transactions
-	if not kwargs.get("ignore_warehouse"):
-		filters["warehouse"] = ("is", "set")
-		if kwargs.warehouse:
-			filters["warehouse"] = kwargs.warehouse
+	if kwargs.get("ignore_warehouse") and not kwargs.get("posting_date"):
+		return get_serial_nos_of_item(kwargs)
 
 	# Since SLEs are not present against Reserved Stock [POS invoices, SRE], need to ignore reserved serial nos.
 	ignore_serial_nos = get_reserved_serial_nos(kwargs)
@@ -1474,17 +1473,98 @@ def get_available_serial_nos(kwargs):
 	if kwargs.get("ignore_serial_nos"):
 		ignore_serial_nos.extend(kwargs.get("ignore_serial_nos"))
 
+	availability = frappe.qb.DocType("Serial No Availability")
+	serial_no = frappe.qb.DocType("Serial No")
+	query = (
+		frappe.qb.from_(availability)
+		.select(availability.serial_no, availability.warehouse)
+		.where(availability.item_code == kwargs.item_code)
+	)
+
+	if cint(kwargs.qty):
+		query = query.limit(cint(kwargs.qty))
+
+	if kwargs.has_batch_no:
+		query = query.select(availability.batch_no)
+
+	if kwargs.warehouse:
+		query = query.where(availability.warehouse == kwargs.warehouse)
+
 	if kwargs.get("posting_date"):
 		if kwargs.get("posting_time") is None:
 			kwargs.posting_time = nowtime()
 
-		time_based_serial_nos = get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos)
+		query = query.where(get_availability_condition(kwargs))
+
+		if kwargs.get("serial_nos"):
+			query = query.where(availability.serial_no.isin(kwargs.get("serial_nos")))
+	else:
+		query = query.where(availability.available_till.isnull())
+
+	if kwargs.based_on == "Expiry" or (kwargs.get("posting_date") and not kwargs.get("ignore_warehouse")):
+		query = query.inner_join(serial_no).on(serial_no.name == availability.serial_no)
+
+	if kwargs.get("posting_date") and not kwargs.get("ignore_warehouse"):
+		# the serial no should still be in stock, so that the future transactions remain valid
+		query = query.where(Coalesce(serial_no.warehouse, "") != "")
+		if kwargs.warehouse:
+			query = query.where(serial_no.warehouse == kwargs.warehouse)
+
+	if ignore_serial_nos:
+		query = query.where(availability.serial_no.notin(ignore_serial_nos))
 
-		if not time_based_serial_nos:
+	if kwargs.get("batches"):
+		batches = get_non_expired_batches(kwargs.get("batches"))
+		if not batches:
 			return []
 
-		filters["name"] = ("in", time_based_serial_nos)
-	elif ignore_serial_nos:
+		query = query.where(availability.batch_no.isin(batches))
+
+	if kwargs.based_on == "Expiry":
+		query = query.orderby(serial_no.amc_expiry_date)
+	else:
+		order = Order.desc if kwargs.based_on == "LIFO" else Order.asc
+		query = query.orderby(availability.available_from, order=order)
+
+	return query.orderby(availability.serial_no).run(as_dict=True)
+
+
+def get_availability_condition(kwargs):
+	"""Returns the condition on Serial No Availability for the serial nos in stock on the posting date"""
+	from erpnext.stock.utils import get_combine_datetime
+
+	availability = frappe.qb.DocType("Serial No Availability")
+	posting_datetime = get_combine_datetime(kwargs.posting_date, kwargs.posting_time)
+
+	available_till = availability.available_till.isnull() | (availability.available_till > posting_datetime)
+	condition = availability.available_from <= posting_datetime
+
+	# the entries of the voucher being validated are not considered
+	if kwargs.voucher_no:
+		available_till |= availability.outward_voucher_no == kwargs.voucher_no
+		condition &= availability.voucher_no != kwargs.voucher_no
+
+	return condition & available_till
+
+
+def get_serial_nos_of_item(kwargs):
+	fields = ["name as serial_no", "warehouse"]
+	if kwargs.has_batch_no:
+		fields.append("batch_no")
+
+	order_by = "creation"
+	if kwargs.based_on == "LIFO":
+		order_by = "creation desc"
+	elif kwargs.based_on == "Expiry":
+		order_by = "amc_expiry_date asc"
+
+	filters = {"item_code": kwargs.item_code}
+
+	ignore_serial_nos = get_reserved_serial_nos(kwargs)
+	if kwargs.get("ignore_serial_nos"):
+		ignore_serial_nos.extend(kwargs.get("ignore_serial_nos"))
+
+	if ignore_serial_nos:
 		filters["name"] = ("not in", ignore_serial_nos)
 
 	if kwargs.get("batches"):
@@ -1520,35 +1600,6 @@ def get_non_expired_batches(batches):
 	return [d.name for d in data] if data else []
 
 
-def get_serial_nos_based_on_posting_date(kwargs, ignore_serial_nos):
-	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
-
-	serial_nos = set()
-	data = get_stock_ledgers_for_serial_nos(kwargs)
-
-	for d in data:
-		if d.serial_and_batch_bundle:
-			sns = get_serial_nos_from_bundle(d.serial_and_batch_bundle, kwargs.get("serial_nos", []))
-			if d.actual_qty > 0:
-				serial_nos.update(sns)
-			else:
-				serial_nos.difference_update(sns)
-
-		elif d.serial_no:
-			sns = get_serial_nos(d.serial_no)
-			if d.actual_qty > 0:
-				serial_nos.update(sns)
-			else:
-				serial_nos.difference_update(sns)
-
-	serial_nos = list(serial_nos)
-	for serial_no in ignore_serial_nos:
-		if serial_no in serial_nos:
-			serial_nos.remove(serial_no)
-
-	return serial_nos
-
-
 def get_reserved_serial_nos(kwargs) -> list:
 	"""Returns a list of `Serial No` reserved in POS Invoice and Stock Reservation Entry."""
 
@@ -1852,53 +1903,47 @@ def update_available_batches(available_batches, *reserved_batches) -> None:
 
 
 def get_available_batches(kwargs):
-	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
-	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+	balance = frappe.qb.DocType("Batch Warehouse Balance")
 	batch_table = frappe.qb.DocType("Batch")
 
 	query = (
-		frappe.qb.from_(stock_ledger_entry)
-		.inner_join(batch_ledger)
-		.on(stock_ledger_entry.serial_and_batch_bundle == batch_ledger.parent)
+		frappe.qb.from_(balance)
 		.inner_join(batch_table)
-		.on(batch_ledger.batch_no == batch_table.name)
+		.on(balance.batch_no == batch_table.name)
 		.select(
-			batch_ledger.batch_no,
-			batch_ledger.warehouse,
-			Sum(batch_ledger.qty).as_("qty"),
+			balance.batch_no,
+			balance.warehouse,
+			balance.qty,
 		)
 		.where(batch_table.disabled == 0)
-		.where(stock_ledger_entry.is_cancelled == 0)
-		.groupby(batch_ledger.batch_no, batch_ledger.warehouse)
 	)
 
 	if not kwargs.get("for_stock_levels"):
 		query = query.where((batch_table.expiry_date >= today()) | (batch_table.expiry_date.isnull()))
 
-	if kwargs.get("posting_date"):
-		if kwargs.get("posting_time") is None:
-			kwargs.posting_time = nowtime()
-
-		timestamp_condition = CombineDatetime(
-			stock_ledger_entry.posting_date, stock_ledger_entry.posting_time
-		) <= CombineDatetime(kwargs.posting_date, kwargs.posting_time)
-
-		query = query.where(timestamp_condition)
+	# the running balance includes the entries posted after the posting date and the
+	# entries of the ignored vouchers, which are taken out of it again below
+	adjustments = get_batch_qty_adjustments(kwargs)
+	if adjustments:
+		batch_nos = list({batch_no for batch_no, _warehouse in adjustments})
+		query = query.where((balance.qty != 0) | balance.batch_no.isin(batch_nos))
+	else:
+		query = query.where(balance.qty != 0)
 
 	for field in ["warehouse", "item_code"]:
 		if not kwargs.get(field):
 			continue
 
 		if isinstance(kwargs.get(field), list):
-			query = query.where(stock_ledger_entry[field].isin(kwargs.get(field)))
+			query = query.where(balance[field].isin(kwargs.get(field)))
 		else:
-			query = query.where(stock_ledger_entry[field] == kwargs.get(field))
+			query = query.where(balance[field] == kwargs.get(field))
 
 	if kwargs.get("batch_no"):
 		if isinstance(kwargs.batch_no, list):
-			query = query.where(batch_ledger.batch_no.isin(kwargs.batch_no))
+			query = query.where(balance.batch_no.isin(kwargs.batch_no))
 		else:
-			query = query.where(batch_ledger.batch_no == kwargs.batch_no)
+			query = query.where(balance.batch_no == kwargs.batch_no)
 
 	if kwargs.based_on == "LIFO":
 		query = query.orderby(batch_table.creation, order=frappe.qb.desc)
@@ -1907,14 +1952,70 @@ def get_available_batches(kwargs):
 	else:
 		query = query.orderby(batch_table.creation)
 
-	if kwargs.get("ignore_voucher_nos"):
-		query = query.where(stock_ledger_entry.voucher_no.notin(kwargs.get("ignore_voucher_nos")))
-
 	data = query.run(as_dict=True)
+	for row in data:
+		row.qty -= adjustments.get((row.batch_no, row.warehouse), 0.0)
 
 	return data
 
 
+def get_batch_qty_adjustments(kwargs) -> dict:
+	"""
+	Returns the batch qty, by batch and warehouse, posted after the posting date or by the
+	ignored vouchers. Only these entries are read from the ledger, the rest comes from the
+	Batch Warehouse Balance.
+	"""
+	from erpnext.stock.utils import get_combine_datetime
+
+	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
+	batch_ledger = frappe.qb.DocType("Serial and Batch Entry")
+
+	condition = None
+	if kwargs.get("posting_date"):
+		if kwargs.get("posting_time") is None:
+			kwargs.posting_time = nowtime()
+
+		posting_datetime = get_combine_datetime(kwargs.posting_date, kwargs.posting_time)
+		condition = stock_ledger_entry.posting_datetime > posting_datetime
+
+	if kwargs.get("ignore_voucher_nos"):
+		voucher_condition = stock_ledger_entry.voucher_no.isin(kwargs.get("ignore_voucher_nos"))
+		condition = voucher_condition if condition is None else condition | voucher_condition
+
+	if condition is None:
+		return {}
+
+	query = (
+		frappe.qb.from_(stock_ledger_entry)
+		.inner_join(batch_ledger)
+		.on(stock_ledger_entry.serial_and_batch_bundle == batch_ledger.parent)
+		.select(
+			batch_ledger.batch_no,
+			batch_ledger.warehouse,
+			Sum(batch_ledger.qty).as_("qty"),
+		)
+		.where((stock_ledger_entry.is_cancelled == 0) & condition)
+		.groupby(batch_ledger.batch_no, batch_ledger.warehouse)
+	)
+
+	for field in ["warehouse", "item_code"]:
+		if not kwargs.get(field):
+			continue
+
+		if isinstance(kwargs.get(field), list):
+			query = query.where(stock_ledger_entry[field].isin(kwargs.get(field)))
+		else:
+			query = query.where(stock_ledger_entry[field] == kwargs.get(field))
+
+	if kwargs.get("batch_no"):
+		if isinstance(kwargs.batch_no, list):
+			query = query.where(batch_ledger.batch_no.isin(kwargs.batch_no))
+		else:
+			query = query.where(batch_ledger.batch_no == kwargs.batch_no)
+
+	return {(row.batch_no, row.warehouse): flt(row.qty) for row in query.run(as_dict=True)}
+
+
 # For work order and subcontracting
 def get_voucher_wise_serial_batch_from_bundle(**kwargs) -> dict[str, dict]:
 	data = get_ledgers_from_serial_batch_bundle(**kwargs)
@@ -2095,44 +2196,6 @@ def get_ledgers_from_serial_batch_bundle(**kwargs) -> list[frappe._dict]:
 	return query.run(as_dict=True)
 
 
-def get_stock_ledgers_for_serial_nos(kwargs):
-	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
-
-	query = (
-		frappe.qb.from_(stock_ledger_entry)
-		.select(
-			stock_ledger_entry.actual_qty,
-			stock_ledger_entry.serial_no,
-			stock_ledger_entry.serial_and_batch_bundle,
-		)
-		.where(stock_ledger_entry.is_cancelled == 0)
-	)
-
-	if kwargs.get("posting_date"):
-		if kwargs.get("posting_time") is None:
-			kwargs.posting_time = nowtime()
-
-		timestamp_condition = CombineDatetime(
-			stock_ledger_entry.posting_date, stock_ledger_entry.posting_time
-		) <= CombineDatetime(kwargs.posting_date, kwargs.posting_time)
-
-		query = query.where(timestamp_condition)
-
-	for field in ["warehouse", "item_code", "serial_no"]:
-		if not kwargs.get(field):
-			continue
-
-		if isinstance(kwargs.get(field), list):
-			query = query.where(stock_ledger_entry[field].isin(kwargs.get(field)))
-		else:
-			query = query.where(stock_ledger_entry[field] == kwargs.get(field))
-
-	if kwargs.voucher_no:
-		query = query.where(stock_ledger_entry.voucher_no != kwargs.voucher_no)
-
-	return query.run(as_dict=True)
-
-
 def get_stock_ledgers_batches(kwargs):
 	stock_ledger_entry = frappe.qb.DocType("Stock Ledger Entry")
 	batch_table = frappe.qb.DocType("Batch")
@@ -0,0 +1,224 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+from frappe.query_builder.functions import IfNull
+from frappe.utils import create_batch, now
+
+from erpnext.stock.utils import get_combine_datetime
+
+INTERVAL_FIELDS = (
+	"serial_no",
+	"item_code",
+	"warehouse",
+	"batch_no",
+	"available_from",
+	"available_till",
+	"voucher_no",
+	"outward_voucher_no",
+)
+
+
+class SerialNoAvailability(Document):
+	# begin: auto-generated types
+	# This code is auto-generated. Do not modify anything in this block.
+
+	from typing import TYPE_CHECKING
+
+	if TYPE_CHECKING:
+		from frappe.types import DF
+
+		available_from: DF.Datetime | None
+		available_till: DF.Datetime | None
+		batch_no: DF.Link | None
+		item_code: DF.Link | None
+		outward_voucher_no: DF.Data | None
+		serial_no: DF.Link | None
+		voucher_no: DF.Data | None
+		warehouse: DF.Link | None
+	# end: auto-generated types
+
+	pass
+
+
+def update_serial_no_availability(serial_nos):
+	"""Recompute the availability of `serial_nos` from their Serial and Batch Bundles and legacy entries"""
+	for serial_nos_chunk in create_batch(sorted(set(serial_nos)), 1000):
+		frappe.db.delete("Serial No Availability", {"serial_no": ("in", serial_nos_chunk)})
+		insert_intervals(get_serial_no_intervals(serial_nos=serial_nos_chunk))
+
+
+def rebuild_serial_no_availability(item_code=None):
+	"""Rebuild the availability of every serial no of `item_code`, or of all serialized items"""
+	item_codes = [item_code] if item_code else frappe.get_all("Item", {"has_serial_no": 1}, pluck="name")
+
+	for item_code in item_codes:
+		frappe.db.delete("Serial No Availability", {"item_code": item_code})
+		insert_intervals(get_serial_no_intervals(item_code=item_code))
+
+
+def get_serial_no_intervals(serial_nos=None, item_code=None):
+	"""
+	Returns the periods during which each serial no was in a warehouse.
+
+	An inward entry opens an interval for the serial no and warehouse, which stays open
+	(`available_till` is empty) until an outward entry from the same warehouse closes it.
+	"""
+	entries = get_bundle_entries(serial_nos, item_code) + get_legacy_ledger_entries(serial_nos, item_code)
+	for row in entries:
+		row.posting_datetime = get_combine_datetime(row.posting_date, row.posting_time)
+
+	entries.sort(key=lambda row: (row.posting_datetime, row.creation, row.idx))
+
+	# entries of a voucher posted at the same time are applied outward first, so that
+	# a Stock Reconciliation replacing a serial no in its warehouse keeps it available
+	voucher_order = {}
+	for row in entries:
+		voucher_order.setdefault((row.posting_datetime, row.voucher_no), len(voucher_order))
+
+	entries.sort(
+		key=lambda row: (
+			row.posting_datetime,
+			voucher_order[(row.posting_datetime, row.voucher_no)],
+			row.type_of_transaction == "Inward",
+		)
+	)
+
+	intervals, open_intervals = [], {}
+	for row in entries:
+		key = (row.serial_no, row.warehouse)
+		if row.type_of_transaction == "Inward":
+			if key not in open_intervals:
+				open_intervals[key] = frappe._dict(
+					serial_no=row.serial_no,
+					item_code=row.item_code,
+					warehouse=row.warehouse,
+					batch_no=row.batch_no,
+					available_from=row.posting_datetime,
+					voucher_no=row.voucher_no,
+				)
+				intervals.append(open_intervals[key])
+
+		elif interval := open_intervals.pop(key, None):
+			interval.available_till = row.posting_datetime
+			interval.outward_voucher_no = row.voucher_no
+
+	return intervals
+
+
+def get_bundle_entries(serial_nos=None, item_code=None):
+	bundle = frappe.qb.DocType("Serial and Batch Bundle")
+	entry = frappe.qb.DocType("Serial and Batch Entry")
+
+	query = (
+		frappe.qb.from_(bundle)
+		.inner_join(entry)
+		.on(bundle.name == entry.parent)
+		.select(
+			entry.serial_no,
+			entry.batch_no,
+			entry.idx,
+			bundle.item_code,
+			bundle.warehouse,
+			bundle.posting_date,
+			bundle.posting_time,
+			bundle.creation,
+			bundle.voucher_no,
+			bundle.type_of_transaction,
+		)
+		.where(
+			(bundle.docstatus == 1)
+			& (bundle.is_cancelled == 0)
+			& (bundle.type_of_transaction.isin(["Inward", "Outward"]))
+			& (entry.serial_no.isnotnull())
+			& (entry.serial_no != "")
+		)
+	)
+
+	if serial_nos:
+		query = query.where(entry.serial_no.isin(serial_nos))
+
+	if item_code:
+		query = query.where(bundle.item_code == item_code)
+
+	return query.run(as_dict=True)
+
+
+def get_legacy_ledger_entries(serial_nos=None, item_code=None):
+	"""Returns a row per serial no of the Stock Ledger Entries posted without a Serial and Batch Bundle"""
+	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	query = (
+		frappe.qb.from_(sle)
+		.select(
+			sle.serial_no,
+			sle.batch_no,
+			sle.item_code,
+			sle.warehouse,
+			sle.posting_date,
+			sle.posting_time,
+			sle.creation,
+			sle.voucher_no,
+			sle.actual_qty,
+		)
+		.where(
+			(sle.is_cancelled == 0)
+			& (sle.serial_no.isnotnull())
+			& (sle.serial_no != "")
+			& (IfNull(sle.serial_and_batch_bundle, "") == "")
+		)
+	)
+
+	if serial_nos:
+		# the serial nos of an entry are stored as text, so the entries are narrowed down by item
+		item_codes = frappe.get_all(
+			"Serial No", {"name": ("in", serial_nos)}, pluck="item_code", distinct=True
+		)
+		if not item_codes:
+			return []
+
+		query = query.where(sle.item_code.isin(item_codes))
+
+	if item_code:
+		query = query.where(sle.item_code == item_code)
+
+	serial_nos = set(serial_nos or [])
+	entries = []
+	for row in query.run(as_dict=True):
+		type_of_transaction = "Inward" if row.actual_qty > 0 else "Outward"
+		for idx, serial_no in enumerate(get_serial_nos(row.serial_no), start=1):
+			if serial_nos and serial_no not in serial_nos:
+				continue
+
+			entries.append(
+				frappe._dict(row, serial_no=serial_no, idx=idx, type_of_transaction=type_of_transaction)
+			)
+
+	return entries
+
+
+def insert_intervals(intervals):
+	fields = ["name", "creation", "modified", "owner", "modified_by", *INTERVAL_FIELDS]
+
+	timestamp = now()
+	values = [
+		(
+			frappe.generate_hash(length=10),
+			timestamp,
+			timestamp,
+			frappe.session.user,
+			frappe.session.user,
+			*(interval.get(field) for field in INTERVAL_FIELDS),
+		)
+		for interval in intervals
+	]
+
+	frappe.db.bulk_insert("Serial No Availability", fields, values)
+
+
+def on_doctype_update():
+	frappe.db.add_index(
+		"Serial No Availability", ["item_code", "warehouse", "available_till", "available_from"]
+	)
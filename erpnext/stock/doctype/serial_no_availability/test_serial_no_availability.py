@@ -0,0 +1,107 @@
+# Copyright (c) 2026, Frappe Technologies Pvt. Ltd. and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, nowdate
+
+from erpnext.stock.doctype.item.test_item import make_item
+from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
+	get_available_serial_nos,
+)
+from erpnext.stock.doctype.serial_no_availability.serial_no_availability import (
+	rebuild_serial_no_availability,
+)
+from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
+from erpnext.stock.serial_batch_bundle import get_serial_nos_from_bundle
+
+
+class TestSerialNoAvailability(FrappeTestCase):
+	def get_serial_nos(self, item_code, posting_date=None, **kwargs):
+		kwargs = frappe._dict(
+			item_code=item_code, warehouse="_Test Warehouse - _TC", posting_date=posting_date, **kwargs
+		)
+		return [d.serial_no for d in get_available_serial_nos(kwargs)]
+
+	def test_serial_no_availability(self):
+		item_code = make_item(
+			"_Test Serial No Availability Item",
+			{"is_stock_item": 1, "has_serial_no": 1, "serial_no_series": "TEST-SNA-.#####"},
+		).name
+		warehouse = "_Test Warehouse - _TC"
+
+		se = make_stock_entry(
+			item_code=item_code, to_warehouse=warehouse, qty=3, rate=100, posting_date=add_days(nowdate(), -5)
+		)
+		serial_nos = get_serial_nos_from_bundle(se.items[0].serial_and_batch_bundle)
+
+		issue = make_stock_entry(
+			item_code=item_code,
+			from_warehouse=warehouse,
+			qty=1,
+			serial_no=[serial_nos[0]],
+			posting_date=add_days(nowdate(), -2),
+		)
+
+		self.assertEqual(self.get_serial_nos(item_code), serial_nos[1:])
+		self.assertEqual(self.get_serial_nos(item_code, qty=1), serial_nos[1:2])
+		self.assertEqual(self.get_serial_nos(item_code, add_days(nowdate(), -6)), [])
+		self.assertEqual(
+			self.get_serial_nos(item_code, add_days(nowdate(), -3), ignore_warehouse=1), serial_nos
+		)
+		self.assertEqual(
+			frappe.db.get_value("Serial No Availability", {"serial_no": serial_nos[0]}, "outward_voucher_no"),
+			issue.name,
+		)
+
+		issue.cancel()
+		self.assertEqual(self.get_serial_nos(item_code), serial_nos)
+
+		frappe.db.delete("Serial No Availability", {"item_code": item_code})
+		rebuild_serial_no_availability(item_code)
+		self.assertEqual(self.get_serial_nos(item_code), serial_nos)
+
+	def test_availability_of_serial_nos_without_bundle(self):
+		item_code = make_item(
+			"_Test Legacy Serial No Availability Item", {"is_stock_item": 1, "has_serial_no": 1}
+		).name
+		warehouse = "_Test Warehouse - _TC"
+		serial_no = frappe.get_doc(
+			{"doctype": "Serial No", "serial_no": "TEST-LEGACY-SNA-0001", "item_code": item_code}
+		).insert()
+		serial_no.db_set("warehouse", warehouse)
+
+		# entries posted before Serial and Batch Bundles carry the serial nos themselves
+		make_legacy_stock_ledger_entry(item_code, warehouse, serial_no.name, 1, add_days(nowdate(), -5))
+		rebuild_serial_no_availability(item_code)
+
+		self.assertEqual(self.get_serial_nos(item_code), [serial_no.name])
+		self.assertEqual(self.get_serial_nos(item_code, add_days(nowdate(), -3)), [serial_no.name])
+
+		make_legacy_stock_ledger_entry(item_code, warehouse, serial_no.name, -1, add_days(nowdate(), -2))
+		serial_no.db_set("warehouse", None)
+		rebuild_serial_no_availability(item_code)
+
+		self.assertEqual(self.get_serial_nos(item_code), [])
+		self.assertEqual(
+			self.get_serial_nos(item_code, add_days(nowdate(), -3), ignore_warehouse=1), [serial_no.name]
+		)
+
+
+def make_legacy_stock_ledger_entry(item_code, warehouse, serial_no, actual_qty, posting_date):
+	sle = frappe.get_doc(
+		{
+			"doctype": "Stock Ledger Entry",
+			"item_code": item_code,
+			"warehouse": warehouse,
+			"company": "_Test Company",
+			"posting_date": posting_date,
+			"posting_time": "10:00:00",
+			"voucher_type": "Stock Entry",
+			"voucher_no": frappe.generate_hash(length=10),
+			"actual_qty": actual_qty,
+			"serial_no": serial_no,
+		}
+	)
+	sle.name = frappe.generate_hash(length=10)
+	sle.db_insert()
@@ -2,6 +2,7 @@
 # License: GNU General Public License v3. See license.txt
 
 
+import json
 from datetime import date
 
 import frappe
@@ -15,6 +16,7 @@ from erpnext.controllers.item_variant import ItemTemplateCannotHaveStock
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.serial_batch_bundle import SerialBatchBundle
 from erpnext.stock.stock_ledger import get_previous_sle
+from erpnext.stock.valuation import load_stock_queue
 
 
 class StockFreezeError(frappe.ValidationError):
@@ -79,6 +81,11 @@ class StockLedgerEntry(Document):
 		if self.meta.autoname == "hash":
 			self.to_rename = 0
 
+	def onload(self):
+		# large queues are stored compressed, show them as plain (qty, rate) pairs
+		if self.stock_queue:
+			self.stock_queue = json.dumps(load_stock_queue(self.stock_queue))
+
 	def validate(self):
 		self.flags.ignore_submit_comment = True
 		from erpnext.stock.utils import validate_disabled_warehouse, validate_warehouse_company
@@ -990,6 +990,51 @@ class TestStockLedgerEntry(FrappeTestCase, StockTestMixin):
 		receipt2 = make_stock_entry(item_code=item, target=warehouse, qty=15, rate=15)
 		self.assertSLEs(receipt2, [{"stock_queue": [[5, 15]], "stock_value_difference": 175}])
 
+	def test_batch_replay_of_future_entries(self):
+		from erpnext.stock.stock_ledger import update_entries_after
+
+		item = make_item().name
+		warehouse = "_Test Warehouse - _TC"
+
+		for days, qty, rate in ((-5, 10, 10), (-4, -4, 0), (-3, 20, 20), (-2, -16, 0), (-1, 5, 30)):
+			posting_date = add_days(today(), days)
+			if qty > 0:
+				make_stock_entry(
+					item_code=item, target=warehouse, qty=qty, rate=rate, posting_date=posting_date
+				)
+			else:
+				make_stock_entry(item_code=item, source=warehouse, qty=abs(qty), posting_date=posting_date)
+
+		def _get_sles():
+			return frappe.get_all(
+				"Stock Ledger Entry",
+				filters={"item_code": item, "is_cancelled": 0},
+				fields=["name", "qty_after_transaction", "valuation_rate", "stock_value", "stock_queue"],
+				order_by="posting_datetime, creation",
+			)
+
+		expected_sles = _get_sles()
+
+		frappe.db.set_value(
+			"Stock Ledger Entry",
+			{"item_code": item},
+			{"qty_after_transaction": 0, "valuation_rate": 0, "stock_value": 0, "stock_queue": "[]"},
+		)
+		update_entries_after(
+			{
+				"item_code": item,
+				"warehouse": warehouse,
+				"posting_date": add_days(today(), -6),
+				"posting_time": "00:00:00",
+			},
+			batch_replay=True,
+		)
+
+		self.assertEqual(_get_sles(), expected_sles)
+		self.assertEqual(
+			frappe.db.get_value("Bin", {"item_code": item, "warehouse": warehouse}, "actual_qty"), 15
+		)
+
 	def test_dependent_gl_entry_reposting(self):
 		def _get_stock_credit(doc):
 			return frappe.db.get_value(
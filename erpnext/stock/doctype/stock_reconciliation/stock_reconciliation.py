@@ -11,11 +11,18 @@ import erpnext
 from erpnext.accounts.utils import get_company_default
 from erpnext.controllers.stock_controller import StockController
 from erpnext.stock.doctype.batch.batch import get_available_batches, get_batch_qty
+from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+	update_batch_warehouse_balance,
+	update_batch_warehouse_balances,
+)
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_serial_nos,
 )
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+from erpnext.stock.doctype.serial_no_availability.serial_no_availability import (
+	update_serial_no_availability,
+)
 from erpnext.stock.utils import get_stock_balance
 
 
@@ -995,6 +1002,10 @@ class StockReconciliation(StockController):
 		if not serial_nos_details:
 			return 0.0
 
+		serial_nos = [d.serial_no for d in doc.entries]
+		if doc.has_batch_no:
+			update_batch_warehouse_balances(doc.name, doc.item_code, sign=-1)
+
 		doc.delete_serial_batch_entries()
 		current_qty = 0.0
 		for serial_no_row in serial_nos_details:
@@ -1013,6 +1024,10 @@ class StockReconciliation(StockController):
 		doc.calculate_qty_and_amount(save=True)
 		doc.db_update_all()
 
+		update_serial_no_availability(serial_nos + [d.serial_no for d in doc.entries])
+		if doc.has_batch_no:
+			update_batch_warehouse_balances(doc.name, doc.item_code)
+
 		return current_qty
 
 	def get_current_qty_for_batch_nos(self, doc):
@@ -1031,6 +1046,7 @@ class StockReconciliation(StockController):
 			) * -1
 
 			if flt(d.qty, precision) != flt(qty, precision):
+				update_batch_warehouse_balance(doc.item_code, d.batch_no, d.warehouse, qty - flt(d.qty))
 				d.db_set("qty", qty)
 
 			current_qty += qty
@@ -17,12 +17,14 @@ class StockRepostingSettings(Document):
 		from frappe.types import DF
 
 		do_reposting_for_each_stock_transaction: DF.Check
+		enable_parallel_reposting: DF.Check
 		end_time: DF.Time | None
 		item_based_reposting: DF.Check
 		limit_reposting_timeslot: DF.Check
 		limits_dont_apply_on: DF.Literal[
 			"", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
 		]
+		no_of_parallel_reposting_jobs: DF.Int
 		notify_reposting_error_to_role: DF.Link | None
 		start_time: DF.Time | None
 	# end: auto-generated types
@@ -3,6 +3,7 @@
 
 
 import json
+from contextlib import contextmanager
 
 import frappe
 from frappe import _, throw
@@ -75,12 +76,13 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 
 	out = get_basic_details(args, item, overwrite_warehouse)
 	get_item_tax_template(args, item, out)
-	out["item_tax_rate"] = get_item_tax_map(
+	out["item_tax_rate"] = get_cached_details(
+		get_item_tax_map,
 		args.company,
 		args.get("item_tax_template")
 		if out.get("item_tax_template") is None
 		else out.get("item_tax_template"),
-		as_json=True,
+		True,
 	)
 
 	get_party_item_code(args, item, out)
@@ -129,6 +131,49 @@ def get_item_details(args, doc=None, for_validate=False, overwrite_warehouse=Tru
 	return out
 
 
+@frappe.whitelist()
+def get_items_details(rows, doc=None, for_validate=False, overwrite_warehouse=True):
+	"""
+	Returns `get_item_details` for each of `rows`, in the same order.
+
+	Item, item group and brand defaults, item tax maps, item prices, UOM conversion factors and
+	bin details are looked up once for the whole batch instead of once per row.
+	"""
+	rows = process_string_args(rows)
+	if isinstance(doc, str):
+		doc = json.loads(doc)
+
+	with item_details_cache():
+		return [get_item_details(args, doc, for_validate, overwrite_warehouse) for args in rows]
+
+
+@contextmanager
+def item_details_cache():
+	"""Share lookups between the `get_item_details` calls made inside the block"""
+	if getattr(frappe.local, "item_details_cache", None) is not None:
+		yield
+		return
+
+	frappe.local.item_details_cache = {}
+	try:
+		yield
+	finally:
+		frappe.local.item_details_cache = None
+
+
+def get_cached_details(func, *args):
+	"""Returns `func(*args)`, memoized while an `item_details_cache` block is active"""
+	cache = getattr(frappe.local, "item_details_cache", None)
+	if cache is None:
+		return func(*args)
+
+	key = (func.__name__, *args)
+	if key not in cache:
+		cache[key] = func(*args)
+
+	return cache[key]
+
+
 def remove_standard_fields(details):
 	for key in child_table_fields + default_fields:
 		details.pop(key, None)
@@ -162,7 +207,7 @@ def update_bin_details(args, out, doc):
 		company = args.company if (doc and doc.get("doctype") == "Purchase Order") else None
 
 		# calculate company_total_stock only for po
-		bin_details = get_bin_details(args.item_code, out.warehouse, company, include_child_warehouses=True)
+		bin_details = get_cached_details(get_bin_details, args.item_code, out.warehouse, company, True)
 
 		out.update(bin_details)
 
@@ -271,9 +316,9 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	if item.variant_of and not item.taxes and frappe.db.exists("Item Tax", {"parent": item.variant_of}):
 		item.update_template_tables()
 
-	item_defaults = get_item_defaults(item.name, args.company)
-	item_group_defaults = get_item_group_defaults(item.name, args.company)
-	brand_defaults = get_brand_defaults(item.name, args.company)
+	item_defaults = get_cached_details(get_item_defaults, item.name, args.company)
+	item_group_defaults = get_cached_details(get_item_group_defaults, item.name, args.company)
+	brand_defaults = get_cached_details(get_brand_defaults, item.name, args.company)
 
 	defaults = frappe._dict(
 		{
@@ -395,9 +440,9 @@ def get_basic_details(args, item, overwrite_warehouse=True):
 	if item.stock_uom == args.uom:
 		out.conversion_factor = 1.0
 	else:
-		out.conversion_factor = args.conversion_factor or get_conversion_factor(item.name, args.uom).get(
-			"conversion_factor"
-		)
+		out.conversion_factor = args.conversion_factor or get_cached_details(
+			get_conversion_factor, item.name, args.uom
+		).get("conversion_factor")
 
 	args.conversion_factor = out.conversion_factor
 	out.stock_qty = out.qty * out.conversion_factor
@@ -867,6 +912,7 @@ def insert_item_price(args):
 					"Stock Settings", "update_existing_price_list_rate"
 				):
 					frappe.db.set_value("Item Price", item_price.name, "price_list_rate", price_list_rate)
+					clear_item_price_cache(args.item_code, args.price_list)
 					frappe.msgprint(
 						_("Item Price updated for {0} in Price List {1}").format(
 							args.item_code, args.price_list
@@ -900,15 +946,55 @@ def get_item_price(args, item_code, ignore_party=False) -> list[dict]:
 	:param item_code: str, Item Doctype field item_code
 	"""
 
+	if ignore_party:
+		customer = supplier = None
+	else:
+		customer, supplier = args.get("customer"), args.get("supplier")
+
+	return get_cached_details(
+		_get_item_price,
+		item_code,
+		args.get("price_list"),
+		args.get("uom"),
+		args.get("batch_no"),
+		customer,
+		supplier,
+		args.get("transaction_date"),
+		ignore_party,
+	)
+
+
+def _get_item_price(item_code, price_list, uom, batch_no, customer, supplier, transaction_date, ignore_party):
+	"""Returns the Item Price lookup, cached in redis per item and price list"""
+	args = (item_code, price_list, uom, batch_no, customer, supplier, transaction_date, ignore_party)
+
+	cache_key = get_item_price_cache_key(item_code, price_list)
+	if cache_key in frappe.flags.get("item_price_cache_to_clear", ()):
+		# prices changed by the current transaction are not visible to others until it commits
+		return get_item_price_from_db(*args)
+
+	field = frappe.as_json([uom, batch_no, customer, supplier, cstr(transaction_date), cint(ignore_party)])
+	item_price = frappe.cache.hget(cache_key, field)
+	if item_price is None:
+		item_price = get_item_price_from_db(*args)
+		frappe.cache.hset(cache_key, field, item_price)
+		frappe.cache.expire(frappe.cache.make_key(cache_key), 60 * 60)
+
+	return item_price
+
+
+def get_item_price_from_db(
+	item_code, price_list, uom, batch_no, customer, supplier, transaction_date, ignore_party
+):
 	ip = frappe.qb.DocType("Item Price")
 	query = (
 		frappe.qb.from_(ip)
 		.select(ip.name, ip.price_list_rate, ip.uom)
 		.where(
 			(ip.item_code == item_code)
-			& (ip.price_list == args.get("price_list"))
-			& (IfNull(ip.uom, "").isin(["", args.get("uom")]))
-			& (IfNull(ip.batch_no, "").isin(["", args.get("batch_no")]))
+			& (ip.price_list == price_list)
+			& (IfNull(ip.uom, "").isin(["", uom]))
+			& (IfNull(ip.batch_no, "").isin(["", batch_no]))
 		)
 		.orderby(ip.valid_from, order=frappe.qb.desc)
 		.orderby(IfNull(ip.batch_no, ""), order=frappe.qb.desc)
@@ -917,22 +1003,45 @@ def get_item_price(args, item_code, ignore_party=False) -> list[dict]:
 	)
 
 	if not ignore_party:
-		if args.get("customer"):
-			query = query.where(ip.customer == args.get("customer"))
-		elif args.get("supplier"):
-			query = query.where(ip.supplier == args.get("supplier"))
+		if customer:
+			query = query.where(ip.customer == customer)
+		elif supplier:
+			query = query.where(ip.supplier == supplier)
 		else:
 			query = query.where((IfNull(ip.customer, "") == "") & (IfNull(ip.supplier, "") == ""))
 
-	if args.get("transaction_date"):
+	if transaction_date:
 		query = query.where(
-			(IfNull(ip.valid_from, "2000-01-01") <= args["transaction_date"])
-			& (IfNull(ip.valid_upto, "2500-12-31") >= args["transaction_date"])
+			(IfNull(ip.valid_from, "2000-01-01") <= transaction_date)
+			& (IfNull(ip.valid_upto, "2500-12-31") >= transaction_date)
 		)
 
 	return query.run(as_dict=True)
 
 
+def get_item_price_cache_key(item_code, price_list):
+	return f"item_price::{price_list}::{item_code}"
+
+
+def clear_item_price_cache(item_code, price_list):
+	"""Drop the cached Item Price lookups of an item in a price list once the transaction commits"""
+	to_clear = frappe.flags.setdefault("item_price_cache_to_clear", set())
+	if not to_clear:
+		frappe.db.after_commit.add(_clear_item_price_cache)
+		frappe.db.after_rollback.add(lambda: frappe.flags.pop("item_price_cache_to_clear", None))
+
+	to_clear.add(get_item_price_cache_key(item_code, price_list))
+
+
+def _clear_item_price_cache():
+	if to_clear := frappe.flags.pop("item_price_cache_to_clear", None):
+		frappe.cache.delete_value(list(to_clear))
+
+
+def clear_all_item_price_cache():
+	frappe.cache.delete_keys("item_price::")
+
+
 def get_price_list_rate_for(args, item_code):
 	"""
 	:param customer: link to Customer DocType
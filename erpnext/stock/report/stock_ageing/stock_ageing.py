@@ -7,7 +7,7 @@ from operator import itemgetter
 
 import frappe
 from frappe import _
-from frappe.utils import cint, date_diff, flt
+from frappe.utils import cint, cstr, date_diff, flt, getdate
 
 from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -217,6 +217,7 @@ class FIFOSlots:
 		self.serial_no_batch_purchase_details = {}
 		self.filters = filters
 		self.sle = sle
+		self.checkpoint_date = None
 
 	def generate(self) -> dict:
 		"""
@@ -237,6 +238,7 @@ class FIFOSlots:
 
 		bundle_wise_serial_nos = frappe._dict({})
 		if stock_ledger_entries is None:
+			self.__load_checkpoint()
 			bundle_wise_serial_nos = self.__get_bundle_wise_serial_nos()
 
 		with frappe.db.unbuffered_cursor():
@@ -274,6 +276,88 @@ class FIFOSlots:
 
 		return self.item_details
 
+	def get_checkpoint(self) -> dict:
+		"""Returns the Item-Wh wise FIFO slots in a form which can be saved and loaded later.
+
+		Serial No slots are saved as the Serial No only, their date is the purchase date of the
+		Serial No which is saved once, grouped by date.
+		"""
+		items = []
+		for (item_code, warehouse), row in self.item_details.items():
+			if not (row["fifo_queue"] or flt(row.get("qty_after_transaction")) or flt(row.get("total_qty"))):
+				continue
+
+			fifo_queue = [
+				slot[0] if isinstance(slot[0], str) else [slot[0], cstr(slot[1])]
+				for slot in row["fifo_queue"]
+			]
+			items.append(
+				[
+					item_code,
+					warehouse,
+					flt(row.get("qty_after_transaction")),
+					flt(row.get("total_qty")),
+					cint(row.get("has_serial_no")),
+					fifo_queue,
+				]
+			)
+
+		serial_nos = {}
+		for serial_no, purchase_date in self.serial_no_batch_purchase_details.items():
+			serial_nos.setdefault(cstr(purchase_date), []).append(serial_no)
+
+		return {"items": items, "serial_nos": serial_nos}
+
+	def __load_checkpoint(self):
+		"Start from the FIFO slots saved with the latest Closing Stock Balance before the report date."
+		from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+			get_latest_closing_stock_balance,
+		)
+
+		if not self.filters.get("company"):
+			return
+
+		closing_balance = get_latest_closing_stock_balance(
+			self.filters.get("company"), before_date=self.filters.get("to_date")
+		)
+		if not (closing_balance and closing_balance.fifo_slots):
+			return
+
+		self.checkpoint_date = closing_balance.to_date
+		for purchase_date, serial_nos in closing_balance.fifo_slots["serial_nos"].items():
+			purchase_date = getdate(purchase_date)
+			for serial_no in serial_nos:
+				self.serial_no_batch_purchase_details[serial_no] = purchase_date
+
+		items = {item.name: item for item in self.__get_item_query().run(as_dict=True)}
+		warehouses = self.__get_warehouses()
+		if warehouses is not None:
+			warehouses = set(warehouses)
+
+		for (
+			item_code,
+			warehouse,
+			qty_after_transaction,
+			total_qty,
+			has_serial_no,
+			fifo_queue,
+		) in closing_balance.fifo_slots["items"]:
+			if item_code not in items or (warehouses is not None and warehouse not in warehouses):
+				continue
+
+			self.item_details[(item_code, warehouse)] = {
+				"details": frappe._dict(items[item_code], warehouse=warehouse),
+				"fifo_queue": [
+					[slot, self.serial_no_batch_purchase_details.get(slot)]
+					if isinstance(slot, str)
+					else [slot[0], getdate(slot[1])]
+					for slot in fifo_queue
+				],
+				"qty_after_transaction": qty_after_transaction,
+				"total_qty": total_qty,
+				"has_serial_no": has_serial_no,
+			}
+
 	def __init_key_stores(self, row: dict) -> tuple:
 		"Initialise keys and FIFO Queue."
 
@@ -432,17 +516,12 @@ class FIFOSlots:
 			)
 		)
 
-		if self.filters.get("warehouse"):
-			sle_query = self.__get_warehouse_conditions(sle, sle_query)
-		elif self.filters.get("warehouse_type"):
-			warehouses = frappe.get_all(
-				"Warehouse",
-				filters={"warehouse_type": self.filters.get("warehouse_type"), "is_group": 0},
-				pluck="name",
-			)
+		if self.checkpoint_date:
+			sle_query = sle_query.where(sle.posting_date > self.checkpoint_date)
 
-			if warehouses:
-				sle_query = sle_query.where(sle.warehouse.isin(warehouses))
+		warehouses = self.__get_warehouses()
+		if warehouses:
+			sle_query = sle_query.where(sle.warehouse.isin(warehouses))
 
 		sle_query = sle_query.orderby(sle.posting_date, sle.posting_time, sle.creation, sle.actual_qty)
 
@@ -465,6 +544,9 @@ class FIFOSlots:
 			)
 		)
 
+		if self.checkpoint_date:
+			query = query.where(bundle.posting_date > self.checkpoint_date)
+
 		for field in ["item_code", "warehouse"]:
 			if self.filters.get(field):
 				query = query.where(bundle[field] == self.filters.get(field))
@@ -490,16 +572,26 @@ class FIFOSlots:
 
 		return item
 
-	def __get_warehouse_conditions(self, sle, sle_query) -> str:
-		warehouse = frappe.qb.DocType("Warehouse")
-		lft, rgt = frappe.db.get_value("Warehouse", self.filters.get("warehouse"), ["lft", "rgt"])
+	def __get_warehouses(self) -> list | None:
+		"Returns the warehouses to consider as per the filters, None if all of them are."
+		if self.filters.get("warehouse"):
+			warehouse = frappe.qb.DocType("Warehouse")
+			lft, rgt = frappe.db.get_value("Warehouse", self.filters.get("warehouse"), ["lft", "rgt"])
+
+			warehouse_results = (
+				frappe.qb.from_(warehouse)
+				.select("name")
+				.where((warehouse.lft >= lft) & (warehouse.rgt <= rgt))
+				.run()
+			)
+			return [x[0] for x in warehouse_results]
+		elif self.filters.get("warehouse_type"):
+			warehouses = frappe.get_all(
+				"Warehouse",
+				filters={"warehouse_type": self.filters.get("warehouse_type"), "is_group": 0},
+				pluck="name",
+			)
 
-		warehouse_results = (
-			frappe.qb.from_(warehouse)
-			.select("name")
-			.where((warehouse.lft >= lft) & (warehouse.rgt <= rgt))
-			.run()
-		)
-		warehouse_results = [x[0] for x in warehouse_results]
+			return warehouses or None
 
-		return sle_query.where(sle.warehouse.isin(warehouse_results))
+		return None
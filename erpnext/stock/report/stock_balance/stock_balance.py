@@ -61,6 +61,11 @@ class StockBalanceReport:
 		self.float_precision = cint(frappe.db.get_default("float_precision")) or 3
 
 		self.inventory_dimensions = self.get_inventory_dimension_fields()
+		self.group_by_dimensions = [
+			fieldname
+			for fieldname in self.inventory_dimensions
+			if self.filters.get(fieldname) or self.filters.get("group_by_inventory_dimensions")
+		]
 		self.prepare_opening_data_from_closing_balance()
 		self.prepare_stock_ledger_entries()
 		self.prepare_new_data()
@@ -79,15 +84,67 @@ class StockBalanceReport:
 		if not closing_balance:
 			return
 
-		self.start_from = add_days(closing_balance[0].to_date, 1)
 		res = frappe.get_doc("Closing Stock Balance", closing_balance[0].name).get_prepared_data()
+		if "data" not in res:
+			return
+
+		if self.group_by_dimensions and not res.get("group_by_inventory_dimensions"):
+			# balances were not kept per inventory dimension
+			return
+
+		self.start_from = add_days(closing_balance[0].to_date, 1)
+		scope = self.get_closing_balance_scope()
 
 		for entry in res.data:
 			entry = frappe._dict(entry)
+			if any(entry.get(fieldname) not in values for fieldname, values in scope.items()):
+				continue
 
 			group_by_key = self.get_group_by_key(entry)
 			if group_by_key not in self.opening_data:
 				self.opening_data.setdefault(group_by_key, entry)
+			else:
+				# balances kept per inventory dimension are added up
+				opening_data = self.opening_data[group_by_key]
+				opening_data.bal_qty = flt(opening_data.bal_qty) + flt(entry.bal_qty)
+				opening_data.bal_val = flt(opening_data.bal_val) + flt(entry.bal_val)
+				opening_data.fifo_queue = (opening_data.fifo_queue or []) + (entry.fifo_queue or [])
+
+	def get_closing_balance_scope(self) -> dict[str, set]:
+		"""Returns the values a closing balance row must have to be included in this report
+
+		A closing balance can cover more than the report, e.g. all the warehouses of the company
+		"""
+		scope = {}
+
+		if self.filters.get("item_code"):
+			scope["item_code"] = {self.filters.get("item_code")}
+		elif self.filters.get("brand"):
+			scope["item_code"] = set(
+				frappe.get_all("Item", filters={"brand": self.filters.get("brand")}, pluck="name")
+			)
+
+		if item_group := self.filters.get("item_group"):
+			scope["item_group"] = {
+				item_group,
+				*get_descendants_of("Item Group", item_group, ignore_permissions=True),
+			}
+
+		if warehouse := self.filters.get("warehouse"):
+			scope["warehouse"] = {
+				warehouse,
+				*get_descendants_of("Warehouse", warehouse, ignore_permissions=True),
+			}
+		elif warehouse_type := self.filters.get("warehouse_type"):
+			scope["warehouse"] = set(
+				frappe.get_all("Warehouse", filters={"warehouse_type": warehouse_type}, pluck="name")
+			)
+
+		for fieldname in self.inventory_dimensions:
+			if values := self.filters.get(fieldname):
+				scope[fieldname] = set(values) if isinstance(values, list) else {values}
+
+		return scope
 
 	def prepare_new_data(self):
 		self.item_warehouse_map = self.get_item_warehouse_map()
@@ -239,12 +296,14 @@ class StockBalanceReport:
 			}
 		)
 
+		for fieldname in self.inventory_dimensions:
+			item_warehouse_map[group_by_key][fieldname] = entry.get(fieldname)
+
 	def get_group_by_key(self, row) -> tuple:
 		group_by_key = [row.company, row.item_code, row.warehouse]
 
-		for fieldname in self.inventory_dimensions:
-			if self.filters.get(fieldname):
-				group_by_key.append(row.get(fieldname))
+		for fieldname in self.group_by_dimensions:
+			group_by_key.append(row.get(fieldname))
 
 		return tuple(group_by_key)
 
@@ -267,9 +326,14 @@ class StockBalanceReport:
 			.limit(1)
 		)
 
+		# closing balances prepared for the same or a wider set of items and warehouses can be used
 		for fieldname in ["warehouse", "item_code", "item_group", "warehouse_type"]:
 			if self.filters.get(fieldname):
-				query = query.where(table[fieldname] == self.filters.get(fieldname))
+				query = query.where(
+					(Coalesce(table[fieldname], "") == "") | (table[fieldname] == self.filters.get(fieldname))
+				)
+			else:
+				query = query.where(Coalesce(table[fieldname], "") == "")
 
 		return query.run(as_dict=True)
 
@@ -6,6 +6,11 @@ from typing import Any, TypedDict
 import frappe
 from frappe import _
 from frappe.query_builder.functions import Sum
+from frappe.utils import flt
+
+from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+	get_latest_closing_stock_balance,
+)
 
 
 class StockBalanceFilter(TypedDict):
@@ -35,11 +40,23 @@ def get_warehouse_wise_balance(filters: StockBalanceFilter) -> list[SLEntry]:
 		.groupby(sle.warehouse)
 	)
 
+	warehouse_balance = frappe._dict()
 	if filters.get("company"):
 		query = query.where(sle.company == filters.get("company"))
 
-	data = query.run(as_list=True)
-	return frappe._dict(data) if data else frappe._dict()
+		# start from the latest closing balance and add the entries posted after it
+		if closing_balance := get_latest_closing_stock_balance(filters.get("company")):
+			for row in closing_balance.data:
+				warehouse_balance[row["warehouse"]] = flt(warehouse_balance.get(row["warehouse"])) + flt(
+					row.get("bal_val")
+				)
+
+			query = query.where(sle.posting_date > closing_balance.to_date)
+
+	for warehouse, stock_balance in query.run(as_list=True):
+		warehouse_balance[warehouse] = flt(warehouse_balance.get(warehouse)) + flt(stock_balance)
+
+	return warehouse_balance
 
 
 def get_warehouses(report_filters: StockBalanceFilter):
@@ -289,6 +289,7 @@ class SerialBatchBundle:
 			self.set_batch_no_in_serial_nos()
 
 		if self.item_details.has_batch_no == 1:
+			self.update_batch_warehouse_balances()
 			self.update_batch_qty()
 
 		if self.sle.is_cancelled and self.sle.serial_and_batch_bundle:
@@ -355,6 +356,18 @@ class SerialBatchBundle:
 				.where(sn_table.name.isin(serial_nos))
 			).run()
 
+	def update_batch_warehouse_balances(self):
+		from erpnext.stock.doctype.batch_warehouse_balance.batch_warehouse_balance import (
+			update_batch_warehouse_balances,
+		)
+
+		if not self.sle.serial_and_batch_bundle:
+			return
+
+		update_batch_warehouse_balances(
+			self.sle.serial_and_batch_bundle, self.item_code, sign=-1 if self.sle.is_cancelled else 1
+		)
+
 	def update_batch_qty(self):
 		from erpnext.stock.doctype.batch.batch import get_available_batches
 
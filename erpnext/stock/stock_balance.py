@@ -3,7 +3,7 @@
 
 
 import frappe
-from frappe.utils import cstr, flt, now, nowdate, nowtime
+from frappe.utils import add_days, cstr, flt, now, nowdate, nowtime
 
 from erpnext.controllers.stock_controller import create_repost_item_valuation_entry
 
@@ -209,20 +209,93 @@ def get_planned_qty(item_code, warehouse):
 
 
 def update_bin_qty(item_code, warehouse, qty_dict=None):
-	from erpnext.stock.utils import get_bin
-
-	bin = get_bin(item_code, warehouse)
-	mismatch = False
-	for field, value in qty_dict.items():
-		if flt(bin.get(field)) != flt(value):
-			bin.set(field, flt(value))
-			mismatch = True
-
-	bin.modified = now()
-	if mismatch:
-		bin.set_projected_qty()
-		bin.db_update()
-		bin.clear_cache()
+	from erpnext.stock.doctype.bin.bin import update_bin_quantities
+	from erpnext.stock.utils import get_or_make_bin
+
+	bin_name = get_or_make_bin(item_code, warehouse)
+	bin_details = frappe.db.get_value("Bin", bin_name, list(qty_dict), as_dict=True)
+
+	values = {
+		field: flt(value) for field, value in qty_dict.items() if flt(bin_details.get(field)) != flt(value)
+	}
+	if values:
+		update_bin_quantities(bin_name, values)
+		frappe.clear_document_cache("Bin", bin_name)
+
+
+def reconcile_bins(modified_after=None):
+	"""Correct Bins whose quantities have drifted from the Stock Ledger or the reserving documents
+
+	Bins are incremented as transactions are posted, so the Bins modified since `modified_after`
+	(the last day by default) are periodically recomputed from their sources.
+	Returns the quantities which did not match.
+	"""
+	from erpnext.stock.doctype.bin.bin import PROJECTED_QTY_FIELDS, update_bin_quantities
+	from erpnext.stock.doctype.stock_reservation_entry.stock_reservation_entry import (
+		get_sre_reserved_qty_for_item_and_warehouse,
+	)
+
+	precision = frappe.get_precision("Bin", "actual_qty")
+	bin_names = frappe.get_all(
+		"Bin",
+		filters={"modified": (">=", modified_after or add_days(now(), -1))},
+		order_by="name",
+		pluck="name",
+	)
+
+	mismatches = []
+	for bin_name in bin_names:
+		if not frappe.flags.in_test:
+			# each Bin is read in a new transaction, after its lock is taken
+			frappe.db.commit()
+
+		# postings update the Bin in the transaction that adds to its sources, so they wait for the
+		# lock and their additions are either read below or applied on top of the recomputed values
+		bin = frappe.db.get_value(
+			"Bin",
+			bin_name,
+			["name", "item_code", "warehouse", "projected_qty", "reserved_stock", *PROJECTED_QTY_FIELDS],
+			as_dict=True,
+			for_update=True,
+		)
+		if not bin:
+			continue
+
+		qty_dict = {
+			"actual_qty": get_balance_qty_from_sle(bin.item_code, bin.warehouse),
+			"reserved_qty": get_reserved_qty(bin.item_code, bin.warehouse),
+			"indented_qty": get_indented_qty(bin.item_code, bin.warehouse),
+			"ordered_qty": get_ordered_qty(bin.item_code, bin.warehouse),
+			"planned_qty": get_planned_qty(bin.item_code, bin.warehouse),
+			"reserved_stock": get_sre_reserved_qty_for_item_and_warehouse(bin.item_code, bin.warehouse),
+		}
+
+		values = {
+			field: flt(value)
+			for field, value in qty_dict.items()
+			if flt(bin.get(field), precision) != flt(value, precision)
+		}
+
+		projected_qty = sum(sign * flt(bin.get(field)) for field, sign in PROJECTED_QTY_FIELDS.items())
+		if not values and flt(projected_qty, precision) == flt(bin.projected_qty, precision):
+			continue
+
+		mismatches.append(
+			frappe._dict(
+				bin=bin.name,
+				item_code=bin.item_code,
+				warehouse=bin.warehouse,
+				expected=values,
+				actual={field: bin.get(field) for field in values},
+			)
+		)
+
+		update_bin_quantities(bin.name, values)
+
+	if not frappe.flags.in_test:
+		frappe.db.commit()
+
+	return mismatches
 
 
 def set_stock_balance_as_per_serial_no(
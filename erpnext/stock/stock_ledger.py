@@ -8,11 +8,13 @@ import json
 import frappe
 from frappe import _, scrub
 from frappe.model.meta import get_field_precision
-from frappe.query_builder.functions import Sum
+from frappe.query_builder.functions import Min, Sum
 from frappe.utils import (
 	cint,
+	create_batch,
 	cstr,
 	flt,
+	get_datetime,
 	get_link_to_form,
 	getdate,
 	now,
@@ -22,7 +24,7 @@ from frappe.utils import (
 )
 
 import erpnext
-from erpnext.stock.doctype.bin.bin import update_qty as update_bin_qty
+from erpnext.stock.doctype.bin.bin import update_qty_for_bins
 from erpnext.stock.doctype.inventory_dimension.inventory_dimension import get_inventory_dimensions
 from erpnext.stock.doctype.serial_and_batch_bundle.serial_and_batch_bundle import (
 	get_available_batches,
@@ -39,7 +41,25 @@ from erpnext.stock.utils import (
 	get_stock_balance,
 	get_valuation_method,
 )
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	FIFOValuation,
+	LIFOValuation,
+	dump_stock_queue,
+	load_stock_queue,
+	round_off_if_near_zero,
+)
+
+# Stock Ledger Entry fields recomputed while replaying future entries
+REPLAY_SLE_FIELDS = (
+	"qty_after_transaction",
+	"valuation_rate",
+	"stock_value",
+	"stock_value_difference",
+	"stock_queue",
+	"incoming_rate",
+	"outgoing_rate",
+)
+REPLAY_FLUSH_CHUNK_SIZE = 1000
 
 
 class NegativeStockError(frappe.ValidationError):
@@ -62,16 +82,25 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 	                        stock)
 	"""
 	from erpnext.controllers.stock_controller import future_sle_exists
+	from erpnext.stock.doctype.closing_stock_balance.closing_stock_balance import (
+		invalidate_closing_stock_balances,
+	)
 
 	if sl_entries:
 		cancel = sl_entries[0].get("is_cancelled")
 		if cancel:
 			validate_cancellation(sl_entries)
 			set_as_cancel(sl_entries[0].get("voucher_type"), sl_entries[0].get("voucher_no"))
+			update_legacy_serial_no_availability(sl_entries)
+
+		if sl_entries[0].get("company"):
+			invalidate_closing_stock_balances(sl_entries[0].get("company"), sl_entries[0].get("posting_date"))
 
 		args = get_args_for_future_sle(sl_entries[0])
 		future_sle_exists(args, sl_entries)
 
+		# bins are updated once for all the rows of the voucher posted against them
+		bin_args = {}
 		for sle in sl_entries:
 			if sle.serial_no and not via_landed_cost_voucher:
 				validate_serial_no(sle)
@@ -106,12 +135,14 @@ def make_sl_entries(sl_entries, allow_negative_stock=False, via_landed_cost_vouc
 				bin_name = get_or_make_bin(args.get("item_code"), args.get("warehouse"))
 				args.reserved_stock = flt(frappe.db.get_value("Bin", bin_name, "reserved_stock"))
 				repost_current_voucher(args, allow_negative_stock, via_landed_cost_voucher)
-				update_bin_qty(bin_name, args)
+				bin_args.setdefault(bin_name, []).append(args)
 			else:
 				frappe.msgprint(
 					_("Item {0} ignored since it is not a stock item").format(args.get("item_code"))
 				)
 
+		update_qty_for_bins(bin_args)
+
 
 def repost_current_voucher(args, allow_negative_stock=False, via_landed_cost_voucher=False):
 	if args.get("actual_qty") or args.get("voucher_type") == "Stock Reconciliation":
@@ -153,6 +184,23 @@ def get_args_for_future_sle(row):
 	)
 
 
+def update_legacy_serial_no_availability(sl_entries):
+	"""Serial nos posted without a Serial and Batch Bundle are indexed from the Stock Ledger Entries"""
+	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
+	from erpnext.stock.doctype.serial_no_availability.serial_no_availability import (
+		update_serial_no_availability,
+	)
+
+	serial_nos = [
+		serial_no
+		for sle in sl_entries
+		if not sle.get("serial_and_batch_bundle")
+		for serial_no in get_serial_nos(sle.get("serial_no"))
+	]
+	if serial_nos:
+		update_serial_no_availability(serial_nos)
+
+
 def validate_serial_no(sle):
 	from erpnext.stock.doctype.serial_no.serial_no import get_serial_nos
 
@@ -269,6 +317,7 @@ def repost_future_sle(
 			},
 			allow_negative_stock=allow_negative_stock,
 			via_landed_cost_voucher=via_landed_cost_voucher,
+			batch_replay=True,
 		)
 		affected_transactions.update(obj.affected_transactions)
 
@@ -501,6 +550,102 @@ def get_current_index(doc=None):
 		return doc.current_index
 
 
+class ItemWarehouseGraph:
+	"""
+	Dependency graph of item-warehouses to be reposted.
+
+	Two item-warehouses are connected when a future entry of one has a dependant entry
+	(`dependant_sle_voucher_detail_no`) in the other, e.g. material transfers, repacks and
+	manufacturing. Connected components (partitions) can be reposted independently.
+
+	        graph = ItemWarehouseGraph()
+	        graph.add_group([("Item A", "Stores - C", "2024-01-01 00:00:00")])
+	        graph.build()
+	        graph.get_partitions()  # {root: [(item_code, warehouse), ...]}
+	"""
+
+	def __init__(self):
+		self.parent = {}
+		self.posting_datetime = {}
+		self.pending = []
+
+	def add(self, item_code, warehouse, posting_datetime):
+		key = (item_code, warehouse)
+		posting_datetime = get_datetime(posting_datetime)
+
+		if key not in self.parent:
+			self.parent[key] = key
+			self.posting_datetime[key] = posting_datetime
+			self.pending.append(key)
+		elif posting_datetime < self.posting_datetime[key]:
+			# dependencies have to be looked up again from the earlier timestamp
+			self.posting_datetime[key] = posting_datetime
+			self.pending.append(key)
+
+		return key
+
+	def add_group(self, rows):
+		"""Add item-warehouses which have to be reposted together, e.g. items of the same voucher."""
+		keys = [self.add(*row) for row in rows]
+		for key in keys[1:]:
+			self.union(keys[0], key)
+
+	def find(self, key):
+		while self.parent[key] != key:
+			self.parent[key] = self.parent[self.parent[key]]
+			key = self.parent[key]
+
+		return key
+
+	def union(self, key, other):
+		root, other_root = self.find(key), self.find(other)
+		if root != other_root:
+			self.parent[other_root] = root
+
+	def build(self):
+		while self.pending:
+			key = self.pending.pop()
+			for row in get_dependent_item_warehouses(*key, self.posting_datetime[key]):
+				self.union(key, self.add(row.item_code, row.warehouse, row.posting_datetime))
+
+	def get_partitions(self):
+		partitions = {}
+		for key in self.parent:
+			partitions.setdefault(self.find(key), []).append(key)
+
+		return partitions
+
+
+def get_dependent_item_warehouses(item_code, warehouse, posting_datetime):
+	"""Returns item-warehouses (with the earliest timestamp) of the entries which depend
+	on the entries of the given item-warehouse from `posting_datetime` onwards."""
+
+	sle = frappe.qb.DocType("Stock Ledger Entry")
+	dependant_sle = frappe.qb.DocType("Stock Ledger Entry").as_("dependant_sle")
+
+	return (
+		frappe.qb.from_(sle)
+		.inner_join(dependant_sle)
+		.on(dependant_sle.voucher_detail_no == sle.dependant_sle_voucher_detail_no)
+		.select(
+			dependant_sle.item_code,
+			dependant_sle.warehouse,
+			Min(dependant_sle.posting_datetime).as_("posting_datetime"),
+		)
+		.where(
+			(sle.item_code == item_code)
+			& (sle.warehouse == warehouse)
+			& (sle.posting_datetime >= posting_datetime)
+			& (sle.is_cancelled == 0)
+			& (sle.dependant_sle_voucher_detail_no.isnotnull())
+			& (dependant_sle.is_cancelled == 0)
+			& (dependant_sle.name != sle.name)
+			& ((dependant_sle.item_code != item_code) | (dependant_sle.warehouse != warehouse))
+		)
+		.groupby(dependant_sle.item_code, dependant_sle.warehouse)
+	).run(as_dict=True)
+
+
 class update_entries_after:
 	"""
 	update valution rate and qty after transaction
@@ -514,6 +659,10 @@ class update_entries_after:
 	                "posting_date": "2012-12-12",
 	                "posting_time": "12:00"
 	        }
+
+	:param batch_replay: replay future entries in memory and flush the recomputed values
+	        of Stock Ledger Entries, Bins and plain rate writebacks in bulk. Pending updates are
+	        flushed before processing any entry which reads values back from the database.
 	"""
 
 	def __init__(
@@ -523,6 +672,7 @@ class update_entries_after:
 		allow_negative_stock=None,
 		via_landed_cost_voucher=False,
 		verbose=1,
+		batch_replay=False,
 	):
 		self.exceptions = {}
 		self.verbose = verbose
@@ -537,6 +687,12 @@ class update_entries_after:
 		if self.args.sle_id:
 			self.args["name"] = self.args.sle_id
 
+		self.batch_replay = batch_replay and not self.args.sle_id
+		self.pending_sle_updates = {}
+		self.pending_rate_updates = {}
+		self.pending_bin_updates = {}
+		self.voucher_item_codes = {}
+
 		self.company = frappe.get_cached_value("Warehouse", self.args.warehouse, "company")
 		self.set_precision()
 		self.valuation_method = get_valuation_method(self.item_code)
@@ -587,7 +743,7 @@ class update_entries_after:
 		warehouse_dict.update(
 			{
 				"prev_stock_value": previous_sle.stock_value or 0.0,
-				"stock_queue": json.loads(previous_sle.stock_queue or "[]"),
+				"stock_queue": load_stock_queue(previous_sle.stock_queue),
 				"stock_value_difference": 0.0,
 			}
 		)
@@ -601,6 +757,8 @@ class update_entries_after:
 				self.update_bin()
 		else:
 			entries_to_fix = self.get_future_entries_to_fix()
+			if self.batch_replay:
+				self.set_voucher_item_codes(entries_to_fix)
 
 			i = 0
 			while i < len(entries_to_fix):
@@ -613,6 +771,8 @@ class update_entries_after:
 				if sle.dependant_sle_voucher_detail_no:
 					entries_to_fix = self.get_dependent_entries_to_fix(entries_to_fix, sle)
 
+			self.flush_batch_updates()
+
 		if self.exceptions:
 			self.raise_exceptions()
 
@@ -705,6 +865,11 @@ class update_entries_after:
 		return self.distinct_item_warehouses[key].dependent_voucher_detail_nos
 
 	def process_sle(self, sle):
+		replay_in_memory = self.batch_replay and self.can_replay_in_memory(sle)
+		if self.batch_replay and not replay_in_memory:
+			# entry reads rates or values from the database, previous results must be written first
+			self.flush_batch_updates()
+
 		# previous sle data for this warehouse
 		self.wh_data = self.data[sle.warehouse]
 		self.affected_transactions.add((sle.voucher_type, sle.voucher_no))
@@ -797,19 +962,65 @@ class update_entries_after:
 		sle.qty_after_transaction = self.wh_data.qty_after_transaction
 		sle.valuation_rate = self.wh_data.valuation_rate
 		sle.stock_value = self.wh_data.stock_value
-		sle.stock_queue = json.dumps(self.wh_data.stock_queue)
+		sle.stock_queue = dump_stock_queue(self.wh_data.stock_queue)
 
 		if not sle.is_adjustment_entry or not self.args.get("sle_id"):
 			sle.stock_value_difference = stock_value_difference
 
 		sle.doctype = "Stock Ledger Entry"
-		frappe.get_doc(sle).db_update()
+		if replay_in_memory:
+			self.pending_sle_updates[sle.name] = {field: sle.get(field) for field in REPLAY_SLE_FIELDS}
+		else:
+			frappe.get_doc(sle).db_update()
 
 		if not self.args.get("sle_id") or (
 			sle.serial_and_batch_bundle and sle.auto_created_serial_and_batch_bundle
 		):
 			self.update_outgoing_rate_on_transaction(sle)
 
+	def can_replay_in_memory(self, sle):
+		"""Returns True if the entry can be valued only from the in-memory state of the replay."""
+		return not (
+			sle.recalculate_rate
+			or sle.serial_and_batch_bundle
+			or sle.serial_no
+			or sle.batch_no
+			or sle.voucher_type == "Stock Reconciliation"
+			or (sle.voucher_type in ("Purchase Receipt", "Purchase Invoice") and flt(sle.actual_qty) < 0)
+		)
+
+	def set_voucher_item_codes(self, entries):
+		"""Fetch item codes of sales transaction rows at once, used to buffer incoming rate writebacks."""
+		voucher_detail_nos = {}
+		for sle in entries:
+			if sle.voucher_type in ("Delivery Note", "Sales Invoice") and sle.voucher_detail_no:
+				voucher_detail_nos.setdefault(sle.voucher_type + " Item", []).append(sle.voucher_detail_no)
+
+		for doctype, names in voucher_detail_nos.items():
+			for batch in create_batch(names, REPLAY_FLUSH_CHUNK_SIZE):
+				for row in frappe.get_all(
+					doctype, filters={"name": ("in", batch)}, fields=["name", "item_code"]
+				):
+					self.voucher_item_codes[row.name] = row.item_code
+
+	def flush_batch_updates(self):
+		if self.pending_sle_updates:
+			frappe.db.bulk_update(
+				"Stock Ledger Entry",
+				self.pending_sle_updates,
+				chunk_size=REPLAY_FLUSH_CHUNK_SIZE,
+				update_modified=False,
+			)
+			self.pending_sle_updates = {}
+
+		for doctype, updates in self.pending_rate_updates.items():
+			frappe.db.bulk_update(doctype, updates, chunk_size=REPLAY_FLUSH_CHUNK_SIZE)
+		self.pending_rate_updates = {}
+
+		for (item_code, warehouse), values_to_update in self.pending_bin_updates.items():
+			frappe.db.set_value("Bin", get_or_make_bin(item_code, warehouse), values_to_update)
+		self.pending_bin_updates = {}
+
 	def get_serialized_values(self, sle):
 		incoming_rate = flt(sle.incoming_rate)
 		actual_qty = flt(sle.actual_qty)
@@ -1040,6 +1251,9 @@ class update_entries_after:
 		if sle.actual_qty and sle.voucher_detail_no:
 			outgoing_rate = abs(flt(sle.stock_value_difference)) / abs(sle.actual_qty)
 
+			if self.batch_replay and self.queue_outgoing_rate_update(sle, outgoing_rate):
+				return
+
 			if flt(sle.actual_qty) < 0 and sle.voucher_type == "Stock Entry":
 				self.update_rate_on_stock_entry(sle, outgoing_rate)
 			elif sle.voucher_type in ("Delivery Note", "Sales Invoice"):
@@ -1051,6 +1265,33 @@ class update_entries_after:
 		elif sle.voucher_type == "Stock Reconciliation":
 			self.update_rate_on_stock_reconciliation(sle)
 
+	def queue_outgoing_rate_update(self, sle, outgoing_rate):
+		"""Buffer plain rate writebacks, returns False if the writeback has to be done right away."""
+		if sle.voucher_type in ("Delivery Note", "Sales Invoice"):
+			if self.voucher_item_codes.get(sle.voucher_detail_no) != sle.item_code:
+				# packed item
+				return False
+
+			self.pending_rate_updates.setdefault(sle.voucher_type + " Item", {})[sle.voucher_detail_no] = {
+				"incoming_rate": outgoing_rate
+			}
+			return True
+
+		if (
+			sle.voucher_type == "Stock Entry"
+			and flt(sle.actual_qty) < 0
+			and sle.dependant_sle_voucher_detail_no
+		):
+			# amounts of the stock entry are recalculated while reposting the dependant entry
+			self.pending_rate_updates.setdefault("Stock Entry Detail", {})[sle.voucher_detail_no] = {
+				"basic_rate": outgoing_rate
+			}
+			return True
+
+		# writeback recalculates the transaction from the database
+		self.flush_batch_updates()
+		return False
+
 	def update_rate_on_stock_entry(self, sle, outgoing_rate):
 		frappe.db.set_value("Stock Entry Detail", sle.voucher_detail_no, "basic_rate", outgoing_rate)
 
@@ -1319,6 +1560,10 @@ class update_entries_after:
 	def get_fallback_rate(self, sle) -> float:
 		"""When exact incoming rate isn't available use any of other "average" rates as fallback.
 		This should only get used for negative stock."""
+		if self.batch_replay:
+			# fallback rates are read from previous entries
+			self.flush_batch_updates()
+
 		return get_valuation_rate(
 			sle.item_code,
 			sle.warehouse,
@@ -1386,7 +1631,6 @@ class update_entries_after:
 				raise NegativeStockError(message)
 
 	def update_bin_data(self, sle):
-		bin_name = get_or_make_bin(sle.item_code, sle.warehouse)
 		values_to_update = {
 			"actual_qty": sle.qty_after_transaction,
 			"stock_value": sle.stock_value,
@@ -1395,6 +1639,12 @@ class update_entries_after:
 		if sle.valuation_rate is not None:
 			values_to_update["valuation_rate"] = sle.valuation_rate
 
+		if self.batch_replay:
+			# only the values after the last entry are written
+			self.pending_bin_updates.setdefault((sle.item_code, sle.warehouse), {}).update(values_to_update)
+			return
+
+		bin_name = get_or_make_bin(sle.item_code, sle.warehouse)
 		frappe.db.set_value("Bin", bin_name, values_to_update)
 
 	def update_bin(self):
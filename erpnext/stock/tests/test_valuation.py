@@ -8,7 +8,14 @@ from hypothesis import strategies as st
 
 from erpnext.stock.doctype.item.test_item import make_item
 from erpnext.stock.doctype.stock_entry.stock_entry_utils import make_stock_entry
-from erpnext.stock.valuation import FIFOValuation, LIFOValuation, round_off_if_near_zero
+from erpnext.stock.valuation import (
+	COMPRESSED_QUEUE_PREFIX,
+	FIFOValuation,
+	LIFOValuation,
+	dump_stock_queue,
+	load_stock_queue,
+	round_off_if_near_zero,
+)
 
 qty_gen = st.floats(min_value=-1e6, max_value=1e6)
 value_gen = st.floats(min_value=1, max_value=1e6)
@@ -195,6 +202,53 @@ class TestFIFOValuation(unittest.TestCase):
 			self.assertTotalValue(total_value)
 
 
+class TestStockQueueSerialization(unittest.TestCase):
+	def test_small_queue_is_stored_as_json(self):
+		queue = [[1.5, 10], [2, 20.25]]
+		serialized = dump_stock_queue(queue)
+
+		self.assertEqual(serialized, "[[1.5,10],[2,20.25]]")
+		self.assertEqual(load_stock_queue(serialized), queue)
+
+	def test_large_queue_is_compressed(self):
+		queue = [[i + 0.5, 100 + i] for i in range(500)]
+		serialized = dump_stock_queue(queue)
+
+		self.assertTrue(serialized.startswith(COMPRESSED_QUEUE_PREFIX))
+		self.assertLess(len(serialized), len(json.dumps(queue)))
+		self.assertEqual(load_stock_queue(serialized), queue)
+
+	def test_legacy_format(self):
+		self.assertEqual(load_stock_queue("[[10, 100], [5, 50]]"), [[10, 100], [5, 50]])
+		self.assertEqual(load_stock_queue(None), [])
+		self.assertEqual(load_stock_queue(""), [])
+
+	@given(stock_queue_generator)
+	def test_serialization_hypothesis(self, stock_queue):
+		queue = FIFOValuation([list(stock_bin) for stock_bin in stock_queue])
+		self.assertEqual(load_stock_queue(dump_stock_queue(queue)), queue.state)
+
+	def test_compressed_queue_in_invariant_check(self):
+		from erpnext.stock.report.stock_ledger_invariant_check.stock_ledger_invariant_check import (
+			add_invariant_check_fields,
+		)
+
+		queue = [[1, 100 + i] for i in range(500)]
+		sle = frappe._dict(
+			stock_queue=dump_stock_queue(queue),
+			actual_qty=500,
+			qty_after_transaction=500,
+			stock_value=sum(rate for _qty, rate in queue),
+			stock_value_difference=sum(rate for _qty, rate in queue),
+			valuation_rate=0,
+		)
+
+		(row,) = add_invariant_check_fields([sle])
+		self.assertEqual(json.loads(row.stock_queue), queue)
+		self.assertEqual(row.fifo_queue_qty, 500)
+		self.assertEqual(row.fifo_qty_diff, 0)
+
+
 class TestLIFOValuation(unittest.TestCase):
 	def setUp(self):
 		self.stack = LIFOValuation([])
@@ -341,7 +395,7 @@ class TestLIFOValuationSLE(FrappeTestCase):
 		)
 		sle = frappe.get_doc("Stock Ledger Entry", sle_name)
 
-		stock_queue = json.loads(sle.stock_queue)
+		stock_queue = load_stock_queue(sle.stock_queue)
 
 		total_qty, total_value = LIFOValuation(stock_queue).get_total_stock_and_value()
 		self.assertEqual(sle.qty_after_transaction, total_qty)
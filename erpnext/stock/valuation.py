@@ -1,5 +1,9 @@
+import base64
+import json
+import zlib
 from abc import ABC, abstractmethod, abstractproperty
-from collections.abc import Callable
+from collections import deque
+from collections.abc import Callable, Iterable
 from typing import NewType
 
 from frappe.utils import flt
@@ -10,6 +14,10 @@ StockBin = NewType("StockBin", list[float])  # [[qty, rate], ...]
 QTY = 0
 RATE = 1
 
+# Serialized queues longer than this are stored compressed in `Stock Ledger Entry.stock_queue`
+COMPRESSED_QUEUE_PREFIX = "z:"
+COMPRESSION_THRESHOLD = 1024
+
 
 class BinWiseValuation(ABC):
 	@abstractmethod
@@ -30,7 +38,7 @@ class BinWiseValuation(ABC):
 		total_qty = 0.0
 		total_value = 0.0
 
-		for qty, rate in self.state:
+		for qty, rate in self:
 			total_qty += flt(qty)
 			total_value += flt(qty) * flt(rate)
 
@@ -54,7 +62,8 @@ class FIFOValuation(BinWiseValuation):
 	New stock is added at end of the queue.
 	Qty consumption happens on First In First Out basis.
 
-	Queue is implemented using "bins" of [qty, rate].
+	Queue is implemented using a deque of "bins" of [qty, rate], consumption from the
+	front of the queue is O(1).
 
 	ref: https://en.wikipedia.org/wiki/FIFO_and_LIFO_accounting
 	"""
@@ -64,12 +73,15 @@ class FIFOValuation(BinWiseValuation):
 	__slots__ = ["queue"]
 
 	def __init__(self, state: list[StockBin] | None):
-		self.queue: list[StockBin] = state if state is not None else []
+		self.queue: deque[StockBin] = deque(state if state is not None else [])
 
 	@property
 	def state(self) -> list[StockBin]:
 		"""Get current state of queue."""
-		return self.queue
+		return list(self.queue)
+
+	def __iter__(self):
+		return iter(self.queue)
 
 	def add_stock(self, qty: float, rate: float) -> None:
 		"""Update fifo queue with new stock.
@@ -133,8 +145,11 @@ class FIFOValuation(BinWiseValuation):
 			if qty >= fifo_bin[QTY]:
 				# consume current bin
 				qty = round_off_if_near_zero(qty - fifo_bin[QTY])
-				to_consume = self.queue.pop(index)
-				consumed_bins.append(list(to_consume))
+				if index:
+					del self.queue[index]
+				else:
+					self.queue.popleft()
+				consumed_bins.append(list(fifo_bin))
 
 				if not self.queue and qty:
 					# stock finished, qty still remains to be withdrawn
@@ -253,3 +268,29 @@ def round_off_if_near_zero(number: float, precision: int = 7) -> float:
 		return 0.0
 
 	return flt(number)
+
+
+def dump_stock_queue(queue: Iterable[StockBin]) -> str:
+	"""Serialize stock queue for `Stock Ledger Entry.stock_queue`.
+
+	Queues are stored as compact JSON, large queues of high volume items are zlib
+	compressed and base64 encoded with the `z:` prefix."""
+	serialized = json.dumps(list(queue), separators=(",", ":"))
+	if len(serialized) <= COMPRESSION_THRESHOLD:
+		return serialized
+
+	return COMPRESSED_QUEUE_PREFIX + base64.b64encode(zlib.compress(serialized.encode())).decode()
+
+
+def load_stock_queue(serialized: str | list | None) -> list[StockBin]:
+	"""Deserialize stock queue stored in plain JSON or compressed format."""
+	if not serialized:
+		return []
+
+	if isinstance(serialized, list):
+		return serialized
+
+	if serialized.startswith(COMPRESSED_QUEUE_PREFIX):
+		serialized = zlib.decompress(base64.b64decode(serialized[len(COMPRESSED_QUEUE_PREFIX) :])).decode()
+
+	return json.loads(serialized)